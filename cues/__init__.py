@@ -27,9 +27,18 @@ from .__version__ import (
     __description__, __url__, __license__, __copyright__
 )
 if '-m' not in sys.argv:
+    from .cache import OptionCache
     from .checkbox import Checkbox
     from .confirm import Confirm
+    from .exceptions import CueTimeoutError
     from .form import Form
+    from .frecency import FrecencyIndex
+    from .grid import GridSelect
+    from .listen.session import Session
     from .password import Password
+    from .secret import Secret
     from .select import Select
+    from .source import FileSource, StreamSource
+    from .strength import BloomFilter, Strength
     from .survey import Survey
+    from .tree import TreeSelect
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.bitset
+===========
+
+This module contains the Bitset class for keeping track of which options
+are checked.
+"""
+
+import re
+from typing import Iterable, Iterator
+
+# Finds the bytes that have any bits set:
+_NONZERO_PATTERN = re.compile(rb'[^\x00]')
+
+# Translation tables from each byte to the number of bits it has set and to its complement:
+_POPCOUNT = bytes(bin(value).count('1') for value in range(256))
+_INVERT = bytes(value ^ 0xFF for value in range(256))
+
+
+def _popcount(data: bytes) -> int:
+    """Returns the number of bits set in `data`.
+    """
+
+    return sum(data.translate(_POPCOUNT))
+
+
+class Bitset:
+    """A set of non-negative ints stored as one bit each.
+
+    The bits are kept in a bytearray that grows as larger ints are added,
+    so a set over 100,000 options takes 12.5 KB. The number of ints in the
+    set is kept up to date as bits change, so ``len`` doesn't count them.
+
+    Adding, removing or flipping a range of ints works on whole bytes at a
+    time, so checking every option in a list of 100,000 doesn't loop over
+    each of them.
+
+    Attributes
+    ----------
+    _bits : bytearray
+        Bit ``i % 8`` of byte ``i // 8`` is set if ``i`` is in the set.
+    _count : int
+        The number of ints in the set.
+    """
+
+    __name__ = 'Bitset'
+    __module__ = 'cues'
+
+    def __init__(self, size: int = 0):
+        """
+
+        Parameters
+        ----------
+        size : int, optional
+            The number of ints to make room for up front.
+        """
+
+        self._bits = bytearray((size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, index: int) -> bool:
+        byte = index >> 3
+        return 0 <= byte < len(self._bits) and bool(self._bits[byte] >> (index & 7) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields the ints in the set in ascending order.
+        """
+
+        bits = self._bits
+        # Skips the bytes without any bits set in C:
+        for found in _NONZERO_PATTERN.finditer(bits):
+            byte = found.start()
+            value = bits[byte]
+            base = byte << 3
+            while value:
+                # Takes the lowest bit that is set:
+                low = value & -value
+                yield base + low.bit_length() - 1
+                value ^= low
+
+    def add(self, index: int):
+        """Adds `index` to the set.
+        """
+
+        if index not in self:
+            self._grow(index)
+            self._bits[index >> 3] |= 1 << (index & 7)
+            self._count += 1
+
+    def discard(self, index: int):
+        """Removes `index` from the set if it is there.
+        """
+
+        if index in self:
+            self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+            self._count -= 1
+
+    def toggle(self, index: int) -> bool:
+        """Adds `index` to the set or removes it if it is already there.
+
+        Returns
+        -------
+        bool
+            Whether `index` is in the set afterwards.
+        """
+
+        if index in self:
+            self.discard(index)
+            return False
+        self.add(index)
+        return True
+
+    def update(self, indices: Iterable[int]):
+        """Adds every int in `indices` to the set.
+        """
+
+        if isinstance(indices, range) and indices.step == 1:
+            self._apply_range(indices.start, indices.stop, 'add')
+            return
+        for index in indices:
+            self.add(index)
+
+    def difference_update(self, indices: Iterable[int]):
+        """Removes every int in `indices` from the set.
+        """
+
+        if isinstance(indices, range) and indices.step == 1:
+            self._apply_range(indices.start, indices.stop, 'discard')
+            return
+        for index in indices:
+            self.discard(index)
+
+    def symmetric_difference_update(self, indices: Iterable[int]):
+        """Flips every int in `indices`: adds those that aren't in the set and
+        removes those that are.
+        """
+
+        if isinstance(indices, range) and indices.step == 1:
+            self._apply_range(indices.start, indices.stop, 'toggle')
+            return
+        for index in indices:
+            self.toggle(index)
+
+    def clear(self):
+        """Removes every int from the set.
+        """
+
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+
+    def _apply_range(self, start: int, stop: int, operation: str):
+        """Adds, discards or toggles every int in [start, stop).
+
+        Parameters
+        ----------
+        start
+            The first int of the range.
+        stop
+            The int after the last one of the range.
+        operation
+            One of "add", "discard" or "toggle".
+        """
+
+        if start >= stop:
+            return
+        if operation == 'discard':
+            # There is nothing to remove past the end of the bits:
+            stop = min(stop, len(self._bits) << 3)
+            if start >= stop:
+                return
+        else:
+            self._grow(stop - 1)
+
+        bits = self._bits
+        first = start >> 3
+        last = (stop - 1) >> 3
+        before = _popcount(bits[first:last + 1])
+
+        # The bits of the first and last bytes that are in the range:
+        head = 0xFF << (start & 7) & 0xFF
+        tail = 0xFF >> (7 - ((stop - 1) & 7))
+        edges = [(first, head & tail)] if first == last else [(first, head), (last, tail)]
+
+        if first + 1 < last:
+            middle = slice(first + 1, last)
+            if operation == 'add':
+                bits[middle] = b'\xff' * (last - first - 1)
+            elif operation == 'discard':
+                bits[middle] = bytes(last - first - 1)
+            else:
+                bits[middle] = bits[middle].translate(_INVERT)
+
+        for byte, mask in edges:
+            if operation == 'add':
+                bits[byte] |= mask
+            elif operation == 'discard':
+                bits[byte] &= ~mask & 0xFF
+            else:
+                bits[byte] ^= mask
+
+        self._count += _popcount(bits[first:last + 1]) - before
+
+    def _grow(self, index: int):
+        """Makes room for `index`.
+        """
+
+        if index < 0:
+            raise ValueError(f'index must not be negative: {index}')
+
+        missing = (index >> 3) + 1 - len(self._bits)
+        if missing > 0:
+            self._bits.extend(bytes(missing))
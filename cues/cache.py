@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.cache
+==========
+
+This module contains the OptionCache class for keeping the options of slow
+providers on disk between runs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, List
+
+from . import utils
+
+# The number of seconds that cached options are used without being refreshed:
+DEFAULT_TTL = 3600.0
+
+# The number of bytes that the cache directory may take up:
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+
+class OptionCache:
+    """Keeps the options returned by providers on disk for a limited time.
+
+    A provider is any callable that returns the options of a cue, such as a
+    function that lists git branches or cloud regions. The first call for a
+    name runs the provider and stores its options. After that, the stored
+    options are returned at once: while they are younger than ``ttl``
+    seconds they are used as they are, and once they are older, a background
+    thread runs the provider again and stores the new options for the next
+    call (stale-while-revalidate).
+
+    The refresh thread isn't a daemon, so a script that exits right after
+    its prompt waits for the refresh to be stored.
+
+    Options are stored as JSON, so they should be str objects or numbers.
+
+    Attributes
+    ----------
+    directory : str
+        The directory where the options are stored.
+    ttl : float
+        The number of seconds that options are used before they are refreshed.
+    max_bytes : int or None
+        The number of bytes that the stored options may take up. The least
+        recently stored options are removed first.
+    _refreshes : dict
+        The threads that are refreshing options, by name.
+    _lock : threading.Lock
+        Guards ``_refreshes``.
+    """
+
+    __name__ = 'OptionCache'
+    __module__ = 'cues'
+
+    def __init__(self, directory: str = None, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+
+        Parameters
+        ----------
+        directory : str, optional
+            The directory where the options are stored. Defaults to a
+            ``cues`` directory in the user's cache directory.
+        ttl : float, optional
+            The number of seconds that options are used before they are
+            refreshed. Default is an hour.
+        max_bytes : int, optional
+            The number of bytes that the stored options may take up, or None
+            for no limit. Default is 10 MiB.
+        """
+
+        if ttl < 0:
+            raise ValueError(f'ttl must not be negative: {ttl}')
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f'max_bytes must be positive: {max_bytes}')
+
+        self.directory = directory or utils.get_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._refreshes = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, provider: Callable[[], Iterable],
+            ttl: float = None) -> List:
+        """Returns the options for `name`, running `provider` if needed.
+
+        Parameters
+        ----------
+        name
+            A name that identifies the options, such as "git-branches".
+        provider
+            A callable that takes no arguments and returns the options.
+        ttl : float, optional
+            Overrides ``ttl`` for these options.
+
+        Returns
+        -------
+        list
+        """
+
+        ttl = self.ttl if ttl is None else ttl
+
+        entry = self._read(name)
+        if entry is None:
+            return self._store(name, provider)
+
+        if time.time() - entry['time'] >= ttl:
+            self.refresh(name, provider)
+        return entry['options']
+
+    def refresh(self, name: str, provider: Callable[[], Iterable]) -> threading.Thread:
+        """Runs `provider` on a background thread and stores its options.
+
+        Only one refresh runs for each name at a time. If the provider
+        raises an exception, the stored options are kept.
+
+        Parameters
+        ----------
+        name
+            A name that identifies the options.
+        provider
+            A callable that takes no arguments and returns the options.
+
+        Returns
+        -------
+        threading.Thread
+            The thread that is refreshing the options.
+        """
+
+        with self._lock:
+            thread = self._refreshes.get(name)
+            if thread is not None and thread.is_alive():
+                return thread
+
+            def run():
+                try:
+                    self._store(name, provider)
+                except Exception:  # pylint: disable=broad-except
+                    pass
+                finally:
+                    with self._lock:
+                        self._refreshes.pop(name, None)
+
+            thread = threading.Thread(target=run, name=f'cues-refresh-{name}')
+            self._refreshes[name] = thread
+            thread.start()
+            return thread
+
+    def clear(self, name: str = None):
+        """Removes the stored options for `name`, or all of them.
+
+        Parameters
+        ----------
+        name : str, optional
+            A name that identifies the options. Removes everything by default.
+        """
+
+        paths = [self._get_path(name)] if name is not None else self._list()
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _get_path(self, name: str) -> str:
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.json')
+
+    def _list(self) -> List[str]:
+        """Returns the paths of every stored entry.
+        """
+
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in names if name.endswith('.json')
+        ]
+
+    def _read(self, name: str):
+        """Returns the stored entry for `name`, or None if there is none.
+        """
+
+        try:
+            with open(self._get_path(name), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get('name') != name:
+            return None
+        return entry
+
+    def _store(self, name: str, provider: Callable[[], Iterable]) -> List:
+        """Runs `provider`, stores its options and returns them.
+        """
+
+        options = list(provider())
+        entry = {'name': name, 'time': time.time(), 'options': options}
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Writes to a temporary file first so that readers never see half an entry:
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            path = self._get_path(name)
+            os.replace(temp, path)
+        except BaseException:
+            os.remove(temp)
+            raise
+
+        self._prune(keep=path)
+        return options
+
+    def _prune(self, keep: str):
+        """Removes the oldest entries until the cache fits in ``max_bytes``.
+        """
+
+        if self.max_bytes is None:
+            return
+
+        entries = []
+        for path in self._list():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
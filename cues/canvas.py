@@ -29,6 +29,8 @@ class Canvas(ABC):
     ----------
     max_columns : int
         Total number of columns available in the console.
+    max_lines : int
+        Total number of lines available in the console.
     x : int
         Number of spaces the cursor is from the left. Default is 1.
     y : int
@@ -51,7 +53,9 @@ class Canvas(ABC):
 
     def __init__(self):
 
-        self.max_columns = shutil.get_terminal_size().columns
+        size = shutil.get_terminal_size()
+        self.max_columns = size.columns
+        self.max_lines = size.lines
 
         self.x = 1
         self.y = 1
@@ -87,3 +91,12 @@ class Canvas(ABC):
         """
 
         self.max_columns = shutil.get_terminal_size().columns
+
+    def update_max_lines(self):
+        """Updates the current number of lines available.
+
+        Like ``update_max_columns``, this should be called when the
+        user adjusts the height of their terminal.
+        """
+
+        self.max_lines = shutil.get_terminal_size().lines
@@ -9,11 +9,12 @@ This module contains the Checkbox class.
 
 from typing import Iterable
 
-from . import constants, cursor, utils
-from .cue import Cue
+from . import constants, cursor, keys, utils
+from .bitset import Bitset
+from .menu import Menu
 
 
-class Checkbox(Cue):
+class Checkbox(Menu):
     """Construct a Checkbox object to retrieve none, one, or more responses from a user.
 
     A Checkbox object will display a series of options to the user
@@ -21,22 +22,46 @@ class Checkbox(Cue):
     use the Up and Down arrow keys to maneuver through options, use
     the Space key to choose options, and press Enter to submit their choices.
 
+    Options can also be checked in bulk: Ctrl+A checks every option that is
+    shown (every option, or every one that matches the filter, including
+    fuzzy matches beyond the ones that are listed), Ctrl+U
+    unchecks them, Ctrl+R inverts them, and Shift+Up and Shift+Down move
+    while checking every option from where the range started. Each of
+    these is one operation on the bitset of checked options and is followed
+    by a single frame.
+
     Attributes
     ----------
-     _options : list of str
-        The available options for the user to pick from.
-    _init_fmt : str
-        The format for the initial statement.
     _list_fmt : str
         The format for ``_options``.
     _list_fmt_if_active : str
         The format for the current active element in ``_options``.
+    _checked : Bitset
+        The indices of the checked options.
+    _anchor : int or None
+        The row that a range being checked with Shift started at.
+    _anchor_end : int or None
+        The row that the range being checked ended at, so that it can be
+        told whether the active option moved since.
     """
 
     __name__ = 'Checkbox'
     __module__ = 'cues'
 
-    def __init__(self, name: str, message: str, options: Iterable[str]):
+    keymap = {
+        **Menu.keymap,
+        keys.SPACE: 'toggle',
+        keys.CTRL[1]: 'check_all',
+        keys.CTRL[21]: 'uncheck_all',
+        keys.CTRL[18]: 'invert',
+        keys.SHIFT_UP: 'extend_up',
+        keys.SHIFT_DOWN: 'extend_down',
+    }
+
+    # The marker of a checked option:
+    CHECKED = '[lightslateblue]' + constants.FORM_MARKER_COM + '[/lightslateblue]'
+
+    def __init__(self, name: str, message: str, options: Iterable[str], **kwargs):
         """
 
         Parameters
@@ -47,19 +72,21 @@ class Checkbox(Cue):
             Instructions or useful information regarding the prompt for the user.
         fields
             Available options for the user to pick from.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``,
+            ``max_rows`` to limit the number of options shown at once and
+            ``wrap`` to stop at either end of the list.
         """
 
-        super().__init__(name, message)
+        super().__init__(name, message, options, **kwargs)
 
-        if hasattr(options, '__iter__'):
-            self._options = list(options)
-        else:
-            raise TypeError(f"'{type(options)}' object is not iterable")
-
-        self._init_fmt = '[pink][?][/pink] {message}'
         self._list_fmt = '[darkgrey]{marker}[/darkgrey] {option}'
         self._list_fmt_if_active = '[lightslateblue]{marker}[/lightslateblue] [underline skyblue]{option}[/underline skyblue]'
 
+        self._checked = Bitset()
+        self._anchor = None
+        self._anchor_end = None
+
     def send(self):
         """Returns a dict object containing user's response to the prompt.
 
@@ -72,70 +99,137 @@ class Checkbox(Cue):
         try:
             cursor.hide()
 
-            self._draw()
+            self._ask()
             return self.answer
         finally:
             cursor.show()
 
-    def _draw(self):
-        """Prints the prompt to console and sets user's response.
+    def _reset(self):
+        """Unchecks every option and moves to the first one.
+        """
+
+        super()._reset()
+
+        self._checked = Bitset(len(self._options))
+        self._anchor = None
+        self._anchor_end = None
+        self._index = 0
+
+    def _get_row_state(self, index: int, active: bool):
+        return active, index in self._checked
+
+    def _render_row(self, index: int, active: bool) -> str:
+        """Returns the markup for the option at `index`.
+        """
+
+        fmt = self._list_fmt_if_active if active else self._list_fmt
+        option = self._truncate(
+            str(self._options[index]), len(constants.FORM_MARKER_UNC) + 1)
+        marker = self.CHECKED if index in self._checked else constants.FORM_MARKER_UNC
+        return fmt.format(marker=marker, option=option)
+
+    def _get_answer(self) -> list:
+        return [self._options[index] for index in self._get_chosen()]
+
+    def _get_chosen(self) -> list:
+        return list(self._checked)
+
+    def _on_toggle(self):
+        """Checks or unchecks the current active option.
+        """
+
+        index = self._get_active()
+        if index is None:
+            return
+
+        self._checked.toggle(index)
+
+    def _get_shown(self):
+        """Returns the indices of the options that are shown.
+
+        Without a query, this is every option, as a range so that the
+        bitset can change them a byte at a time. With ``fuzzy``, only the
+        best ``FUZZY_LIMIT`` matches are in the rows, so the query is ranked
+        again without a limit to reach every match.
+
+        Returns
+        -------
+        Sequence of int
+        """
+
+        if self._query:
+            if self._matcher is None or (
+                    self._ranking is None and len(self._rows) < self.FUZZY_LIMIT):
+                return self._rows
+
+            matches = self._matcher.rank(self._query)
+            if self._ranking is not None:
+                # Ranking every match cancelled the one that was running:
+                self._ranking = None
+                self._ranked = len(self._options)
+                self._cache(self._query.casefold(), matches[:self.FUZZY_LIMIT])
+                self._show(matches[:self.FUZZY_LIMIT])
+            return matches
+        self._load()
+        return range(len(self._options))
+
+    def _on_check_all(self):
+        """Checks every option that is shown.
+        """
+
+        self._checked.update(self._get_shown())
+
+    def _on_uncheck_all(self):
+        """Unchecks every option that is shown.
+        """
+
+        self._checked.difference_update(self._get_shown())
+
+    def _on_invert(self):
+        """Checks the options that are shown and unchecked and unchecks the others.
+        """
+
+        self._checked.symmetric_difference_update(self._get_shown())
+
+    def _extend(self, offset: int):
+        """Moves by `offset` rows and checks every row from the anchor.
+
+        The range starts at the active row unless the previous range ended
+        there, so moving without Shift starts a new range.
+
+        Parameters
+        ----------
+        offset
+            The number of rows to move by. Negative numbers move up.
+        """
+
+        if self._anchor is None or self._index != self._anchor_end:
+            self._anchor = self._index
+        # Stops at either end, as a range can't wrap around:
+        self._jump(self._index + offset)
+        self._anchor_end = self._index
+
+        start, stop = sorted((self._anchor, self._index))
+        self._checked.update(self._rows[start:stop + 1])
+
+    def _on_extend_up(self):
+        """Moves to the previous option, checking the range from the anchor.
+        """
+
+        self._extend(-1)
+
+    def _on_extend_down(self):
+        """Moves to the next option, checking the range from the anchor.
+        """
+
+        self._extend(1)
+
+    def _show(self, rows):
+        """Replaces the visible rows and forgets the range being checked.
         """
 
-        cursor.write(self._init_fmt.format(
-            message=self._message), color=True, newlines=1)
-
-        up = self.keys.get('up')
-        down = self.keys.get('down')
-        space = self.keys.get('space')
-        enter = self.keys.get('enter')
-
-        # Get appropriate num of markers based on num of options:
-        num_options = len(self._options)
-        markers = [constants.FORM_MARKER_UNC for _ in range(num_options)]
-
-        colored_form_marker_com = '[lightslateblue]' + \
-            constants.FORM_MARKER_COM + '[/lightslateblue]'
-        curr_row = num_options
-        while True:
-            curr_row_diff = num_options - curr_row
-            for c, (marker, option) in enumerate(zip(markers, self._options)):
-                fmt = self._list_fmt_if_active if c == curr_row_diff else self._list_fmt
-
-                cursor.write(fmt.format(
-                    marker=marker, option=option), color=True, newlines=1)
-
-            key = self.listen_for_key()
-
-            if key == up:
-                if not curr_row_diff:
-                    curr_row = 1
-                else:
-                    curr_row += 1
-
-            elif key == down:
-                if curr_row_diff == num_options - 1:
-                    curr_row = num_options
-                else:
-                    curr_row -= 1
-
-            elif key == space:
-                if markers[curr_row_diff] == constants.FORM_MARKER_UNC:
-                    markers[curr_row_diff] = colored_form_marker_com
-                else:
-                    markers[curr_row_diff] = constants.FORM_MARKER_UNC
-
-            elif key == enter:
-                cursor.clear(num_options)
-                break
-
-            # Moves cursor to the top:
-            cursor.move(y=num_options)
-
-        selected_options = []
-        for c, marker in enumerate(markers):
-            if marker == colored_form_marker_com:
-                selected_options.append(self._options[c])
-        self.answer = {self._name: selected_options}
+        super()._show(rows)
+        self._anchor = None
 
     @classmethod
     def from_dict(cls, prompt: dict):
@@ -156,7 +250,7 @@ class Checkbox(Cue):
         name = prompt['name']
         message = prompt['message']
         options = prompt['options']
-        return cls(name, message, options)
+        return cls(name, message, options, **cls.get_settings(prompt))
 
 
 def main():
@@ -5,6 +5,7 @@ cues.color
 A module that is responsible for bringing color to Cue objects.
 """
 import re
+from functools import lru_cache
 
 
 class Color:
@@ -94,13 +95,32 @@ def make_colored(text: str) -> str:
         ANSI color codes.
     """
 
-    color_tag_pattern = re.compile(r'\[\/?\w+ ?\w+\]')
+    return COLOR_TAG_PATTERN.sub(_get_color_code, text)
 
-    color_tags = re.findall(color_tag_pattern, text)
-    if color_tags:
-        text = replace_tags_with_color_codes(text, color_tags)
 
-    return text
+COLOR_TAG_PATTERN = re.compile(r'\[\/?\w+ ?\w+\]')
+
+
+def _get_color_code(match) -> str:
+    return get_color_code(match.group())
+
+
+@lru_cache(maxsize=256)
+def get_color_code(tag: str) -> str:
+    """Returns the ANSI color codes that replace a color tag.
+
+    Parameters
+    ----------
+    tag : str
+        A color tag (e.g., "[red]" or "[/red]").
+
+    Returns
+    -------
+    str
+        The ANSI color codes, or an empty str object if the tag isn't known.
+    """
+
+    return replace_tags_with_color_codes(tag, [tag])
 
 
 def replace_tags_with_color_codes(text: str, tags: list) -> str:
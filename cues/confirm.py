@@ -7,7 +7,7 @@ cues.confirm
 This module contains the Confirm class.
 """
 
-from . import cursor, utils
+from . import cursor, keys, utils
 from .cue import Cue
 
 
@@ -22,12 +22,21 @@ class Confirm(Cue):
     ----------
     _confirm_fmt : str
         Format for the confirm prompt.
+    _choice : bool or None
+        The user's response, once they have given one.
     """
 
     __name__ = 'Confirm'
     __module__ = 'cues'
 
-    def __init__(self, name: str, message: str):
+    keymap = {
+        keys.char('y'): 'yes',
+        keys.char('Y'): 'yes',
+        keys.char('n'): 'no',
+        keys.char('N'): 'no',
+    }
+
+    def __init__(self, name: str, message: str, **kwargs):
         """
 
         Parameters
@@ -36,12 +45,16 @@ class Confirm(Cue):
             The name of the Confirm instance.
         message
             The prompt for the user.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``.
         """
 
-        super().__init__(name, message)
+        super().__init__(name, message, **kwargs)
 
         self._confirm_fmt = '[pink][?][/pink] {prompt} [grey]∙[/grey] [darkgrey]{confirm}[/darkgrey]  {r}{end}'
 
+        self._choice = None
+
     def send(self) -> dict:
         """Returns a dict object containing user's response to the prompt.
 
@@ -54,7 +67,7 @@ class Confirm(Cue):
         try:
             cursor.hide()
 
-            self._draw()
+            self._ask()
             return self.answer
         finally:
             cursor.show()
@@ -66,23 +79,13 @@ class Confirm(Cue):
         confirm = '(y/N)'
         end = '\r'
 
-        y = self.keys.get('y')
-        Y = self.keys.get('Y')
-        n = self.keys.get('n')
-        N = self.keys.get('N')
-
         cursor.write(self._confirm_fmt.format(
             prompt=self._message, confirm=confirm, r='', end=end), color=True)
 
-        while True:
-            key = self.listen_for_key()
-
-            if key == y or key == Y:
-                answer = True
-                break
-            elif key == n or key == N:
-                answer = False
-                break
+        self._choice = None
+        while self._choice is None:
+            self._dispatch(self.listen_for_key())
+        answer = self._choice
 
         end = '\n'
         cursor.write(self._confirm_fmt.format(prompt=self._message, confirm=confirm, r=(
@@ -90,6 +93,18 @@ class Confirm(Cue):
 
         self.answer = {self._name: answer}
 
+    def _on_yes(self):
+        """Answers yes.
+        """
+
+        self._choice = True
+
+    def _on_no(self):
+        """Answers no.
+        """
+
+        self._choice = False
+
     @classmethod
     def from_dict(cls, prompt: dict):
         """Creates and instantiates a Confirm object from a dict object.
@@ -107,7 +122,7 @@ class Confirm(Cue):
 
         name = prompt['name']
         message = prompt['message']
-        return cls(name, message)
+        return cls(name, message, **cls.get_settings(prompt))
 
 
 def main():
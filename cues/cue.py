@@ -8,12 +8,17 @@ This module contains the class for creating and instantiating `Cue` objects.
 """
 
 import subprocess
+import time
 from abc import abstractmethod
 from collections import deque
-from typing import Deque
+from typing import Any, Deque, List
 
-from . import utils
+from . import keys, utils
 from .canvas import Canvas
+from .exceptions import CueTimeoutError
+
+# Sentinel for a Cue object that has no default answer:
+NO_DEFAULT = object()
 
 
 class Cue(Canvas):
@@ -30,10 +35,20 @@ class Cue(Canvas):
         The name of the Cue instance.
     _message : str
         Instructions or useful information regarding the prompt for the user.
+    keymap : dict
+        The default bindings of Key objects to action names.
     keys : dict
-        Blend of different keypresses.
+        Key objects by name.
     listen_for_key : FunctionType
         Function that listens for keypresses based on OS.
+    _timeout : float or None
+        The number of seconds to wait for an answer before giving up.
+    _default : Any
+        The answer to use if ``_timeout`` expires.
+    _keymap : dict
+        The bindings of Key objects to action names for this instance.
+    _deadline : float or None
+        The ``time.monotonic`` value at which the current prompt times out.
     _answer : dict
         The answer to return once the user successfully responds to a Cue object.
     """
@@ -41,7 +56,13 @@ class Cue(Canvas):
     __name__ = 'Cue'
     __module__ = 'cues'
 
-    def __init__(self, name: str, message: str):
+    # Keyword arguments accepted by every Cue object:
+    SETTINGS = ('timeout', 'default', 'keymap')
+
+    keymap = {}
+
+    def __init__(self, name: str, message: str, timeout: float = None,
+                 default: Any = NO_DEFAULT, keymap: dict = None):
         """
 
         Parameters
@@ -50,6 +71,15 @@ class Cue(Canvas):
             The name of the Cue instance.
         message
             Instructions or useful information regarding the prompt for the user.
+        timeout : float, optional
+            The number of seconds to wait for an answer. Waits forever by default.
+        default : optional
+            The answer to use if `timeout` expires. If it isn't given, a
+            CueTimeoutError is raised instead.
+        keymap : dict, optional
+            Key names or Key objects mapped to action names. These are
+            added to the default bindings and a value of None removes a
+            binding (e.g., ``{'j': 'down', 'k': 'up'}``).
         """
 
         super().__init__()
@@ -68,10 +98,18 @@ class Cue(Canvas):
         else:
             raise TypeError(f"'{type(message)}' object is not a str object")
 
-        # Gathers all possible key presses into a dict:
-        self.keys = utils.get_keys()
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f'timeout must be positive: {timeout}')
+
+        self.keys = keys.KEYS
+        self._keymap = self.create_keymap(keymap)
         # Chooses which key listening function to use based on OS:
-        self.listen_for_key = utils.get_listen_function()
+        self._listen_function = utils.get_listen_function()
+        self.listen_for_key = self._listen
+
+        self._timeout = timeout
+        self._default = default
+        self._deadline = None
 
         self._answer = None
 
@@ -87,10 +125,153 @@ class Cue(Canvas):
     def send(self):
         pass
 
+    @classmethod
+    def get_actions(cls) -> List[str]:
+        """Returns the names of the actions that keys can be bound to.
+
+        Returns
+        -------
+        list of str
+        """
+
+        return sorted(
+            name[4:] for name in dir(cls)
+            if name.startswith('_on_') and name != '_on_char')
+
+    def create_keymap(self, overrides: dict = None) -> dict:
+        """Returns the default keymap updated with `overrides`.
+
+        Parameters
+        ----------
+        overrides : dict, optional
+            Key names or Key objects mapped to action names or None.
+
+        Returns
+        -------
+        dict
+            Key objects mapped to action names.
+
+        Raises
+        ------
+        ValueError
+            If a key name or an action name is unknown.
+        """
+
+        keymap = dict(self.keymap)
+        for name, action in (overrides or {}).items():
+            key = keys.get(name)
+            if action is None:
+                keymap.pop(key, None)
+            elif action in self.get_actions():
+                keymap[key] = action
+            else:
+                raise ValueError(
+                    f"'{action}' is not an action of {self.__name__}")
+        return keymap
+
+    def _dispatch(self, raw) -> str:
+        """Runs the action that a keypress is bound to.
+
+        Keys that aren't bound to an action but type a character are
+        passed on to ``_on_char``.
+
+        Parameters
+        ----------
+        raw : int or str or Key
+            A keypress as returned by ``listen_for_key``.
+
+        Returns
+        -------
+        str or None
+            The name of the action that was run.
+        """
+
+        key = keys.decode(raw)
+        action = self._keymap.get(key)
+        if action is not None:
+            getattr(self, '_on_' + action)()
+        elif key.char is not None:
+            self._on_char(key.char)
+        return action
+
+    def _on_char(self, char: str):
+        """Handles a typed character that isn't bound to an action.
+        """
+
+    def _ask(self):
+        """Runs ``_draw`` and falls back to the default answer on a timeout.
+
+        Raises
+        ------
+        CueTimeoutError
+            If ``_timeout`` expires and there is no default answer.
+        """
+
+        if self._timeout is not None:
+            self._deadline = time.monotonic() + self._timeout
+
+        try:
+            self._draw()
+        except CueTimeoutError:
+            if self._default is NO_DEFAULT:
+                raise
+            self.answer = {self._name: self._default}
+        finally:
+            self._deadline = None
+
+    def _listen(self, timeout: float = None):
+        """Returns the next keypress, honoring the current deadline.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds to wait for a keypress. Waits until the
+            deadline by default.
+
+        Returns
+        -------
+        int or str or None
+            The keypress, or None if `timeout` seconds pass first.
+
+        Raises
+        ------
+        CueTimeoutError
+            If the deadline passes before a key is pressed.
+        """
+
+        if self._deadline is None:
+            if timeout is None:
+                return self._listen_function()
+            return self._listen_function(timeout=timeout)
+
+        remaining = self._deadline - time.monotonic()
+        wait = remaining if timeout is None else min(timeout, remaining)
+        key = self._listen_function(timeout=wait) if remaining > 0 else None
+        if key is None and wait >= remaining:
+            raise CueTimeoutError(self._name, self._timeout)
+        return key
+
     @abstractmethod
     def _draw(self):
         pass
 
+    @classmethod
+    def get_settings(cls, prompt: dict) -> dict:
+        """Returns the shared keyword arguments found in a dict object.
+
+        Parameters
+        ----------
+        prompt
+            A dict that may contain any of the keys in ``SETTINGS``.
+
+        Returns
+        -------
+        dict
+            The keys of `prompt` that are shared by every Cue object.
+        """
+
+        return {key: prompt[key] for key in cls.SETTINGS if key in prompt}
+
     @staticmethod
     def create_deque(lis: list, length: int = None) -> Deque[str]:
         """Returns a deque object containing strings.
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.exceptions
+===============
+
+This module contains the exceptions raised by Cue objects.
+"""
+
+
+class CueTimeoutError(TimeoutError):
+    """Raised when a Cue object receives no answer before its timeout expires.
+
+    Attributes
+    ----------
+    name : str
+        The name of the Cue instance that timed out.
+    timeout : float
+        The number of seconds the Cue instance waited for an answer.
+    """
+
+    __name__ = 'CueTimeoutError'
+    __module__ = 'cues'
+
+    def __init__(self, name: str, timeout: float):
+        super().__init__(
+            f"'{name}' received no answer within {timeout} seconds")
+
+        self.name = name
+        self.timeout = timeout
@@ -9,7 +9,7 @@ This module contains the Form class.
 
 from typing import Iterable
 
-from . import constants, cursor, utils
+from . import constants, cursor, keys, utils
 from .cue import Cue
 
 
@@ -35,12 +35,29 @@ class Form(Cue):
         The format for fields' default message (if there is one).
     _num_fields : int
         The number of fields.
+    _inputs : list of str
+        The current responses from the user.
+    _row : int
+        The index of the field that is currently in focus.
+    _offset : int
+        The number of characters between the cursor and the end of the input.
+    _done : bool
+        Whether the user has submitted the form.
     """
 
     __name__ = 'Form'
     __module__ = 'cues'
 
-    def __init__(self, name: str, message: str, fields: Iterable[dict]):
+    keymap = {
+        keys.UP: 'up',
+        keys.DOWN: 'down',
+        keys.LEFT: 'left',
+        keys.RIGHT: 'right',
+        keys.BACKSPACE: 'backspace',
+        keys.ENTER: 'submit',
+    }
+
+    def __init__(self, name: str, message: str, fields: Iterable[dict], **kwargs):
         """
 
         Parameters
@@ -51,9 +68,11 @@ class Form(Cue):
             Instructions or useful information regarding the prompt for the user.
         fields
             Contains questions/information for the user to respond to.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``.
         """
 
-        super().__init__(name, message)
+        super().__init__(name, message, **kwargs)
 
         if hasattr(fields, '__iter__'):
             self._fields = list(fields)
@@ -68,6 +87,13 @@ class Form(Cue):
 
         self._num_fields = len(self._fields)
 
+        self._inputs = []
+        self._row = 0
+        self._offset = 0
+        self._input_len = 0
+        self._prev_input_len = 0
+        self._done = False
+
     def send(self):
         """Returns a dict object containing user's response to the prompt.
 
@@ -77,7 +103,7 @@ class Form(Cue):
             Contains the user's response to the prompt.
         """
 
-        self._draw()
+        self._ask()
         return self.answer
 
     def _draw(self):
@@ -86,14 +112,8 @@ class Form(Cue):
 
         cursor.write(self._init_fmt.format(message=self._message), color=True)
 
-        up = self.keys.get('up')
-        down = self.keys.get('down')
-        left = self.keys.get('left')
-        right = self.keys.get('right')
-        enter = self.keys.get('enter')
-        backspace = self.keys.get('backspace')
-
-        inputs = ['' for _ in range(self._num_fields)]
+        self._inputs = ['' for _ in range(self._num_fields)]
+        inputs = self._inputs
         max_msg_len = max(len(field.get('message')) for field in self._fields)
         # The total space taken up by self._main_fmt:
         padding = max_msg_len + self._main_fmt_len
@@ -101,79 +121,41 @@ class Form(Cue):
         defaults = [
             self._default_fmt.format(field.get('default', '')) for field in self._fields]
 
-        curr_row = 0
-        x_cursor_pos = 0
-        y_cursor_pos = 0
+        self._row = 0
+        self._offset = 0
+        self._done = False
 
         while True:
             self.__set_num_rows(inputs, padding)
-            self.__print_fields(inputs, defaults, curr_row, max_msg_len)
+            self.__print_fields(inputs, defaults, self._row, max_msg_len)
 
-            curr_input_len = len(inputs[curr_row])
-            prev_curr_input_len = curr_input_len
+            self._input_len = len(inputs[self._row])
+            self._prev_input_len = self._input_len
 
-            div, mod = divmod(padding + curr_input_len, self.max_columns)
+            div, mod = divmod(padding + self._input_len, self.max_columns)
 
             total_rows = self._num_fields
-            x_displacement = (mod or self.max_columns) - x_cursor_pos
-            y_displacement = y_cursor_pos - sum(self.__num_rows[curr_row + 1:])
+            x_displacement = (mod or self.max_columns) - self._offset
+            y_displacement = self._row - sum(self.__num_rows[self._row + 1:])
             if x_displacement < 0:
                 temp_div, temp_mod = divmod(
                     abs(x_displacement), self.max_columns)
                 if temp_mod:
                     temp_div += 1
                 x_displacement = divmod(
-                    padding + curr_input_len - mod - abs(x_displacement), self.max_columns)[1]
+                    padding + self._input_len - mod - abs(x_displacement), self.max_columns)[1]
                 y_displacement -= temp_div
 
             cursor.move(x=x_displacement,
                         y=total_rows - y_displacement)
 
-            key = self.listen_for_key()
-
-            if key == up:
-                if y_cursor_pos:
-                    y_cursor_pos -= 1
-                    curr_row -= 1
-                    curr_input_len, prev_curr_input_len, x_cursor_pos = self.__reset_values(
-                        curr_input_len, prev_curr_input_len, x_cursor_pos)
-
-            elif key == down:
-                if y_cursor_pos != (total_rows - 1):
-                    y_cursor_pos += 1
-                    curr_row += 1
-                    curr_input_len, prev_curr_input_len, x_cursor_pos = self.__reset_values(
-                        curr_input_len, prev_curr_input_len, x_cursor_pos)
-
-            elif key == left:
-                if x_cursor_pos != curr_input_len:
-                    x_cursor_pos += 1
-
-            elif key == right:
-                if x_cursor_pos:
-                    x_cursor_pos -= 1
-
-            elif key == backspace:
-                if curr_input_len - x_cursor_pos:
-                    inputs[curr_row] = utils.delete(
-                        inputs[curr_row], curr_input_len - x_cursor_pos)
-                    prev_curr_input_len = 0
-
-            elif key == enter:
-                if y_cursor_pos == (total_rows - 1):
-                    cursor.move(x=-self.max_columns,
-                                y=-total_rows + y_displacement)
-                    cursor.clear(self._num_fields + sum(self.__num_rows))
-                    break
-
-                y_cursor_pos += 1
-                curr_row += 1
-                curr_input_len, prev_curr_input_len, x_cursor_pos = self.__reset_values(
-                    curr_input_len, prev_curr_input_len, x_cursor_pos)
+            self._dispatch(self.listen_for_key())
 
-            else:
-                inputs[curr_row] = utils.insert(
-                    chr(key), inputs[curr_row], len(inputs[curr_row]) - x_cursor_pos)
+            if self._done:
+                cursor.move(x=-self.max_columns,
+                            y=-total_rows + y_displacement)
+                cursor.clear(self._num_fields + sum(self.__num_rows))
+                break
 
             # Drops cursor below all main_fmt:
             cursor.move(x=-self.max_columns,
@@ -181,7 +163,7 @@ class Form(Cue):
 
             y_delta = self._num_fields + sum(self.__num_rows)
 
-            if not prev_curr_input_len and len(inputs[curr_row]):
+            if not self._prev_input_len and len(inputs[self._row]):
                 # Refreshes output to remove traces of default messages:
                 cursor.clear(y_delta)
             elif div and not mod:
@@ -262,8 +244,68 @@ class Form(Cue):
             num_rows.append(div if mod else div - 1)
         self.__num_rows = num_rows
 
-    def __reset_values(self, *args):
-        return (0 for _ in range(len(args)))
+    def __reset_values(self):
+        self._input_len = 0
+        self._prev_input_len = 0
+        self._offset = 0
+
+    def _on_up(self):
+        """Moves to the previous field.
+        """
+
+        if self._row:
+            self._row -= 1
+            self.__reset_values()
+
+    def _on_down(self):
+        """Moves to the next field.
+        """
+
+        if self._row != (self._num_fields - 1):
+            self._row += 1
+            self.__reset_values()
+
+    def _on_left(self):
+        """Moves the cursor one character to the left.
+        """
+
+        if self._offset != self._input_len:
+            self._offset += 1
+
+    def _on_right(self):
+        """Moves the cursor one character to the right.
+        """
+
+        if self._offset:
+            self._offset -= 1
+
+    def _on_backspace(self):
+        """Deletes the character before the cursor.
+        """
+
+        if self._input_len - self._offset:
+            self._inputs[self._row] = utils.delete(
+                self._inputs[self._row], self._input_len - self._offset)
+            self._prev_input_len = 0
+
+    def _on_submit(self):
+        """Moves to the next field or submits the form from the last one.
+        """
+
+        if self._row == (self._num_fields - 1):
+            self._done = True
+            return
+
+        self._row += 1
+        self.__reset_values()
+
+    def _on_char(self, char: str):
+        """Inserts a character at the cursor.
+        """
+
+        text = self._inputs[self._row]
+        self._inputs[self._row] = utils.insert(
+            char, text, len(text) - self._offset)
 
     @classmethod
     def from_dict(cls, prompt: dict):
@@ -284,7 +326,7 @@ class Form(Cue):
         name = prompt['name']
         message = prompt['message']
         fields = prompt['fields']
-        return cls(name, message, fields)
+        return cls(name, message, fields, **cls.get_settings(prompt))
 
 
 def main():
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.frecency
+=============
+
+This module contains the FrecencyIndex class for remembering which options
+are picked most often and most recently, and the PromotedRange class for
+listing those options first.
+"""
+
+import dbm
+import glob
+import hashlib
+import os
+import struct
+import time
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Dict, Iterable, List
+
+from . import utils
+
+# The number of seconds after which a pick counts half as much:
+DEFAULT_HALF_LIFE = 7 * 24 * 3600.0
+
+# The score of an option when it was last picked and the time it was picked at:
+_ENTRY = struct.Struct('<dd')
+
+# A missing, corrupt or read-only index is treated as an empty one:
+_ERRORS = (OSError, struct.error) + tuple(dbm.error)
+
+
+class FrecencyIndex:
+    """Keeps a score for each option that has been picked, per prompt name.
+
+    Every pick adds one to the score of an option, and scores halve every
+    ``half_life`` seconds, so options that are picked often and recently
+    score highest. Only the score of an option and the time it was last
+    picked are stored, so recording a pick reads and writes a single entry
+    of a ``dbm`` database, whatever the number of options.
+
+    Options are told apart by their text, so they should be str objects or
+    objects whose str representation doesn't change between runs.
+
+    Attributes
+    ----------
+    directory : str
+        The directory where the scores are stored.
+    half_life : float
+        The number of seconds after which a pick counts half as much.
+    """
+
+    __name__ = 'FrecencyIndex'
+    __module__ = 'cues'
+
+    def __init__(self, directory: str = None,
+                 half_life: float = DEFAULT_HALF_LIFE):
+        """
+
+        Parameters
+        ----------
+        directory : str, optional
+            The directory where the scores are stored. Defaults to a
+            ``frecency`` directory in the user's cache directory.
+        half_life : float, optional
+            The number of seconds after which a pick counts half as much.
+            Default is a week.
+        """
+
+        if half_life <= 0:
+            raise ValueError(f'half_life must be positive: {half_life}')
+
+        self.directory = directory or os.path.join(utils.get_cache_dir(), 'frecency')
+        self.half_life = half_life
+
+    def record(self, name: str, options: Iterable):
+        """Adds a pick of each option in `options` to its score.
+
+        Parameters
+        ----------
+        name
+            The name of the prompt that the options were picked in.
+        options
+            The options that were picked.
+        """
+
+        now = time.time()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with dbm.open(self._get_path(name), 'c') as db:
+                for option in options:
+                    key = str(option).encode('utf-8')
+                    entry = db.get(key)
+                    score = self._decay(entry, now) if entry is not None else 0.0
+                    db[key] = _ENTRY.pack(score + 1.0, now)
+        except _ERRORS:
+            # Remembering picks is only a convenience, so failures are ignored:
+            pass
+
+    def get_scores(self, name: str) -> Dict[str, float]:
+        """Returns the current score of each option picked in a prompt.
+
+        Parameters
+        ----------
+        name
+            The name of the prompt.
+
+        Returns
+        -------
+        dict
+            The scores by the text of the options.
+        """
+
+        now = time.time()
+        try:
+            with dbm.open(self._get_path(name), 'r') as db:
+                return {
+                    key.decode('utf-8'): self._decay(db[key], now)
+                    for key in db.keys()
+                }
+        except _ERRORS:
+            return {}
+
+    def rank(self, name: str, options: Sequence) -> List[int]:
+        """Returns the indices of the options that have been picked, best first.
+
+        Options with the same score keep their order.
+
+        Parameters
+        ----------
+        name
+            The name of the prompt.
+        options
+            The options of the prompt.
+
+        Returns
+        -------
+        list of int
+        """
+
+        scores = self.get_scores(name)
+        if not scores:
+            return []
+
+        picked = []
+        for index in range(len(options)):
+            score = scores.get(str(options[index]))
+            if score is not None:
+                picked.append((-score, index))
+        picked.sort()
+        return [index for _, index in picked]
+
+    def clear(self, name: str = None):
+        """Forgets the picks made in a prompt, or in every prompt.
+
+        Parameters
+        ----------
+        name : str, optional
+            The name of the prompt. Forgets everything by default.
+        """
+
+        # The dbm modules add their own extensions to the path:
+        stem = self._get_path(name) if name is not None else os.path.join(
+            self.directory, '')
+        for path in glob.glob(glob.escape(stem) + '*'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _get_path(self, name: str) -> str:
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def _decay(self, entry: bytes, now: float) -> float:
+        """Returns the score in a stored entry as it stands at `now`.
+        """
+
+        score, then = _ENTRY.unpack(entry)
+        return score * 0.5 ** (max(now - then, 0.0) / self.half_life)
+
+
+class PromotedRange(Sequence):
+    """The indices ``range(total)`` with some of them moved to the front.
+
+    Rows are looked up without building the whole list, so a list of a
+    million options with a few promoted ones takes no more memory than the
+    promoted indices.
+
+    Attributes
+    ----------
+    _promoted : list of int
+        The indices that come first, in order.
+    _positions : dict
+        The position of each promoted index.
+    _sorted : list of int
+        The promoted indices in ascending order.
+    _offsets : list of int
+        ``_sorted[k] - k`` for each k: the number of other indices that come
+        before the kth promoted index in ``range(total)``.
+    _total : int
+        The number of indices.
+    """
+
+    __name__ = 'PromotedRange'
+    __module__ = 'cues'
+
+    def __init__(self, promoted: List[int], total: int):
+        """
+
+        Parameters
+        ----------
+        promoted
+            Distinct indices below `total` to list first.
+        total
+            The number of indices.
+        """
+
+        self._promoted = promoted
+        self._positions = {index: position for position, index in enumerate(promoted)}
+        self._sorted = sorted(promoted)
+        self._offsets = [index - k for k, index in enumerate(self._sorted)]
+        self._total = total
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, position: int) -> int:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._total))]
+        if position < 0:
+            position += self._total
+        if not 0 <= position < self._total:
+            raise IndexError('PromotedRange index out of range')
+
+        count = len(self._promoted)
+        if position < count:
+            return self._promoted[position]
+
+        # Skips over the promoted indices that come before the rest:
+        rest = position - count
+        return rest + bisect_right(self._offsets, rest)
+
+    def __iter__(self):
+        yield from self._promoted
+        promoted = self._positions
+        for index in range(self._total):
+            if index not in promoted:
+                yield index
+
+    def __contains__(self, index) -> bool:
+        return isinstance(index, int) and 0 <= index < self._total
+
+    def index(self, index: int) -> int:
+        """Returns the position of `index`.
+        """
+
+        if index not in self:
+            raise ValueError(f'{index} is not in PromotedRange')
+
+        position = self._positions.get(index)
+        if position is not None:
+            return position
+        return len(self._promoted) + index - bisect_left(self._sorted, index)
@@ -0,0 +1,487 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.grid
+=========
+
+This module contains the GridSelect class.
+"""
+
+import itertools
+from collections.abc import Mapping
+from numbers import Number
+from typing import Iterable, List, Sequence, Tuple
+
+from . import constants, cursor, keys, match
+from .bitset import Bitset
+from .checkbox import Checkbox
+from .menu import Menu, colorize
+
+
+class GridSelect(Menu):
+    """Construct a GridSelect object to retrieve one or more records from a user.
+
+    A GridSelect object shows records, such as the rows of a query, as
+    aligned columns under a header. The user can press Tab to sort the
+    records by the next column (and, after the last one, go back to their
+    original order), Ctrl+R to reverse the sort, and Left and Right to
+    scroll through columns that don't fit in the console. With
+    ``multiple``, Space checks records and Enter submits every checked one;
+    otherwise Enter submits the active record.
+
+    The order of the records for each column is sorted once and kept as a
+    list of indices, so switching back to a column, or reversing it, doesn't
+    sort again. Column widths are measured on the first ``SAMPLE_SIZE``
+    records, and only the cells of the visible columns of the visible rows
+    are formatted.
+
+    Attributes
+    ----------
+    _columns : list of str
+        The names of the columns.
+    _multiple : bool
+        Whether more than one record can be picked.
+    _widths : list of int or None
+        The width of each column, measured on the first frame.
+    _column : int
+        The position of the leftmost visible column.
+    _sort_column : int or None
+        The position of the column that the records are sorted by, if any.
+    _reverse : bool
+        Whether the records are sorted in descending order.
+    _orders : dict
+        The indices of the records in sorted order, by column position and
+        direction.
+    _checked : Bitset
+        The indices of the checked records.
+    _header_fmt : str
+        The format for the header.
+    """
+
+    __name__ = 'GridSelect'
+    __module__ = 'cues'
+
+    # The header takes up a line as well:
+    RESERVED_LINES = Menu.RESERVED_LINES + 1
+
+    # The number of records that column widths are measured on:
+    SAMPLE_SIZE = 1000
+
+    # The widest that a column gets:
+    MAX_COLUMN_WIDTH = 40
+
+    # The spaces between columns:
+    GAP = '  '
+
+    # The markers of a sorted column:
+    ASCENDING = '▲'
+    DESCENDING = '▼'
+
+    keymap = {
+        **Menu.keymap,
+        keys.SPACE: 'toggle',
+        keys.TAB: 'sort',
+        keys.CTRL[18]: 'reverse',
+        keys.LEFT: 'scroll_left',
+        keys.RIGHT: 'scroll_right',
+    }
+
+    def __init__(self, name: str, message: str, options: Iterable,
+                 columns: Sequence[str], multiple: bool = False, **kwargs):
+        """
+
+        Parameters
+        ----------
+        name
+            The name of the GridSelect instance.
+        message
+            Instructions or useful information regarding the prompt for the user.
+        options
+            The records to pick from. Each record is a sequence of values in
+            the order of `columns`, or a mapping from column names to values.
+        columns
+            The names of the columns.
+        multiple : bool, optional
+            Whether the user can check more than one record. Default is False.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``,
+            and the settings of Select objects.
+        """
+
+        if isinstance(columns, str) or not isinstance(columns, Sequence):
+            raise TypeError(f"'{type(columns)}' object is not a sequence of column names")
+        if not columns:
+            raise ValueError('columns must not be empty')
+
+        super().__init__(name, message, options, **kwargs)
+
+        self._columns = [str(column) for column in columns]
+        self._multiple = multiple
+        self._widths = None
+        self._column = 0
+        self._sort_column = None
+        self._reverse = False
+        self._orders = {}
+        self._checked = Bitset()
+
+        self._list_fmt = '[skyblue]{marker}[/skyblue] {option}'
+        self._list_fmt_if_active = '[skyblue]{marker}[/skyblue] [underline skyblue]{option}[/underline skyblue]'
+        self._header_fmt = '[darkgrey]{scroll} {header}[/darkgrey]'
+
+    @property
+    def options(self):
+        return self._options
+
+    def send(self):
+        """Returns a dict object containing user's response to the prompt.
+
+        Returns
+        -------
+        dict
+            Contains the user's response to the prompt.
+        """
+
+        try:
+            cursor.hide()
+
+            self._ask()
+            return self.answer
+        finally:
+            cursor.show()
+
+    def _reset(self):
+        """Unchecks every record and moves to the first one.
+        """
+
+        super()._reset()
+        self._checked = Bitset(len(self._options))
+        self._index = 0
+
+    def _get_answer(self):
+        if self._multiple:
+            return [self._options[index] for index in self._checked]
+        return self._options[self._get_active()]
+
+    def _get_chosen(self) -> list:
+        if self._multiple:
+            return list(self._checked)
+        return super()._get_chosen()
+
+    def _can_submit(self) -> bool:
+        """Returns whether a record is active or records can be checked.
+        """
+
+        return self._multiple or bool(self._rows)
+
+    def _get_cell(self, record, column: int):
+        """Returns the value of a record in a column.
+
+        Parameters
+        ----------
+        record
+            A sequence or mapping of values.
+        column
+            The position of the column.
+
+        Returns
+        -------
+        Any
+            None if the record has no value for the column.
+        """
+
+        if isinstance(record, Mapping):
+            return record.get(self._columns[column])
+        try:
+            return record[column]
+        except (IndexError, KeyError, TypeError):
+            return None
+
+    def _get_widths(self) -> List[int]:
+        """Returns the width of each column, measuring them the first time.
+
+        Returns
+        -------
+        list of int
+        """
+
+        if self._widths is None:
+            # Leaves room for the marker of a sorted column:
+            widths = [len(column) + 2 for column in self._columns]
+            self._load(self.SAMPLE_SIZE)
+            count = min(len(self._options), self.SAMPLE_SIZE)
+            for index in range(count):
+                record = self._options[index]
+                for column, width in enumerate(widths):
+                    value = self._get_cell(record, column)
+                    if value is not None:
+                        widths[column] = max(width, len(str(value)))
+            self._widths = [min(width, self.MAX_COLUMN_WIDTH) for width in widths]
+        return self._widths
+
+    def _get_visible_columns(self) -> List[Tuple[int, int]]:
+        """Returns the position and width of each column that fits, from ``_column``.
+
+        Returns
+        -------
+        list of tuple
+        """
+
+        widths = self._get_widths()
+        # The marker and the space after it come first:
+        space = self.max_columns - self._select_marker_len - 1
+        visible = []
+        for column in range(self._column, len(widths)):
+            width = widths[column]
+            if visible:
+                space -= len(self.GAP)
+            if width > space:
+                # The first column is cut short rather than left out:
+                if not visible and space > 0:
+                    visible.append((column, space))
+                break
+            visible.append((column, width))
+            space -= width
+        return visible
+
+    @property
+    def _select_marker_len(self) -> int:
+        return len(constants.FORM_MARKER_UNC if self._multiple else constants.LIST_MARKER)
+
+    def _format_cell(self, value, width: int) -> str:
+        """Returns a value as text that is exactly `width` columns wide.
+
+        Numbers are aligned to the right and everything else to the left.
+        """
+
+        if value is None:
+            return ' ' * width
+
+        text = ' '.join(str(value).split())
+        if len(text) > width:
+            text = text[:max(width - 1, 0)] + '…'
+        if isinstance(value, Number) and not isinstance(value, bool):
+            return text.rjust(width)
+        return text.ljust(width)
+
+    def _get_row_state(self, index: int, active: bool):
+        return active, self._column, index in self._checked
+
+    def _render_row(self, index: int, active: bool) -> str:
+        """Returns the markup for the visible cells of the record at `index`.
+        """
+
+        record = self._options[index]
+        cells = [
+            self._format_cell(self._get_cell(record, column), width)
+            for column, width in self._get_visible_columns()
+        ]
+        option = self.GAP.join(cells).rstrip()
+
+        if self._multiple:
+            marker = Checkbox.CHECKED if index in self._checked else constants.FORM_MARKER_UNC
+        else:
+            marker = constants.LIST_MARKER if active else ' ' * self._select_marker_len
+        fmt = self._list_fmt_if_active if active else self._list_fmt
+        return fmt.format(marker=marker, option=option)
+
+    def _get_header(self) -> str:
+        """Returns the names of the visible columns and whether there are more.
+        """
+
+        visible = self._get_visible_columns()
+        names = []
+        for column, width in visible:
+            name = self._columns[column]
+            if column == self._sort_column:
+                name += ' ' + (self.DESCENDING if self._reverse else self.ASCENDING)
+            names.append(self._format_cell(name, width))
+        header = self.GAP.join(names).rstrip()
+
+        # Shows which way there are hidden columns:
+        if visible and visible[-1][0] < len(self._columns) - 1:
+            header += ' ›'
+        scroll = '‹' if self._column > 0 else ' '
+        return colorize(self._header_fmt).format(scroll=scroll, header=header)
+
+    def _get_all_rows(self) -> Sequence:
+        """Returns the indices of every record in the order they are sorted.
+        """
+
+        if self._sort_column is None:
+            return super()._get_all_rows()
+        return self._get_order(self._sort_column, self._reverse)
+
+    def _get_order(self, column: int, reverse: bool) -> List[int]:
+        """Returns the indices of the records sorted by a column.
+
+        Each order is computed once; the descending order is the ascending
+        one reversed.
+
+        Parameters
+        ----------
+        column
+            The position of the column.
+        reverse
+            Whether to sort in descending order.
+
+        Returns
+        -------
+        list of int
+        """
+
+        total = len(self._options)
+        order = self._orders.get((column, reverse))
+        if order is not None and len(order) == total:
+            return order
+
+        if reverse:
+            order = self._get_order(column, False)[::-1]
+        else:
+            options = self._options
+            order = sorted(
+                range(total),
+                key=lambda index: _sort_key(self._get_cell(options[index], column)))
+        self._orders[column, reverse] = order
+        return order
+
+    def _resort(self):
+        """Shows the records in the current order, keeping the active one.
+        """
+
+        self._load()
+        # Matches are cached in the order they were found in:
+        self._matches = {}
+        active = self._get_active()
+        if self._query:
+            self._filter(self._query)
+        else:
+            self._rows = self._get_all_rows()
+        if active is not None:
+            self._index = self._locate(self._rows, active)
+
+    def _locate(self, rows: Sequence, index: int) -> int:
+        """Returns the position of `index` in `rows`, or 0 if it isn't there.
+        """
+
+        if self._sort_column is None:
+            return super()._locate(rows, index)
+        try:
+            return rows.index(index)
+        except ValueError:
+            return 0
+
+    def _fold(self) -> List[str]:
+        """Returns the casefolded text of the cells of every record read so far.
+        """
+
+        folded = self._folded
+        options = self._options
+        count = len(self._columns)
+        for index in range(len(folded), len(options)):
+            record = options[index]
+            cells = (self._get_cell(record, column) for column in range(count))
+            folded.append(match.fold(
+                ' '.join(str(cell) for cell in cells if cell is not None)))
+        return folded
+
+    def _on_toggle(self):
+        """Checks or unchecks the active record, or types a space.
+        """
+
+        if not self._multiple:
+            self._on_char(' ')
+            return
+
+        index = self._get_active()
+        if index is not None:
+            self._checked.toggle(index)
+
+    def _on_sort(self):
+        """Sorts the records by the next column, or restores their order after the last.
+        """
+
+        if self._sort_column is None:
+            self._sort_column = 0
+        elif self._sort_column + 1 < len(self._columns):
+            self._sort_column += 1
+        else:
+            self._sort_column = None
+        self._reverse = False
+        self._resort()
+
+    def _on_reverse(self):
+        """Reverses the order of the sorted column.
+        """
+
+        if self._sort_column is None:
+            return
+        self._reverse = not self._reverse
+        self._resort()
+
+    def _on_scroll_left(self):
+        """Shows the column to the left of the visible ones.
+        """
+
+        self._column = max(self._column - 1, 0)
+
+    def _on_scroll_right(self):
+        """Shows the column to the right of the visible ones.
+        """
+
+        visible = self._get_visible_columns()
+        if visible and visible[-1][0] < len(self._columns) - 1:
+            self._column += 1
+
+    @classmethod
+    def from_dict(cls, prompt: dict):
+        """Creates and instantiates a GridSelect object from a dict object.
+
+        Parameters
+        ----------
+        prompt : dict
+            A dict object that contains a name key, a message key, an
+            options key and a columns key.
+
+        Returns
+        -------
+        cues.GridSelect
+            A GridSelect object to retrieve one or more records from a user.
+        """
+
+        name = prompt['name']
+        message = prompt['message']
+        options = prompt['options']
+        columns = prompt['columns']
+        multiple = prompt.get('multiple', False)
+        return cls(name, message, options, columns, multiple, **cls.get_settings(prompt))
+
+
+def _sort_key(value):
+    """Returns a key that orders numbers, then text ignoring case, then missing values.
+    """
+
+    if value is None:
+        return 2, 0, ''
+    if isinstance(value, Number) and not isinstance(value, (bool, complex)):
+        return 0, value, ''
+    return 1, 0, str(value).casefold()
+
+
+def main():
+    name = 'instances'
+    message = 'Pick the instances to restart:'
+    columns = ['id', 'zone', 'type', 'cpu %', 'uptime (days)']
+    zones = itertools.cycle(['us-east-1a', 'us-east-1b', 'eu-west-1a'])
+    types = itertools.cycle(['m5.large', 't3.micro', 'c6g.xlarge', 'r5.2xlarge'])
+    options = [
+        (f'i-{index:08x}', next(zones), next(types), (index * 37) % 100, index % 90)
+        for index in range(200)
+    ]
+
+    cue = GridSelect(name, message, options, columns, multiple=True)
+    answer = cue.send()
+    print(answer)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.groups
+===========
+
+This module contains the Group class for the section headers of a Select
+object and the GroupedRows class for listing the options of the groups that
+are expanded.
+"""
+
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Iterable, List, Optional, Tuple
+
+
+class Group:
+    """The header of a section of options.
+
+    Attributes
+    ----------
+    name : str
+        The name of the section.
+    start : int
+        The index of the header in the options; the options of the section
+        follow it.
+    size : int
+        The number of options in the section.
+    collapsed : bool
+        Whether the options of the section are hidden.
+    """
+
+    __name__ = 'Group'
+    __module__ = 'cues'
+
+    __slots__ = ('name', 'start', 'size', 'collapsed')
+
+    def __init__(self, name: str, start: int, size: int, collapsed: bool = False):
+        self.name = name
+        self.start = start
+        self.size = size
+        self.collapsed = collapsed
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f'Group({self.name!r})'
+
+
+class GroupedRows(Sequence):
+    """The indices of the headers and of the options in expanded groups.
+
+    The position of each header among the rows is computed once, when the
+    rows are created, so looking up a row or the position of an option is a
+    binary search over the groups rather than over the options, and the
+    options of a collapsed group take no room at all.
+
+    Attributes
+    ----------
+    _groups : list of Group
+        The groups, in order.
+    _starts : list of int
+        The index of each header in the options.
+    _offsets : list of int
+        The position of each header among the rows.
+    _total : int
+        The number of rows.
+    """
+
+    __name__ = 'GroupedRows'
+    __module__ = 'cues'
+
+    def __init__(self, groups: List[Group]):
+        """
+
+        Parameters
+        ----------
+        groups
+            The groups, in the order of their options.
+        """
+
+        self._groups = groups
+        self._starts = [group.start for group in groups]
+        self._offsets = []
+        total = 0
+        for group in groups:
+            self._offsets.append(total)
+            total += 1 if group.collapsed else group.size + 1
+        self._total = total
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, position: int) -> int:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._total))]
+        if position < 0:
+            position += self._total
+        if not 0 <= position < self._total:
+            raise IndexError('GroupedRows index out of range')
+
+        group = bisect_right(self._offsets, position) - 1
+        return self._starts[group] + position - self._offsets[group]
+
+    def __iter__(self):
+        for group in self._groups:
+            yield group.start
+            if not group.collapsed:
+                yield from range(group.start + 1, group.start + 1 + group.size)
+
+    def __contains__(self, index) -> bool:
+        return self._find(index) is not None
+
+    def index(self, index: int) -> int:
+        """Returns the position of `index`.
+        """
+
+        position = self._find(index)
+        if position is None:
+            raise ValueError(f'{index} is not in GroupedRows')
+        return position
+
+    def get_group(self, index: int) -> Group:
+        """Returns the group that the option at `index` belongs to.
+        """
+
+        return self._groups[bisect_right(self._starts, index) - 1]
+
+    def add_headers(self, indices: Sequence) -> List[int]:
+        """Returns `indices` with the headers of their sections and of collapsed ones.
+
+        The options of a collapsed section aren't searched, so its header
+        is kept to show that it may hide more matches.
+
+        Parameters
+        ----------
+        indices
+            The indices of options in ascending order, which may include
+            headers.
+
+        Returns
+        -------
+        list of int
+        """
+
+        rows = []
+        position = 0
+        count = len(indices)
+        for group in self._groups:
+            stop = group.start + group.size + 1
+            first = position
+            while position < count and indices[position] < stop:
+                position += 1
+            found = indices[first:position]
+            if found and found[0] == group.start:
+                found = found[1:]
+            if found or group.collapsed or position > first:
+                rows.append(group.start)
+                rows.extend(found)
+        return rows
+
+    def _find(self, index) -> Optional[int]:
+        """Returns the position of `index`, or None if it isn't a row.
+        """
+
+        if not isinstance(index, int) or not self._starts or index < 0:
+            return None
+
+        position = bisect_right(self._starts, index) - 1
+        group = self._groups[position]
+        offset = index - group.start
+        if offset > group.size or (offset and group.collapsed):
+            return None
+        return self._offsets[position] + offset
+
+
+def flatten(sections: Mapping) -> Tuple[List, List[Group]]:
+    """Returns the options of `sections` with a header before each section.
+
+    Parameters
+    ----------
+    sections
+        The options of each section, by the name of the section.
+
+    Returns
+    -------
+    tuple
+        The headers and the options, in order, and the headers alone.
+    """
+
+    options = []
+    groups = []
+    for name, section in sections.items():
+        if isinstance(section, str) or not isinstance(section, Iterable):
+            raise TypeError(f"'{type(section)}' object is not an iterable of options")
+
+        group = Group(str(name), len(options), 0)
+        options.append(group)
+        options.extend(section)
+        group.size = len(options) - group.start - 1
+        groups.append(group)
+    return options, groups
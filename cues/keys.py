@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.keys
+=========
+
+This module contains the Key class and the tables that turn raw keypresses
+into Key objects.
+"""
+
+import string
+
+from . import utils
+from .listen import ansi
+
+
+class Key:
+    """An interned keypress.
+
+    There is only ever one Key object for each name, so Key objects can be
+    compared by identity and used as dict keys at no extra cost.
+
+    Attributes
+    ----------
+    name : str
+        The name of the key (e.g., "up", "ctrl+n" or "a").
+    char : str or None
+        The character that the key types, if any.
+    """
+
+    __name__ = 'Key'
+    __module__ = 'cues'
+    __slots__ = ('name', 'char')
+
+    _interned = {}
+
+    def __new__(cls, name: str, char: str = None):
+        key = cls._interned.get(name)
+        if key is None:
+            key = super().__new__(cls)
+            key.name = name
+            key.char = char
+            cls._interned[name] = key
+        return key
+
+    def __repr__(self):
+        return f'Key({self.name!r})'
+
+
+def char(text: str) -> Key:
+    """Returns the Key object that types a single character.
+
+    Parameters
+    ----------
+    text : str
+        A str object containing a single character.
+
+    Returns
+    -------
+    Key
+    """
+
+    key = Key._interned.get(text)
+    if key is None:
+        key = Key(text, text)
+    return key
+
+
+UP = Key('up')
+DOWN = Key('down')
+LEFT = Key('left')
+RIGHT = Key('right')
+HOME = Key('home')
+END = Key('end')
+PAGE_UP = Key('pageup')
+PAGE_DOWN = Key('pagedown')
+DELETE = Key('delete')
+SHIFT_UP = Key('shift+up')
+SHIFT_DOWN = Key('shift+down')
+
+ENTER = Key('enter')
+BACKSPACE = Key('backspace')
+TAB = Key('tab')
+ESCAPE = Key('escape')
+SPACE = Key('space', ' ')
+# Keeps the space character itself from getting a second Key object:
+Key._interned[' '] = SPACE
+
+UNKNOWN = Key('unknown')
+
+# Ctrl + a letter sends the letter's position in the alphabet:
+CTRL = {
+    position: Key('ctrl+' + letter)
+    for position, letter in enumerate(string.ascii_lowercase, 1)
+}
+
+_COMMON = dict(CTRL)
+_COMMON.update({
+    ansi.SPACE: SPACE,
+    ansi.TAB: TAB,
+    ansi.ESC_ORD: ESCAPE,
+    ansi.BACKSPACE: BACKSPACE,
+})
+
+_UNIX = {
+    ansi.ENTER: ENTER,
+    ansi.ENTER_CTRL_CODE: ENTER,
+    ansi.BACKSPACE_CTRL_CODE: BACKSPACE,
+    ansi.ESC_CODE: ESCAPE,
+
+    ansi.NO_ESC_UP: UP,
+    ansi.NO_ESC_DOWN: DOWN,
+    ansi.NO_ESC_RIGHT: RIGHT,
+    ansi.NO_ESC_LEFT: LEFT,
+    'OA': UP,
+    'OB': DOWN,
+    'OC': RIGHT,
+    'OD': LEFT,
+
+    '[H': HOME,
+    '[F': END,
+    'OH': HOME,
+    'OF': END,
+    '[1~': HOME,
+    '[4~': END,
+    '[7~': HOME,
+    '[8~': END,
+    '[5~': PAGE_UP,
+    '[6~': PAGE_DOWN,
+    '[3~': DELETE,
+    # Shift + an arrow key (the Windows console doesn't report Shift):
+    '[1;2A': SHIFT_UP,
+    '[1;2B': SHIFT_DOWN,
+}
+
+_WINDOWS = {
+    ansi.ENTER: ENTER,
+
+    ansi.UP: UP,
+    ansi.DOWN: DOWN,
+    ansi.RIGHT: RIGHT,
+    ansi.LEFT: LEFT,
+    ansi.HOME: HOME,
+    ansi.END: END,
+    ansi.PAGE_UP: PAGE_UP,
+    ansi.PAGE_DOWN: PAGE_DOWN,
+    ansi.DELETE: DELETE,
+}
+
+# Raw keypresses for the current OS (filled in with characters as they are seen):
+_TABLE = dict(_COMMON)
+_TABLE.update(_WINDOWS if utils.is_windows() else _UNIX)
+
+# Keys that can be referred to by name in a keymap:
+KEYS = {key.name: key for key in Key._interned.values()}
+KEYS.update({
+    'y': char('y'),
+    'Y': char('Y'),
+    'n': char('n'),
+    'N': char('N'),
+})
+
+
+def decode(raw) -> Key:
+    """Returns the Key object for a raw keypress.
+
+    Parameters
+    ----------
+    raw : int or str or Key
+        A keypress as returned by the OS listening function.
+
+    Returns
+    -------
+    Key
+        The matching Key object or ``UNKNOWN``.
+    """
+
+    key = _TABLE.get(raw)
+    if key is not None:
+        return key
+    if isinstance(raw, Key):
+        return raw
+
+    if isinstance(raw, int) and raw >= ansi.SPACE and raw != ansi.BACKSPACE_CTRL_CODE:
+        key = _TABLE[raw] = char(chr(raw))
+        return key
+    return UNKNOWN
+
+
+def get(name) -> Key:
+    """Returns the Key object for a key name.
+
+    Parameters
+    ----------
+    name : str or Key
+        A single character or the name of a key (e.g., "pageup" or "ctrl+n").
+
+    Returns
+    -------
+    Key
+
+    Raises
+    ------
+    ValueError
+        If `name` isn't the name of a key.
+    """
+
+    if isinstance(name, Key):
+        return name
+    if len(name) == 1:
+        return char(name)
+
+    key = KEYS.get(name.lower())
+    if key is None:
+        raise ValueError(f"'{name}' is not the name of a key")
+    return key
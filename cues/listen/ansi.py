@@ -12,6 +12,9 @@ This module contains information for ANSI escape codes.
 NULL = 0  # Null character
 
 ESC = 224  # Ordinal number for the ESC key:
+ESC_ORD = 27  # Ordinal number for the ESC character
+
+TAB = 9  # Ordinal number for the tab key / Windows & Unix
 
 CTRL_C = 3  # Ordinal number for CTRL + C:
 
@@ -20,6 +23,11 @@ UP = 72 + SHIFT  # Ordinal number for the up arrow key / Windows
 RIGHT = 77 + SHIFT  # Ordinal number for the right arrow key / Windows
 DOWN = 80 + SHIFT  # Ordinal number for the down arrow key / Windows
 LEFT = 75 + SHIFT  # Ordinal number for the left arrow key / Windows
+HOME = 71 + SHIFT  # Ordinal number for the home key / Windows
+END = 79 + SHIFT  # Ordinal number for the end key / Windows
+PAGE_UP = 73 + SHIFT  # Ordinal number for the page up key / Windows
+PAGE_DOWN = 81 + SHIFT  # Ordinal number for the page down key / Windows
+DELETE = 83 + SHIFT  # Ordinal number for the delete key / Windows
 
 ENTER = 13  # Ordinal number for the enter key / Windows
 ENTER_CTRL_CODE = 10  # Ordinal number for the enter key (CTRL + code) / Unix
@@ -58,6 +66,7 @@ CURSOR_POS = '\x1b[6n'  # Gets current cursor position #ROW;#COLR
 
 CLEAR_LINE = '\x1b[K'  # Clears the current line
 CLEAR_ENTIRE_LINE = '\x1b[2K'  # Clears the entire line
+ERASE_LEFT = '\b \b'  # Erases the character before the cursor
 
 
 # Set mode:
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.listen.session
+===================
+
+This module contains the Session class for keeping keypresses that are typed
+ahead of a prompt.
+"""
+
+import codecs
+import os
+import platform
+import sys
+import time
+from collections import deque
+try:
+    import termios  # pylint: disable=import-error
+except ModuleNotFoundError:
+    pass
+try:
+    import tty
+except ModuleNotFoundError:
+    pass
+
+from . import ansi, unix, windows
+
+# Seconds to wait for the rest of an escape sequence before treating ESC as a key:
+ESC_DELAY = 0.05
+
+# The Session instance that is currently active, if any:
+_current = None
+
+
+def current():
+    """Returns the active Session object or None.
+    """
+
+    return _current
+
+
+class Session:
+    """Queues keypresses across consecutive Cue objects.
+
+    Outside of a Session, the terminal is only put into cbreak mode while a
+    Cue object waits on a key, so anything typed between two prompts is
+    echoed and may be lost. A Session keeps the terminal in cbreak mode for
+    its whole lifetime and reads every available keypress into a queue, so
+    keys typed before a prompt appears are delivered to it in order.
+
+    Cue objects must be created inside the ``with`` block to use the queue.
+
+    Attributes
+    ----------
+    _pending : Deque
+        Keypresses that have been read but not yet delivered.
+    _rest : str
+        Text that may be the beginning of an escape sequence.
+    _fd : int or None
+        The file descriptor of stdin while the Session is active on Unix.
+    _old : list or None
+        The tty attributes to restore when the Session ends on Unix.
+    """
+
+    __name__ = 'Session'
+    __module__ = 'cues'
+
+    def __init__(self):
+        self._pending = deque()
+        self._rest = ''
+        self._decoder = codecs.getincrementaldecoder(
+            getattr(sys.stdin, 'encoding', None) or 'utf-8')(errors='replace')
+
+        self._windows = platform.system() == 'Windows'
+        self._fd = None
+        self._old = None
+
+    def __enter__(self):
+        global _current
+
+        if _current is not None:
+            raise RuntimeError('a Session is already active')
+
+        if not self._windows:
+            self._fd = sys.stdin.fileno()
+            self._old = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+
+        _current = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        global _current
+
+        _current = None
+
+        if self._old is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._old)
+            self._fd = None
+            self._old = None
+
+    def push(self, *keys):
+        """Adds keypresses to the end of the queue.
+
+        Parameters
+        ----------
+        keys
+            Keypresses in the format returned by the OS listening function.
+        """
+
+        self._pending.extend(keys)
+
+    def listen(self, timeout: float = None):
+        """Returns the next queued keypress.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds to wait for a keypress. Waits forever by default.
+
+        Returns
+        -------
+        int or str or None
+            The keypress, or None if `timeout` seconds pass first.
+        """
+
+        if not self._pending:
+            if self._windows:
+                return windows.listen(timeout)
+            self._fill(timeout)
+
+        if self._pending:
+            return self._pending.popleft()
+        return None
+
+    def _fill(self, timeout: float = None):
+        """Reads everything available on stdin into the queue.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while not self._pending:
+            wait = None if deadline is None else max(
+                deadline - time.monotonic(), 0)
+            # A lone ESC is a key of its own unless more of the sequence follows:
+            if self._rest == ansi.ESC_CODE:
+                wait = ESC_DELAY if wait is None else min(wait, ESC_DELAY)
+
+            if not unix.is_data(wait):
+                if self._rest == ansi.ESC_CODE:
+                    self._pending.append(self._rest)
+                    self._rest = ''
+                    continue
+                if deadline is not None:
+                    return
+                continue
+
+            text = self._decoder.decode(os.read(self._fd, 1024))
+            keys, self._rest = unix.split_keys(self._rest + text)
+            self._pending.extend(keys)
@@ -21,7 +21,10 @@ except ModuleNotFoundError:
 from . import ansi
 
 
-def listen():
+def listen(timeout: float = None):
+    """Returns the next keypress or None if `timeout` seconds pass first.
+    """
+
     fd = sys.stdin.fileno()  # File descriptor
     old = termios.tcgetattr(fd)  # Necessary for restoring tty attributes
 
@@ -31,6 +34,10 @@ def listen():
         # more info.
         tty.setcbreak(fd)
 
+        # Waits on stdin without spinning when a deadline is given:
+        if timeout is not None and not is_data(timeout):
+            return None
+
         key = get_key()
         return key
     finally:
@@ -45,13 +52,66 @@ def get_key():
 
             if key == ansi.ESC_CODE:
                 key = sys.stdin.read(2)
+                # Sequences such as page up (ESC [5~) carry parameters:
+                while key[-1:].isdigit() or key.endswith(';'):
+                    key += sys.stdin.read(1)
                 return key
 
             return ord(key)
 
 
-def is_data() -> bool:
-    return select.select([sys.stdin.fileno()], [], [], 0) == ([sys.stdin.fileno()], [], [])
+def split_keys(text: str) -> tuple:
+    """Splits text read from stdin into keypresses.
+
+    Keypresses are returned in the same format as ``get_key``: ordinal
+    numbers for characters and escape sequences without the leading ESC.
+
+    Parameters
+    ----------
+    text : str
+        Characters that were read from stdin.
+
+    Returns
+    -------
+    :rtype: tuple
+        A tuple containing (in this order) a list of keypresses and a str
+        object holding an escape sequence that hasn't been read completely.
+    """
+
+    keys = []
+    i = 0
+    length = len(text)
+
+    while i < length:
+        char = text[i]
+        if char != ansi.ESC_CODE:
+            keys.append(ord(char))
+            i += 1
+            continue
+
+        if i + 1 == length:
+            break
+        # ESC followed by anything other than a CSI or SS3 introducer:
+        if text[i + 1] not in '[O':
+            keys.append(ansi.ESC_CODE)
+            i += 1
+            continue
+
+        # Escape sequences end with a byte in the range @ to ~:
+        end = i + 2
+        while end < length and not '@' <= text[end] <= '~':
+            end += 1
+        if end == length:
+            break
+
+        keys.append(text[i + 1:end + 1])
+        i = end + 1
+
+    return keys, text[i:]
+
+
+def is_data(timeout: float = 0) -> bool:
+    return select.select([sys.stdin.fileno()], [], [], timeout) == ([sys.stdin.fileno()], [], [])
 
 
 def listen_for_pos():
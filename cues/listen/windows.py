@@ -11,6 +11,7 @@ try:
     import msvcrt  # pylint: disable=import-error
 except ModuleNotFoundError:
     pass
+import time
 from ctypes import Structure, byref, c_long, c_short, c_ushort
 try:
     from ctypes import windll
@@ -19,8 +20,21 @@ except ImportError:
 
 from . import ansi
 
+# Seconds between checks of the console input buffer while waiting on a timeout:
+POLL_INTERVAL = 0.01
+
+
+def listen(timeout: float = None):
+    """Returns the next keypress or None if `timeout` seconds pass first.
+    """
+
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(POLL_INTERVAL)
 
-def listen():
     key = ord(msvcrt.getch())
 
     if key == ansi.CTRL_C:
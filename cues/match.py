@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.match
+==========
+
+This module contains the functions for scoring options against a fuzzy query
+and the Matcher class for ranking large lists of options.
+"""
+
+import heapq
+import multiprocessing
+import os
+import string
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, List, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The number of options above which ranking is split across processes:
+PARALLEL_THRESHOLD = 100_000
+
+# The number of options scored between checks for a newer query:
+BATCH_SIZE = 4096
+
+# Characters after which a match counts as the start of a word:
+SEPARATORS = frozenset(' -_./\\:')
+
+MATCH_SCORE = 16
+CONSECUTIVE_BONUS = 8
+BOUNDARY_BONUS = 8
+GAP_PENALTY = 1
+
+# Each letter and digit gets a bit so that options can be ruled out quickly:
+_BITS = {
+    char: 1 << position
+    for position, char in enumerate(string.ascii_lowercase + string.digits)
+}
+
+# Process pools take an initializer from Python 3.7 on:
+_HAS_INITIALIZER = sys.version_info >= (3, 7)
+
+# Set in worker processes by _init_worker:
+_worker_texts = None
+_worker_masks = None
+_worker_generation = None
+
+
+def fold(option) -> str:
+    """Returns the text of an option as it is compared to a query.
+
+    Parameters
+    ----------
+    option
+        An object that can be converted to a str object.
+
+    Returns
+    -------
+    str
+    """
+
+    return str(option).casefold()
+
+
+def get_mask(text: str) -> int:
+    """Returns a bit mask of the letters and digits in `text`.
+
+    Parameters
+    ----------
+    text
+        A casefolded str object.
+
+    Returns
+    -------
+    int
+    """
+
+    mask = 0
+    for char in set(text):
+        mask |= _BITS.get(char, 0)
+    return mask
+
+
+def score(query: str, text: str) -> Optional[int]:
+    """Scores how well `text` matches `query`.
+
+    The characters of `query` must appear in `text` in the same order but not
+    necessarily next to each other. Runs of consecutive characters and
+    characters at the start of words score higher, and gaps score lower.
+
+    Parameters
+    ----------
+    query
+        A casefolded str object.
+    text
+        A casefolded str object.
+
+    Returns
+    -------
+    int or None
+        The score, or None if `text` doesn't match.
+    """
+
+    if not query:
+        return 0
+
+    # Finds the first place where the whole query has been matched:
+    position = -1
+    for char in query:
+        position = text.find(char, position + 1)
+        if position == -1:
+            return None
+    end = position
+
+    # Walks back from there to find the shortest match that ends at `end`:
+    start = end
+    for char in reversed(query[:-1]):
+        start = text.rfind(char, 0, start)
+
+    total = 0
+    previous = None
+    position = start - 1
+    for char in query:
+        position = text.find(char, position + 1)
+        total += MATCH_SCORE
+        if previous is not None:
+            if position == previous + 1:
+                total += CONSECUTIVE_BONUS
+            else:
+                total -= GAP_PENALTY * (position - previous - 1)
+        if position == 0 or text[position - 1] in SEPARATORS:
+            total += BOUNDARY_BONUS
+        previous = position
+    return total
+
+
+def rank(query: str, texts: Sequence[str], masks: Sequence = None,
+         limit: int = None, indices: Iterable[int] = None) -> List[int]:
+    """Returns the indices of the texts that match `query`, best first.
+
+    Parameters
+    ----------
+    query
+        A casefolded str object.
+    texts
+        Casefolded options.
+    masks : optional
+        The bit mask of each text, as returned by ``get_masks``.
+    limit : int, optional
+        The largest number of indices to return.
+    indices : iterable of int, optional
+        The indices of the texts to consider. Defaults to all of them.
+
+    Returns
+    -------
+    list of int
+    """
+
+    scored = _score_range(query, texts, masks, 0, len(texts), indices)
+    return [index for _, index in _top(scored, limit)]
+
+
+def get_masks(texts: Sequence[str]):
+    """Returns the bit mask of each text.
+
+    Parameters
+    ----------
+    texts
+        Casefolded options.
+
+    Returns
+    -------
+    numpy.ndarray or list of int
+        An array when NumPy is installed, so that masks can be compared in bulk.
+    """
+
+    masks = [get_mask(text) for text in texts]
+    if numpy is not None:
+        return numpy.array(masks, dtype=numpy.uint64)
+    return masks
+
+
+def _concatenate(masks, more):
+    """Returns the masks in `masks` followed by those in `more`.
+    """
+
+    if masks is None:
+        return more
+    if numpy is not None and isinstance(masks, numpy.ndarray):
+        return numpy.concatenate((masks, more))
+    return masks + more
+
+
+def _candidates(query_mask: int, masks, start: int, stop: int) -> Iterable[int]:
+    """Returns the indices in [start, stop) whose masks contain `query_mask`.
+    """
+
+    if numpy is not None and isinstance(masks, numpy.ndarray):
+        window = masks[start:stop]
+        wanted = numpy.uint64(query_mask)
+        return (numpy.flatnonzero((window & wanted) == wanted) + start).tolist()
+    return [
+        index for index in range(start, stop)
+        if masks[index] & query_mask == query_mask
+    ]
+
+
+def _score_range(query: str, texts: Sequence[str], masks, start: int,
+                 stop: int, indices: Iterable[int] = None, cancelled=None):
+    """Yields (score, index) for the matching texts in [start, stop).
+
+    Parameters
+    ----------
+    cancelled : callable, optional
+        Checked after every batch; scoring stops once it returns True.
+    """
+
+    if indices is not None:
+        for index in indices:
+            result = score(query, texts[index])
+            if result is not None:
+                yield result, index
+        return
+
+    query_mask = get_mask(query)
+    for batch in range(start, stop, BATCH_SIZE):
+        batch_stop = min(batch + BATCH_SIZE, stop)
+        if masks is not None:
+            candidates = _candidates(query_mask, masks, batch, batch_stop)
+        else:
+            candidates = range(batch, batch_stop)
+
+        for index in candidates:
+            result = score(query, texts[index])
+            if result is not None:
+                yield result, index
+
+        if cancelled is not None and cancelled():
+            return
+
+
+def _top(scored, limit: int = None):
+    """Returns the best (score, index) pairs, ordered by score and then index.
+    """
+
+    def key(item):
+        return item[0], -item[1]
+
+    if limit is None:
+        return sorted(scored, key=key, reverse=True)
+    return heapq.nlargest(limit, scored, key=key)
+
+
+def _init_worker(texts: List[str], masks, generation):
+    """Keeps the options and the shared generation counter in a worker process.
+    """
+
+    global _worker_texts, _worker_masks, _worker_generation
+
+    _worker_texts = texts
+    _worker_masks = masks
+    _worker_generation = generation
+
+
+def _rank_chunk(query: str, start: int, stop: int, limit: int, generation: int):
+    """Returns the best (score, index) pairs in [start, stop) in a worker process.
+
+    Returns None if a newer query was submitted while scoring.
+    """
+
+    def cancelled():
+        return _worker_generation.value != generation
+
+    if cancelled():
+        return None
+
+    scored = _score_range(query, _worker_texts, _worker_masks,
+                          start, stop, cancelled=cancelled)
+    top = _top(scored, limit)
+    if cancelled():
+        return None
+    return top
+
+
+class Matcher:
+    """Ranks a list of options against fuzzy queries.
+
+    Small lists are ranked in the calling thread. Lists with at least
+    ``threshold`` options are split into chunks that are ranked by a pool of
+    worker processes, which receive the options and their masks once when
+    the pool starts. On Python 3.6, which can't pass them to new workers,
+    the workers are forked after the options are stored in this module, and
+    lists are ranked in the calling thread where processes aren't forked.
+
+    Where workers are spawned rather than forked (the default on Windows and
+    on macOS from Python 3.8), each worker imports the ``__main__`` module
+    of the program, so a script that ranks large lists has to start its
+    prompts under ``if __name__ == '__main__':``. If the workers can't
+    start, the pool is given up and the options are ranked in the calling
+    thread from then on.
+    Submitting a query cancels the ranking of the previous one: chunks that
+    haven't started are dropped and running chunks stop after their current
+    batch.
+
+    Attributes
+    ----------
+    _options : Sequence
+        The options to rank.
+    _processes : int
+        The number of worker processes to use for large lists.
+    _threshold : int
+        The number of options from which worker processes are used.
+    _texts : list of str or None
+        The casefolded options, computed as queries need them.
+    _masks : numpy.ndarray or list of int or None
+        The bit mask of each text in ``_texts``.
+    _generation : int
+        The number of queries submitted so far.
+    _context : multiprocessing context
+        Starts the worker processes.
+    _broken : bool
+        Whether the worker processes failed to start.
+    _shared : multiprocessing.Value or None
+        ``_generation`` as seen by the worker processes.
+    _pool : ProcessPoolExecutor or None
+        The worker processes, started on the first large query.
+    _future : Future or None
+        The ranking of the current query.
+    _futures : list of Future
+        The chunks of the current query.
+    _lock : threading.Lock
+        Guards the result of the current query.
+    """
+
+    __name__ = 'Matcher'
+    __module__ = 'cues'
+
+    def __init__(self, options: Sequence, processes: int = None,
+                 threshold: int = PARALLEL_THRESHOLD):
+        """
+
+        Parameters
+        ----------
+        options
+            The options to rank.
+        processes : int, optional
+            The number of worker processes to use for large lists. Defaults
+            to the number of CPUs.
+        threshold : int, optional
+            The number of options from which worker processes are used.
+        """
+
+        if processes is not None and processes < 1:
+            raise ValueError(f'processes must be positive: {processes}')
+
+        self._options = options
+        self._processes = processes or os.cpu_count() or 1
+        self._threshold = threshold
+
+        self._texts = None
+        self._masks = None
+
+        self._generation = 0
+        self._context = multiprocessing.get_context()
+        self._broken = False
+        self._shared = None
+        self._pool = None
+        self._future = None
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def rank(self, query: str, limit: int = None) -> List[int]:
+        """Returns the indices of the options that match `query`, best first.
+
+        Parameters
+        ----------
+        query
+            The text to look for.
+        limit : int, optional
+            The largest number of indices to return.
+
+        Returns
+        -------
+        list of int
+        """
+
+        return self.submit(query, limit).result()
+
+    def submit(self, query: str, limit: int = None) -> Future:
+        """Starts ranking the options against `query`.
+
+        Any ranking that is still running for a previous query is cancelled.
+
+        Parameters
+        ----------
+        query
+            The text to look for.
+        limit : int, optional
+            The largest number of indices to return.
+
+        Returns
+        -------
+        Future
+            Resolves to the indices of the matching options, best first, or
+            is cancelled once another query is submitted.
+        """
+
+        self.cancel()
+
+        query = fold(query)
+        future = Future()
+        if not query:
+            future.set_result(range(len(self._options))[:limit])
+            return future
+
+        self._prepare()
+        if not self._use_pool():
+            future.set_result(rank(query, self._texts, self._masks, limit))
+            return future
+
+        self._future = future
+        self._submit_chunks(future, query, limit)
+        return future
+
+    def cancel(self):
+        """Cancels the ranking of the current query.
+        """
+
+        self._generation += 1
+        if self._shared is not None:
+            self._shared.value = self._generation
+
+        for chunk in self._futures:
+            chunk.cancel()
+        self._futures = []
+
+        with self._lock:
+            if self._future is not None:
+                self._future.cancel()
+                self._future = None
+
+    def close(self):
+        """Cancels any ranking and stops the worker processes.
+        """
+
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+            self._shared = None
+
+    def _prepare(self):
+        """Computes the casefolded options and their masks.
+
+        Options that were added to the source since the last query, such as
+        streamed ones, are folded too, and the worker processes are
+        restarted to receive them.
+        """
+
+        options = self._options
+        if self._texts is None:
+            self._texts = []
+        count = len(self._texts)
+        if count == len(options):
+            return
+
+        texts = [fold(options[i]) for i in range(count, len(options))]
+        self._texts.extend(texts)
+        self._masks = _concatenate(self._masks, get_masks(texts))
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _use_pool(self) -> bool:
+        if self._broken or self._processes < 2 or len(self._options) < self._threshold:
+            return False
+        # Workers only inherit the options from this module if they are forked:
+        return _HAS_INITIALIZER or self._context.get_start_method() == 'fork'
+
+    def _start_pool(self):
+        """Starts the worker processes with the options and the generation counter.
+        """
+
+        self._shared = self._context.Value('l', self._generation)
+        if _HAS_INITIALIZER:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._processes, mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._texts, self._masks, self._shared))
+        else:
+            # The workers are forked on the first submit and inherit these:
+            _init_worker(self._texts, self._masks, self._shared)
+            self._pool = ProcessPoolExecutor(max_workers=self._processes)
+
+    def _submit_chunks(self, future: Future, query: str, limit: int = None):
+        """Splits the ranking of `query` across the worker processes.
+        """
+
+        if self._pool is None:
+            self._start_pool()
+
+        total = len(self._texts)
+        size = -(-total // self._processes)
+        generation = self._generation
+
+        chunks = [
+            self._pool.submit(_rank_chunk, query, start,
+                              min(start + size, total), limit, generation)
+            for start in range(0, total, size)
+        ]
+        self._futures = chunks
+
+        def merge(_):
+            with self._lock:
+                if future.done() or not all(chunk.done() for chunk in chunks):
+                    return
+                if generation != self._generation or any(
+                        chunk.cancelled() for chunk in chunks):
+                    future.cancel()
+                    return
+
+                error = next((chunk.exception() for chunk in chunks
+                              if chunk.exception() is not None), None)
+                if isinstance(error, BrokenProcessPool):
+                    # Workers that can't import __main__ exit at once:
+                    self._broken = True
+                    future.set_result(rank(query, self._texts[:total], self._masks[:total], limit))
+                    return
+                if error is not None:
+                    future.set_exception(error)
+                    return
+
+                results = [chunk.result() for chunk in chunks]
+                if any(result is None for result in results):
+                    future.cancel()
+                    return
+                top = _top((item for result in results for item in result), limit)
+                future.set_result([index for _, index in top])
+
+        for chunk in chunks:
+            chunk.add_done_callback(merge)
@@ -0,0 +1,1294 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.menu
+=========
+
+This module contains the Menu class, the base class for cues that display a
+list of options, and the Viewport class that decides which options are visible.
+"""
+
+import os
+import time
+from abc import abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import wait
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from . import color, cursor, keys, match
+from .cue import Cue
+from .frecency import FrecencyIndex, PromotedRange
+from .preview import Previewer
+from .source import FileSource, LazySource, StreamSource, create_source
+from .listen import ansi
+
+# Turns the color tags of a format into color codes once, before its fields are filled in:
+colorize = lru_cache(maxsize=64)(color.make_colored)
+
+
+class Viewport:
+    """Tracks which rows of a list fit on the screen.
+
+    Attributes
+    ----------
+    height : int
+        The number of rows that are visible at once.
+    top : int
+        The index of the first visible row.
+    """
+
+    __name__ = 'Viewport'
+    __module__ = 'cues'
+
+    def __init__(self, height: int = 1):
+        self.height = height
+        self.top = 0
+
+    def follow(self, index: int, total: int):
+        """Scrolls as little as possible to make `index` visible.
+
+        Parameters
+        ----------
+        index
+            The row that must be visible.
+        total
+            The total number of rows.
+        """
+
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.height:
+            self.top = index - self.height + 1
+
+        self.top = max(0, min(self.top, total - self.height))
+
+    def rows(self, total: int) -> range:
+        """Returns the indices of the visible rows.
+
+        Parameters
+        ----------
+        total
+            The total number of rows.
+
+        Returns
+        -------
+        range
+        """
+
+        return range(self.top, min(self.top + self.height, total))
+
+
+class Menu(Cue):
+    """The abstract base class for cues that display a list of options.
+
+    Only the options that fit in the console are written on each keypress,
+    so the cost of a frame depends on the height of the console rather than
+    the number of options. When there are more options than rows, a line
+    above and below the list shows how many options are hidden.
+
+    Options are never copied: sequences are indexed as they are and other
+    iterables, such as generators, are read as the list scrolls down to
+    them, as are the lines of a FileSource object. Only the visible options
+    are converted to str objects. Options from a StreamSource object appear
+    while the prompt is open, without moving the active option.
+
+    Besides moving one row at a time, the user can jump a page at a time
+    with Page Up and Page Down, to either end with Home and End, or to a
+    row by typing its number and pressing Enter.
+
+    Typing any other character filters the options down to the ones that
+    contain the query. The matches for each prefix of the query are cached,
+    so a longer query only searches the previous matches and Backspace
+    reuses earlier results. With ``fuzzy``, the options are instead ranked
+    by a Matcher object and only the best ``FUZZY_LIMIT`` are shown; keys
+    are still read while a large list is being ranked, and a new query
+    cancels the old one.
+
+    With ``type_ahead``, typed characters jump to the first option that
+    starts with them instead of filtering, and typing the same letter again
+    moves on to the next one, as in native menus. The casefolded options are
+    sorted into an index before the prompt is first drawn, so that the first
+    letter doesn't wait on the sort and each jump is a binary search.
+
+    With ``preview``, a pane below the options shows the preview of the
+    active option. Previews are computed by a Previewer object in the
+    background once the active option has stayed the same for
+    ``POLL_INTERVAL`` seconds, so a slow callback never holds up the list.
+    The pane is always below the options: rows are truncated to the width
+    of the console, and there is no layout with the pane beside them.
+
+    With ``frecency``, the options that were picked in earlier runs of a
+    prompt with the same name are listed first, those picked most often and
+    most recently at the top. The picks are kept by a FrecencyIndex object.
+
+    Attributes
+    ----------
+    _options : Sequence or LazySource or StreamSource or FileSource
+        The available options for the user to pick from.
+    _opened : bool
+        Whether ``_options`` is a FileSource that was opened from a path,
+        which is closed when the prompt finishes.
+    _index : int
+        The position of the active option in ``_rows``.
+    _rows : Sequence of int
+        The indices of the options that match the query, in order.
+    _wrap : bool
+        Whether moving past either end of the list continues at the other end.
+    _max_rows : int or None
+        The largest number of options to show at once.
+    _viewport : Viewport
+        The visible part of ``_options``.
+    _init_fmt : str
+        The format for the initial statement.
+    _more_fmt : str
+        The format for the lines that count the hidden options.
+    _goto_fmt : str
+        The format for the line that shows the row number being typed.
+    _filter_fmt : str
+        The format for the line that shows the query.
+    _goto : str or None
+        The digits of the row number being typed, or None unless Ctrl+G
+        started one.
+    _query : str
+        The text that the options are filtered by.
+    _folded : list of str
+        The casefolded text of each option, computed as queries need them.
+    _matches : dict
+        The matching indices for each casefolded prefix of the query.
+    _type_ahead : bool
+        Whether typed characters jump to options instead of filtering them.
+    _prefix : str
+        The casefolded characters typed to jump to an option.
+    _prefix_time : float
+        The ``time.monotonic`` value at which ``_prefix`` was last typed into.
+    _prefix_index : tuple or None
+        The casefolded options in sorted order, the index of each of them
+        in ``_options`` and the position of each option in the sorted order.
+    _matcher : Matcher or None
+        Ranks the options against the query if ``fuzzy`` is True.
+    _ranking : Future or None
+        The ranking of the query that is still running, if any.
+    _ranked : int
+        The number of options when the last ranking was started.
+    _previewer : Previewer or None
+        Computes the previews of the options if ``preview`` is given.
+    _preview_lines : int
+        The number of lines in the preview pane.
+    _preview_shown : int or None
+        The index of the option whose preview the previous frame showed.
+    _frecency : FrecencyIndex or None
+        Remembers the picks made in the prompt if ``frecency`` is set.
+    _promoted : list of int
+        The indices of the options listed first because of earlier picks.
+    _received : int
+        The number of streamed options that the rows were last updated with.
+    _stream_done : bool
+        Whether the rows have been updated with every streamed option.
+    _row_cache : OrderedDict
+        Rendered rows with their color codes, by option index and state,
+        least recently used first.
+    _row_cache_width : int
+        The width of the console that the cached rows were rendered for.
+    _frame_lines : int
+        The number of lines written by the previous frame.
+    _frame_time : float
+        The ``time.monotonic`` value at which the previous frame was written.
+    _done : bool
+        Whether the user has submitted their answer.
+    """
+
+    __name__ = 'Menu'
+    __module__ = 'cues'
+
+    SETTINGS = Cue.SETTINGS + (
+        'max_rows', 'wrap', 'fuzzy', 'type_ahead', 'preview', 'preview_lines',
+        'frecency')
+
+    # The lines around the options: the message, two scroll lines, a status line and the cursor's line:
+    RESERVED_LINES = 5
+
+    # The largest number of fuzzy matches to show:
+    FUZZY_LIMIT = 1000
+
+    # Seconds between checks for a finished ranking or streamed options while waiting on a key:
+    POLL_INTERVAL = 0.02
+
+    # Seconds between frames for streamed options that arrive below the visible rows:
+    COUNT_INTERVAL = 0.1
+
+    # The largest number of rendered rows to keep:
+    ROW_CACHE_SIZE = 1024
+
+    # Seconds after which a typed character starts a new prefix to jump to:
+    TYPE_AHEAD_TIMEOUT = 1.0
+
+    # The spaces between options that are shown side by side:
+    COLUMN_GAP = '  '
+
+    keymap = {
+        keys.UP: 'up',
+        keys.DOWN: 'down',
+        keys.PAGE_UP: 'page_up',
+        keys.PAGE_DOWN: 'page_down',
+        keys.HOME: 'home',
+        keys.END: 'end',
+        keys.BACKSPACE: 'backspace',
+        keys.ESCAPE: 'cancel',
+        keys.ENTER: 'submit',
+        keys.CTRL[7]: 'goto',
+    }
+
+    def __init__(self, name: str, message: str, options: Iterable,
+                 max_rows: int = None, wrap: bool = True, fuzzy: bool = False,
+                 type_ahead: bool = False, preview: Callable[[Any], str] = None, preview_lines: int = 5,
+                 frecency=False, **kwargs):
+        """
+
+        Parameters
+        ----------
+        name
+            The name of the Menu instance.
+        message
+            Instructions or useful information regarding the prompt for the user.
+        options
+            Available options for the user to pick from.
+        max_rows : int, optional
+            The largest number of options to show at once. Defaults to as
+            many as fit in the console.
+        wrap : bool, optional
+            Whether moving past either end of the list continues at the
+            other end. Default is True.
+        fuzzy : bool, optional
+            Whether to rank the options by how well they fuzzy match the
+            query instead of keeping those that contain it. Default is False.
+        type_ahead : bool, optional
+            Whether typed characters jump to the first option that starts
+            with them instead of filtering the options. Default is False.
+        preview : callable, optional
+            Takes the active option and returns text to show below the
+            options. It is run in a background thread.
+        preview_lines : int, optional
+            The number of lines in the preview pane. Default is 5.
+        frecency : bool or FrecencyIndex, optional
+            Whether to list the options that were picked most often and most
+            recently in this prompt first. Picks are stored in the user's
+            cache directory unless a FrecencyIndex object is given. Default
+            is False.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``.
+        """
+
+        super().__init__(name, message, **kwargs)
+
+        self._options = create_source(options)
+        self._opened = isinstance(options, os.PathLike)
+
+        if max_rows is not None and max_rows < 1:
+            raise ValueError(f'max_rows must be positive: {max_rows}')
+        if preview_lines < 1:
+            raise ValueError(f'preview_lines must be positive: {preview_lines}')
+
+        self._index = 0
+        self._rows = range(len(self._options))
+        self._wrap = wrap
+        self._max_rows = max_rows
+        self._viewport = Viewport()
+
+        self._init_fmt = '[pink][?][/pink] {message}\n'
+        self._more_fmt = '[darkgrey]  {arrow} {count} more[/darkgrey]'
+        self._goto_fmt = '[darkgrey]  Go to[/darkgrey] {row}'
+        self._filter_fmt = '[darkgrey]  Filter[/darkgrey] {query} [darkgrey]({count} of {total})[/darkgrey]'
+        self._stream_fmt = '[darkgrey]  Loading… {total} so far[/darkgrey]'
+        self._rule_fmt = '[darkgrey]  {rule}[/darkgrey]'
+        self._preview_fmt = '[darkgrey]  Loading preview…[/darkgrey]'
+
+        self._goto = None
+        self._query = ''
+        self._folded = []
+        self._matches = {}
+        self._type_ahead = type_ahead
+        self._prefix = ''
+        self._prefix_time = 0.0
+        self._prefix_index = None
+        self._matcher = match.Matcher(self._options) if fuzzy else None
+        self._ranking = None
+        self._ranked = 0
+        self._previewer = Previewer(preview) if preview is not None else None
+        self._preview_lines = preview_lines
+        self._preview_shown = None
+        if frecency is True:
+            frecency = FrecencyIndex()
+        self._frecency = frecency or None
+        self._promoted = []
+        self._received = 0
+        self._stream_done = False
+        self._row_cache = OrderedDict()
+        self._row_cache_width = 0
+        self._frame_lines = 0
+        self._frame_time = 0.0
+        self._done = False
+
+    def _draw(self):
+        """Prints the prompt to console and sets user's response.
+        """
+
+        cursor.write(self._init_fmt.format(message=self._message), color=True)
+
+        self._reset()
+        try:
+            while True:
+                lines = self._write_frame()
+
+                raw = self._next_key()
+                if raw is not None:
+                    self._dispatch(raw)
+
+                if self._done:
+                    cursor.clear(lines)
+                    break
+
+                # Moves cursor to the top:
+                cursor.move(y=lines)
+
+            self.answer = {self._name: self._get_answer()}
+            if self._frecency is not None:
+                self._frecency.record(
+                    self._name, [self._options[index] for index in self._get_chosen()])
+        finally:
+            if self._matcher is not None:
+                self._matcher.close()
+            if self._previewer is not None:
+                self._previewer.close()
+            if self._opened:
+                self._options.close()
+
+    def _reset(self):
+        """Prepares the state of the prompt before it is drawn.
+        """
+
+        if self._opened:
+            # The file was closed when the previous prompt finished:
+            self._options.open()
+
+        self._goto = None
+        self._query = ''
+        self._matches = {}
+        self._prefix = ''
+        self._ranking = None
+        if self._frecency is not None:
+            # Options can only be ranked once they have all been read:
+            self._load()
+            self._promoted = self._frecency.rank(self._name, self._options)
+        self._received = len(self._options)
+        self._stream_done = False
+        self._rows = self._get_all_rows()
+        if self._type_ahead:
+            # Sorts the options now rather than on the first typed letter:
+            self._get_prefix_index()
+        self._row_cache.clear()
+        self._preview_shown = None
+        self._frame_lines = 0
+        self._done = False
+
+    def _next_key(self):
+        """Returns the next keypress or None once the frame needs redrawing.
+
+        While a ranking is running or options are being streamed, keys are
+        polled for so that their results can be shown in between.
+
+        Returns
+        -------
+        int or str or None
+        """
+
+        if not self._is_busy():
+            return self.listen_for_key()
+
+        while True:
+            raw = self._listen(timeout=self.POLL_INTERVAL)
+            if raw is not None:
+                return raw
+            if self._update():
+                return None
+
+    def _is_busy(self) -> bool:
+        """Returns whether a ranking or streamed options are still pending.
+        """
+
+        if self._ranking is not None:
+            return True
+        if self._previewer is not None and self._get_active() != self._preview_shown:
+            return True
+
+        return isinstance(self._options, StreamSource) and not self._stream_done
+
+    def _update(self) -> bool:
+        """Applies finished rankings and newly streamed options.
+
+        Returns
+        -------
+        bool
+            Whether the frame needs redrawing.
+        """
+
+        redraw = False
+        if self._ranking is not None and self._ranking.done():
+            self._finish_ranking()
+            redraw = True
+
+        if isinstance(self._options, StreamSource):
+            redraw = self._receive() or redraw
+
+        if self._previewer is not None:
+            redraw = self._update_preview() or redraw
+        return redraw
+
+    def _update_preview(self) -> bool:
+        """Asks for the preview of the active option once it stays active.
+
+        Returns
+        -------
+        bool
+            Whether the preview of the active option is ready to be shown.
+        """
+
+        active = self._get_active()
+        if active is None or active == self._preview_shown:
+            return False
+
+        if self._previewer.get(active) is not None:
+            return True
+        self._previewer.request(active, self._options[active])
+        return False
+
+    def _receive(self) -> bool:
+        """Updates the rows with the options that have been streamed in.
+
+        Returns
+        -------
+        bool
+            Whether the new options are visible, the stream ended or enough
+            time has passed to update the count.
+        """
+
+        options = self._options
+        # Reads the flag first so that no options arrive unseen after it:
+        exhausted = options.exhausted
+        received = len(options)
+        self._stream_done = exhausted
+        if received == self._received:
+            return exhausted
+
+        previous, self._received = self._received, received
+        if self._query:
+            self._match_received(previous, received)
+        else:
+            self._rows = self._get_all_rows()
+
+        viewport = self._viewport
+        # The line below the viewport shows whether there are more options:
+        visible = previous <= (viewport.top + viewport.height) * self._get_columns()
+        elapsed = time.monotonic() - self._frame_time
+        return visible or exhausted or elapsed >= self.COUNT_INTERVAL
+
+    def _match_received(self, start: int, stop: int):
+        """Adds the streamed options in [start, stop) that match the query.
+
+        Options arrive in order, so the new options that contain the query
+        are added after the old matches and the old options aren't searched
+        again. A fuzzy ranking of every option is only started again once
+        the running one has finished, so that a fast stream can't keep
+        restarting it before its matches are shown.
+
+        Parameters
+        ----------
+        start
+            The index of the first option that arrived.
+        stop
+            The number of options that have arrived.
+        """
+
+        if self._matcher is not None:
+            if self._ranking is None:
+                self._matches = {}
+                self._filter(self._query)
+            return
+
+        query = self._query.casefold()
+        matches = self._matches.get(query)
+        if not isinstance(matches, list):
+            self._matches = {}
+            self._filter(self._query)
+            return
+
+        folded = self._fold()
+        matches.extend(i for i in range(start, stop) if query in folded[i])
+        # The matches of shorter queries are missing the new options:
+        self._matches = {query: matches}
+        self._rows = matches
+
+    def _finish_ranking(self):
+        """Shows the result of the ranking that was running.
+
+        If more options were streamed in while it ran, they are ranked next.
+        """
+
+        ranking, self._ranking = self._ranking, None
+        if ranking.cancelled():
+            return
+
+        query = self._query.casefold()
+        self._cache(query, ranking.result())
+        self._show(self._matches[query])
+
+        if len(self._options) > self._ranked:
+            self._matches = {}
+            self._filter(self._query)
+
+    @abstractmethod
+    def _get_answer(self):
+        pass
+
+    def _get_chosen(self) -> List[int]:
+        """Returns the indices of the options in the answer.
+        """
+
+        active = self._get_active()
+        return [active] if active is not None else []
+
+    @abstractmethod
+    def _render_row(self, index: int, active: bool) -> str:
+        pass
+
+    def _get_row_state(self, index: int, active: bool):
+        """Returns everything besides the option that changes how a row looks.
+
+        Subclasses whose rows have more states than active and inactive
+        extend this so that the cached rows are told apart.
+
+        Parameters
+        ----------
+        index
+            The index of the option in ``_options``.
+        active
+            Whether the option is the active one.
+
+        Returns
+        -------
+        Hashable
+        """
+
+        return active
+
+    def _get_row(self, index: int, active: bool) -> str:
+        """Returns the row of an option with its color codes.
+
+        Rows are rendered once for each state and kept until the console is
+        resized or ``ROW_CACHE_SIZE`` newer rows have been used.
+
+        Parameters
+        ----------
+        index
+            The index of the option in ``_options``.
+        active
+            Whether the option is the active one.
+
+        Returns
+        -------
+        str
+        """
+
+        cache = self._row_cache
+        key = (index, self._get_row_state(index, active))
+
+        row = cache.get(key)
+        if row is None:
+            row = color.make_colored(self._render_row(index, active))
+            cache[key] = row
+            if len(cache) > self.ROW_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return row
+
+    def _get_line(self, line: int, columns: int) -> str:
+        """Returns a line of options that are shown side by side.
+
+        Parameters
+        ----------
+        line
+            The position of the line.
+        columns
+            The number of options on each line.
+
+        Returns
+        -------
+        str
+        """
+
+        start = line * columns
+        stop = min(start + columns, len(self._rows))
+        return self.COLUMN_GAP.join(
+            self._get_row(self._rows[i], i == self._index) for i in range(start, stop))
+
+    def _get_columns(self) -> int:
+        """Returns the number of options to show side by side on each line.
+
+        Subclasses that lay out options in columns override this, and pad
+        their rows to the width of a column.
+
+        Returns
+        -------
+        int
+        """
+
+        return 1
+
+    def _get_height(self, total: int) -> int:
+        """Returns the number of lines of options to show at once.
+
+        Parameters
+        ----------
+        total
+            The total number of lines of options.
+
+        Returns
+        -------
+        int
+        """
+
+        reserved = self.RESERVED_LINES
+        if self._previewer is not None:
+            reserved += self._preview_lines + 1
+        height = max(self.max_lines - reserved, 1)
+        if self._max_rows is not None:
+            height = min(height, self._max_rows)
+        return min(height, total)
+
+    def _write_frame(self) -> int:
+        """Writes the visible options and returns the number of lines written.
+
+        Returns
+        -------
+        int
+        """
+
+        self.update_max_columns()
+        self.update_max_lines()
+
+        columns = self._get_columns()
+        # Reads one more line of options than fits so that the hidden ones are counted:
+        self._load((max(self._index // columns, self._viewport.top) + self.max_lines + 1) * columns)
+        # The options that were just read may be wider:
+        columns = self._get_columns()
+
+        total = len(self._rows)
+        # The viewport scrolls through lines of `columns` options:
+        line_count = -(-total // columns)
+        viewport = self._viewport
+        viewport.height = self._get_height(line_count)
+        viewport.follow(self._index // columns, line_count)
+
+        # Rows are truncated to the width of the console:
+        if self.max_columns != self._row_cache_width:
+            self._row_cache.clear()
+            self._row_cache_width = self.max_columns
+
+        rows = viewport.rows(line_count)
+        if columns == 1:
+            lines = [self._get_row(self._rows[i], i == self._index) for i in rows]
+        else:
+            lines = [self._get_line(line, columns) for line in rows]
+
+        # Keeps the number of lines constant while scrolling:
+        if viewport.height < line_count:
+            above = rows.start * columns
+            below = max(total - rows.stop * columns, 0)
+            if below and not self._is_loaded():
+                below = f'{below}+'
+            more_fmt = colorize(self._more_fmt)
+            lines.insert(0, more_fmt.format(arrow='↑', count=above) if above else '')
+            lines.append(more_fmt.format(arrow='↓', count=below) if below else '')
+
+        header = self._get_header()
+        if header is not None:
+            lines.insert(0, header)
+
+        if self._previewer is not None:
+            lines.extend(self._get_preview_pane())
+
+        status = self._get_status()
+        if status:
+            lines.append(status)
+
+        self._frame_time = time.monotonic()
+
+        # Clears what is left of each line's previous contents:
+        text = ''.join(line + ansi.CLEAR_LINE + '\n' for line in lines)
+        # Clears the lines of a previous frame that was taller and moves back up:
+        extra = self._frame_lines - len(lines)
+        if extra > 0:
+            text += (ansi.CLEAR_LINE + '\n') * extra + ansi.MOVE_UP.format(extra)
+        self._frame_lines = len(lines)
+
+        cursor.write(text)
+        return len(lines)
+
+    def _get_header(self) -> Optional[str]:
+        """Returns the line above the options with its color codes, if any.
+
+        Subclasses that show a header also add a line to ``RESERVED_LINES``.
+
+        Returns
+        -------
+        str or None
+        """
+
+        return None
+
+    def _get_preview_pane(self) -> List[str]:
+        """Returns the lines of the preview pane with their color codes.
+
+        The pane always has the same number of lines, so that the frame
+        doesn't change height as previews arrive.
+
+        Returns
+        -------
+        list of str
+        """
+
+        width = max(self.max_columns - 2, 1)
+        pane = [colorize(self._rule_fmt).format(rule='─' * width)]
+
+        active = self._get_active()
+        preview = self._previewer.get(active) if active is not None else ''
+        self._preview_shown = active if preview is not None else None
+
+        if preview is None:
+            pane.append(colorize(self._preview_fmt))
+        else:
+            pane.extend(
+                '  ' + self._truncate(line.expandtabs(4), 2)
+                for line in preview.splitlines()[:self._preview_lines])
+
+        pane.extend('' for _ in range(self._preview_lines + 1 - len(pane)))
+        return pane
+
+    def _get_status(self) -> str:
+        """Returns the line below the options with its color codes, if any.
+
+        Returns
+        -------
+        str
+        """
+
+        if self._goto is not None:
+            return colorize(self._goto_fmt).format(row=self._goto)
+        if self._query:
+            return colorize(self._filter_fmt).format(
+                query=self._query, count=len(self._rows), total=len(self._options))
+        if isinstance(self._options, StreamSource) and not self._stream_done:
+            return colorize(self._stream_fmt).format(total=len(self._rows))
+        return ''
+
+    def _is_loaded(self) -> bool:
+        """Returns whether every option has been read or streamed in.
+        """
+
+        return getattr(self._options, 'exhausted', True)
+
+    def _load(self, count: int = None):
+        """Reads options from a lazy source until `count` of them are available.
+
+        Parameters
+        ----------
+        count : int, optional
+            The number of options to have read. Reads every option by default.
+        """
+
+        options = self._options
+        # Streamed options arrive on their own:
+        if not isinstance(options, (LazySource, FileSource)) or options.exhausted:
+            return
+
+        options.load(count)
+        if not self._query:
+            self._rows = self._get_all_rows()
+
+    def _get_all_rows(self) -> Sequence:
+        """Returns the indices of every option in the order they are listed.
+
+        Returns
+        -------
+        Sequence of int
+        """
+
+        total = len(self._options)
+        if self._promoted:
+            return PromotedRange(self._promoted, total)
+        return range(total)
+
+    def _get_active(self):
+        """Returns the index of the active option in ``_options``, if any.
+
+        Returns
+        -------
+        int or None
+            None if no option matches the query.
+        """
+
+        if self._rows:
+            return self._rows[self._index]
+        return None
+
+    def _match(self, query: str) -> Sequence:
+        """Returns the indices of the options that contain `query`.
+
+        Parameters
+        ----------
+        query
+            The casefolded text to look for.
+
+        Returns
+        -------
+        Sequence of int
+        """
+
+        if not query:
+            return self._get_all_rows()
+
+        matches = self._matches.get(query)
+        if matches is not None:
+            return matches
+
+        # Every option has to be searched:
+        self._load()
+
+        if self._matcher is not None:
+            self._ranked = len(self._options)
+            ranking = self._matcher.submit(query, self.FUZZY_LIMIT)
+            if not ranking.done():
+                self._ranking = ranking
+                return None
+            matches = ranking.result()
+        else:
+            # Every option that contains the query also contains its prefixes:
+            candidates = self._match(query[:-1])
+
+            folded = self._fold()
+            matches = [i for i in candidates if query in folded[i]]
+
+        self._cache(query, matches)
+        return matches
+
+    def _clear_caches(self):
+        """Forgets everything that was computed for an option by its index.
+
+        Subclasses that insert options before others or remove them call
+        this, since the indices of the options that follow change.
+        """
+
+        self._folded = []
+        self._matches = {}
+        self._prefix_index = None
+        self._promoted = []
+        self._row_cache.clear()
+        self._preview_shown = None
+        if self._previewer is not None:
+            self._previewer.clear()
+        if self._matcher is not None:
+            self._ranking = None
+            self._matcher.close()
+            self._matcher = match.Matcher(self._options)
+
+    def _fold(self) -> List[str]:
+        """Returns the casefolded text of every option read so far.
+
+        Only the options that were read or streamed in since the last call
+        are folded.
+
+        Returns
+        -------
+        list of str
+        """
+
+        folded = self._folded
+        options = self._options
+        folded.extend(
+            match.fold(options[i]) for i in range(len(folded), len(options)))
+        return folded
+
+    def _get_prefix_index(self):
+        """Returns the sorted index of the casefolded options.
+
+        The index is built once every option has been read, and again only
+        if more options are streamed in.
+
+        Returns
+        -------
+        tuple
+            The casefolded options in sorted order, the index of each of
+            them in ``_options`` and the position in the sorted order of
+            each option.
+        """
+
+        self._load()
+        total = len(self._options)
+        if self._prefix_index is not None and len(self._prefix_index[1]) == total:
+            return self._prefix_index
+
+        folded = self._fold()
+        # The sort is stable, so options with the same text keep their order:
+        order = sorted(range(total), key=folded.__getitem__)
+        keys = [folded[i] for i in order]
+        ranks = [0] * total
+        for rank, index in enumerate(order):
+            ranks[index] = rank
+
+        self._prefix_index = keys, order, ranks
+        return self._prefix_index
+
+    def _find_prefix(self, prefix: str, cycle: bool) -> Optional[int]:
+        """Returns the index of the option to jump to for `prefix`.
+
+        Options are searched in the sorted order of the index: if the active
+        option starts with `prefix`, it stays active unless `cycle` is True,
+        in which case the next option that starts with `prefix` becomes
+        active. Otherwise the first option that starts with it does.
+
+        Parameters
+        ----------
+        prefix
+            The casefolded text that the option must start with.
+        cycle
+            Whether to move past the active option.
+
+        Returns
+        -------
+        int or None
+            None if no option starts with `prefix`.
+        """
+
+        keys, order, ranks = self._get_prefix_index()
+        start = bisect_left(keys, prefix)
+        # Every text that starts with the prefix sorts below this one:
+        stop = bisect_right(keys, prefix + '\U0010ffff', start)
+        if start == stop:
+            return None
+
+        active = self._get_active()
+        rank = ranks[active] if active is not None else -1
+        if not start <= rank < stop:
+            return order[start]
+        if not cycle:
+            return active
+        rank += 1
+        return order[rank if rank < stop else start]
+
+    def _seek(self, char: str):
+        """Adds a character to the prefix and jumps to an option that has it.
+
+        A prefix that repeats one letter, such as "b" or "bb", moves to
+        the next option that starts with that letter.
+
+        Parameters
+        ----------
+        char
+            The character that was typed.
+        """
+
+        self._prefix_time = time.monotonic()
+        prefix = self._prefix = self._prefix + char.casefold()
+        cycle = prefix == prefix[0] * len(prefix)
+        index = self._find_prefix(prefix[0] if cycle else prefix, cycle)
+        if index is not None:
+            self._index = self._rows.index(index)
+
+    def _cache(self, query: str, matches: Sequence):
+        """Keeps the matches for `query` until it is no longer a prefix.
+
+        Parameters
+        ----------
+        query
+            The casefolded query.
+        matches
+            The indices of the matching options.
+        """
+
+        # Only prefixes of the query can be reached again with Backspace:
+        self._matches = {
+            prefix: indices for prefix, indices in self._matches.items()
+            if query.startswith(prefix)
+        }
+        self._matches[query] = matches
+
+    def _filter(self, query: str):
+        """Shows only the options that match `query`, ignoring case.
+
+        If the options are being ranked in the background, the current rows
+        are kept until the ranking finishes.
+
+        Parameters
+        ----------
+        query
+            The text to filter the options by.
+        """
+
+        if self._ranking is not None:
+            self._ranking = None
+            self._matcher.cancel()
+
+        self._query = query
+        rows = self._match(query.casefold())
+        if rows is not None:
+            self._show(rows)
+
+    def _show(self, rows: Sequence):
+        """Replaces the visible rows, keeping the active option if possible.
+
+        Fuzzy matches are ordered best first, so the best one becomes active.
+        Otherwise the rows are in the order of the options, apart from the
+        promoted ones that come first.
+
+        Parameters
+        ----------
+        rows
+            The indices of the options to show.
+        """
+
+        active = self._get_active()
+        self._rows = rows
+
+        position = 0
+        if active is not None and self._matcher is None:
+            position = self._locate(rows, active)
+        self._index = position
+
+    def _locate(self, rows: Sequence, index: int) -> int:
+        """Returns the position of `index` in `rows`, or 0 if it isn't there.
+
+        Parameters
+        ----------
+        rows
+            The indices of the options to show, not ranked by a Matcher.
+        index
+            The index of an option.
+
+        Returns
+        -------
+        int
+        """
+
+        if isinstance(rows, (range, PromotedRange)):
+            return rows.index(index) if index in rows else 0
+
+        # Matches list the promoted options that match first, then the others in order:
+        head = rows[:len(self._promoted)]
+        if index in head:
+            return head.index(index)
+        promoted = set(self._promoted)
+        start = sum(1 for row in head if row in promoted)
+
+        position = bisect_left(rows, index, start)
+        if position == len(rows) or rows[position] != index:
+            return 0
+        return position
+
+    def _jump(self, index: int):
+        """Makes the option at `index` active, stopping at either end.
+
+        Parameters
+        ----------
+        index
+            The index of the option to jump to.
+        """
+
+        self._load(index + 1)
+        self._index = max(0, min(index, len(self._rows) - 1))
+
+    def _move(self, offset: int):
+        """Moves the active option by `offset` rows.
+
+        Parameters
+        ----------
+        offset
+            The number of rows to move by. Negative numbers move up.
+        """
+
+        index = self._index + offset
+        # Wrapping around to the last option requires the length of the list:
+        self._load(None if index < 0 and self._wrap else index + 1)
+
+        total = len(self._rows)
+        if not total:
+            return
+
+        if self._wrap:
+            index %= total
+        else:
+            index = max(0, min(index, total - 1))
+        self._index = index
+
+    def _move_line(self, offset: int):
+        """Moves the active option by `offset` lines, keeping its column.
+
+        With several columns, wrapping around stays in the same column, and
+        a column that the last line is too short for ends at the last
+        option. Nothing moves when every option fits on one line.
+
+        Parameters
+        ----------
+        offset
+            The number of lines to move by. Negative numbers move up.
+        """
+
+        if self._get_columns() == 1:
+            self._move(offset)
+            return
+
+        # The layout of the last line requires the length of the list:
+        self._load()
+        columns = self._get_columns()
+        total = len(self._rows)
+        line_count = -(-total // columns)
+        if line_count < 2:
+            return
+
+        line, column = divmod(self._index, columns)
+        line += offset
+        if self._wrap:
+            line %= line_count
+        else:
+            line = max(0, min(line, line_count - 1))
+        self._index = min(line * columns + column, total - 1)
+
+    def _on_up(self):
+        """Moves to the option above.
+        """
+
+        self._move_line(-1)
+
+    def _on_down(self):
+        """Moves to the option below.
+        """
+
+        self._move_line(1)
+
+    def _on_page_up(self):
+        """Moves up by the number of visible lines.
+        """
+
+        self._jump(self._index - self._viewport.height * self._get_columns())
+
+    def _on_page_down(self):
+        """Moves down by the number of visible lines.
+        """
+
+        self._jump(self._index + self._viewport.height * self._get_columns())
+
+    def _on_home(self):
+        """Moves to the first option.
+        """
+
+        self._jump(0)
+
+    def _on_end(self):
+        """Moves to the last option.
+        """
+
+        self._load()
+        self._jump(len(self._rows) - 1)
+
+    def _on_goto(self):
+        """Starts typing the number of a row to jump to.
+        """
+
+        self._prefix = ''
+        self._goto = ''
+
+    def _on_backspace(self):
+        """Deletes the last character of the row number or the query.
+
+        Deleting past the first digit stops typing a row number.
+        """
+
+        if self._goto is not None:
+            self._goto = self._goto[:-1] if self._goto else None
+        elif self._query:
+            self._filter(self._query[:-1])
+
+    def _on_cancel(self):
+        """Discards the row number being typed or else the query.
+        """
+
+        self._prefix = ''
+        if self._goto is not None:
+            self._goto = None
+        elif self._query:
+            self._filter('')
+
+    def _on_submit(self):
+        """Jumps to the row number being typed or submits the answer.
+        """
+
+        if self._goto is not None:
+            if self._goto:
+                self._jump(int(self._goto) - 1)
+            self._goto = None
+            return
+
+        if self._ranking is not None:
+            # Answers from the matches of the whole query:
+            wait([self._ranking])
+            self._finish_ranking()
+        self._done = self._can_submit()
+
+    def _can_submit(self) -> bool:
+        """Returns whether the answer can be submitted.
+        """
+
+        return True
+
+    def _on_char(self, char: str):
+        """Adds a character to the row number or the query.
+
+        Row numbers start with Ctrl+G rather than with a digit, so queries
+        can start with digits. After Ctrl+G, only digits are taken, as the
+        number of the row to jump to, until it is submitted or discarded.
+        Otherwise the character is added to the query, or with
+        ``type_ahead``, to the prefix of the option to jump to. The prefix
+        starts over once ``TYPE_AHEAD_TIMEOUT`` seconds pass without typing.
+        """
+
+        if time.monotonic() - self._prefix_time > self.TYPE_AHEAD_TIMEOUT:
+            self._prefix = ''
+
+        if self._goto is not None:
+            if char.isdigit():
+                self._goto += char
+        elif self._type_ahead:
+            self._seek(char)
+        else:
+            self._filter(self._query + char)
+
+    def _truncate(self, text: str, padding: int) -> str:
+        """Shortens text so that it fits on one line after `padding` columns.
+
+        Parameters
+        ----------
+        text
+            The text to shorten.
+        padding
+            The number of columns that come before the text.
+
+        Returns
+        -------
+        str
+        """
+
+        width = self.max_columns - padding
+        if len(text) > width:
+            return text[:max(width - 1, 0)] + '…'
+        return text
@@ -7,9 +7,14 @@ cues.password
 This module contains the Password class.
 """
 
-from . import cursor
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from . import color, constants, cursor, keys
 from .cue import Cue
 from .listen import ansi
+from .secret import Secret, wipe
+from .strength import BloomFilter, Strength
 
 
 class Password(Cue):
@@ -19,16 +24,90 @@ class Password(Cue):
     would like their input to be hidden as they type as it may contain
     sensitive information.
 
+    The input is kept as UTF-8 in a bytearray that doubles in size when it
+    is full, so a long paste takes linear time, and every buffer it has
+    been kept in is overwritten with zeros once the prompt finishes. Only
+    the number of characters is needed to draw the mask. With ``secret``,
+    the answer is a Secret object that can be wiped as well instead of a
+    str object.
+
+    The prompt is written once. After that, each character writes a single
+    mask character and Backspace erases one, and the whole prompt is only
+    written again when the input moves onto another line or the console
+    is resized.
+
+    With ``strength``, a meter after the mask shows an estimate of how hard
+    the password is to guess, which is updated with each key in constant
+    time. With ``breached``, the password is also looked up in a Bloom
+    filter of breached passwords on a worker thread, so typing never waits
+    on it; only one lookup runs at a time, and the latest input is looked
+    up once it finishes.
+
     Attributes
     ----------
     _password_fmt : str
         The format for the password prompt.
+    _padding : int
+        The number of columns before the mask.
+    _secret : bool
+        Whether the answer is a Secret object.
+    _buffer : bytearray
+        The characters the user has typed, encoded as UTF-8, followed by
+        unused zero bytes.
+    _size : int
+        The number of bytes of ``_buffer`` that are used.
+    _length : int
+        The number of characters the user has typed.
+    _columns : int
+        The width of the console when the prompt was last written.
+    _clear : str
+        Clears the lines that the prompt took up when it was last written.
+    _strength : Strength or None
+        Estimates the strength of the input, if the meter is shown.
+    _breached : str or os.PathLike or BloomFilter or None
+        The breached passwords to look the input up in.
+    _filter : BloomFilter or None
+        The breached passwords, while the prompt is shown.
+    _executor : ThreadPoolExecutor or None
+        The thread that looks up the input, while the prompt is shown.
+    _lookup : Future or None
+        The lookup that is running, if any.
+    _version : int
+        The number of times the input has changed, which tells whether a
+        lookup is of the current input.
+    _found : bool or None
+        Whether the current input was found among the breached passwords,
+        or None until the lookup finishes.
+    _done : bool
+        Whether the user has submitted their answer.
     """
 
     __name__ = 'password'
     __module__ = 'cues'
 
-    def __init__(self, name: str, message: str):
+    keymap = {
+        keys.BACKSPACE: 'backspace',
+        keys.ENTER: 'submit',
+    }
+
+    # The number of bytes that the input starts with room for:
+    INITIAL_CAPACITY = 64
+
+    # Seconds between checks for a finished lookup while waiting on a key:
+    POLL_INTERVAL = 0.02
+
+    # The colors of the meter's labels:
+    METER_COLORS = {
+        'very weak': 'red',
+        'weak': 'red',
+        'fair': 'yellow',
+        'strong': 'green',
+        'very strong': 'green',
+        'breached': 'red',
+    }
+
+    def __init__(self, name: str, message: str, secret: bool = False,
+                 strength: bool = False, breached=None, **kwargs):
         """
 
         Parameters
@@ -37,9 +116,24 @@ class Password(Cue):
             The name of the Form instance.
         message
             Instructions or useful information regarding the prompt for the user.
+        secret : bool, optional
+            Whether to answer with a Secret object instead of a str object.
+            Default is False.
+        strength : bool, optional
+            Whether to show a meter of how hard the password is to guess.
+            Default is False.
+        breached : str or os.PathLike or BloomFilter, optional
+            A file made by ``BloomFilter.create`` from breached passwords,
+            or a BloomFilter object. The meter shows whether the password is
+            one of them.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``.
         """
 
-        super().__init__(name, message)
+        super().__init__(name, message, **kwargs)
+
+        if breached is not None and not isinstance(breached, (str, os.PathLike, BloomFilter)):
+            raise TypeError(f"'{type(breached)}' object is not a path or a BloomFilter")
 
         if message.strip()[-1].isalnum():
             self._password_fmt = '[pink][?][/pink] {message} [grey]∙[/grey] {input}'
@@ -47,6 +141,23 @@ class Password(Cue):
         else:
             self._password_fmt = '[pink][?][/pink] {message} {input}'
             self._password_fmt_len = 5
+        self._padding = self._password_fmt_len + len(message)
+
+        self._secret = secret
+        self._buffer = bytearray(self.INITIAL_CAPACITY)
+        self._size = 0
+        self._length = 0
+        self._columns = 0
+        self._clear = ''
+        self._strength = Strength() if strength or breached is not None else None
+        self._breached = breached
+        self._filter = None
+        self._executor = None
+        self._lookup = None
+        self._version = 0
+        self._found = None
+        self._meter_fmt = '  [{color}]{label}[/{color}]'
+        self._done = False
 
     def send(self) -> dict:
         """Returns a dict object containing user's response to the prompt.
@@ -57,59 +168,231 @@ class Password(Cue):
             Contains the user's response to the prompt.
         """
 
-        self._draw()
+        self._ask()
         return self.answer
 
     def _draw(self):
         """Assembles and prints the Password cue to the console.
         """
 
-        up = self.keys.get('up')
-        down = self.keys.get('down')
-        right = self.keys.get('right')
-        left = self.keys.get('left')
-        backspace = self.keys.get('backspace')
-        enter = self.keys.get('enter')
-
-        padding = self._password_fmt_len + len(self._message)
-        input = ''
-        password = ''
-        buffer = ''
+        self._size = 0
+        self._length = 0
+        self._clear = ''
+        self._found = None
+        self._done = False
+
+        try:
+            if self._breached is not None:
+                self._filter = self._breached
+                if not isinstance(self._filter, BloomFilter):
+                    self._filter = BloomFilter(self._breached)
+                self._executor = ThreadPoolExecutor(max_workers=1)
+
+            self._paint()
+            while True:
+                length = self._length
+                self._dispatch(self._next_key())
+
+                if self._done:
+                    cursor.move(x=-self.max_columns)
+                    cursor.write(self._clear)
+                    break
+
+                self._update(length)
+
+            # Copies the input straight from the buffer, without an intermediate bytes object:
+            data = memoryview(self._buffer)[:self._size]
+            try:
+                answer = Secret(bytearray(data)) if self._secret else str(data, 'utf-8')
+            finally:
+                data.release()
+            self.answer = {self._name: answer}
+        finally:
+            if self._executor is not None:
+                # Waits for the lookup that is running, which takes microseconds:
+                self._executor.shutdown()
+                self._executor = None
+                self._lookup = None
+            if self._filter is not None and self._filter is not self._breached:
+                self._filter.close()
+            self._filter = None
+            if self._strength is not None:
+                self._strength.clear()
+            wipe(self._buffer)
+            self._size = 0
+            self._length = 0
+
+    def _next_key(self):
+        """Returns the next keypress, showing the result of a lookup in the meantime.
+        """
 
         while True:
-            cursor.write(buffer + self._password_fmt.format(
-                message=self._message, input=password), color=True)
+            if self._lookup is None:
+                return self.listen_for_key()
+
+            raw = self._listen(timeout=self.POLL_INTERVAL)
+            if raw is not None:
+                return raw
+            if self._lookup.done():
+                self._finish_lookup()
 
-            div, mod = divmod(padding + len(input), self.max_columns)
-            if not mod:
-                div -= 1
+    def _look_up(self):
+        """Starts looking up the input unless a lookup is already running.
+        """
 
-            buffer = ''
-            for _ in range(div + 1):
-                buffer = ((ansi.CLEAR_ENTIRE_LINE + ansi.UP_ONE) * div) + \
-                    ansi.CLEAR_ENTIRE_LINE
+        if self._executor is None or self._lookup is not None or not self._size:
+            return
 
-            key = self.listen_for_key()
+        # The worker thread wipes its copy of the input once it has been hashed:
+        candidate = bytearray(memoryview(self._buffer)[:self._size])
+        self._lookup = self._executor.submit(_contains, self._filter, candidate)
+        self._lookup.version = self._version
 
-            if key == backspace:
-                input = input[:-1]
-                password = password[:-1]
+    def _finish_lookup(self):
+        """Shows the result of the lookup, or looks up the input again if it changed.
+        """
 
-            elif key == enter:
-                cursor.move(x=-self.max_columns)
-                cursor.write(buffer)
-                break
+        lookup, self._lookup = self._lookup, None
+        if lookup.version != self._version:
+            self._look_up()
+            return
 
-            elif (key == up) or (key == down) or (key == right) or (key == left):
-                pass
+        try:
+            self._found = lookup.result()
+        except (OSError, ValueError):
+            # A filter that can't be read doesn't stop the user from typing:
+            return
+        cursor.write(self._get_meter())
 
-            else:
-                input += chr(key)
-                password += '*'
+    def _get_meter(self) -> str:
+        """Returns the text that writes the meter after the mask and moves back.
 
-            cursor.move(x=-self.max_columns)
+        The meter is left out when it doesn't fit on the rest of the line.
+        """
+
+        if self._strength is None:
+            return ''
+
+        column = (self._padding + self._length) % self.max_columns
+        # The cursor waits at the end of a full line until the next character:
+        if not column:
+            return ''
+        if not self._length:
+            return ansi.CLEAR_LINE
+
+        label = 'breached' if self._found else self._strength.label
+        width = len(label) + 2
+        if width > self.max_columns - column - 1:
+            return ansi.CLEAR_LINE
+        meter = color.make_colored(self._meter_fmt.format(
+            color=self.METER_COLORS[label], label=label))
+        return ansi.CLEAR_LINE + meter + ansi.MOVE_LEFT.format(width)
+
+    def _paint(self):
+        """Writes the whole prompt over the lines it took up before.
+        """
+
+        mask = constants.PASSWORD_MARKER * self._length
+        cursor.move(x=-self.max_columns)
+        cursor.write(self._clear + self._password_fmt.format(
+            message=self._message, input=mask), color=True)
+        # The lines were cleared already, so there's no meter to clear:
+        meter = self._get_meter()
+        if self._length and meter:
+            cursor.write(meter)
+
+        self._columns = self.max_columns
+        div, mod = divmod(self._padding + self._length, self._columns)
+        # A mask that ends at the end of a line leaves the cursor on that line:
+        if not mod:
+            div -= 1
+        self._clear = ((ansi.CLEAR_ENTIRE_LINE + ansi.UP_ONE) * div) + \
+            ansi.CLEAR_ENTIRE_LINE
+
+    def _update(self, previous: int):
+        """Writes the change to the mask since it was `previous` characters long.
+
+        A character that was added or removed in the middle of a line only
+        writes or erases its mask character. Anything else, such as the
+        mask reaching the end of a line, writes the whole prompt again.
+        """
+
+        self.update_max_columns()
+        columns = self.max_columns
+        end = self._padding + previous
+        # The cursor is right after the mask unless the mask fills its last line:
+        if columns == self._columns and end % columns:
+            if self._length == previous:
+                return
+            if self._length == previous + 1:
+                cursor.write(constants.PASSWORD_MARKER + self._get_meter())
+                return
+            if self._length == previous - 1 and (end - 1) % columns:
+                cursor.write(ansi.ERASE_LEFT + self._get_meter())
+                return
+        self._paint()
+
+    def _grow(self, size: int):
+        """Makes room for `size` bytes of input, wiping the buffer it leaves behind.
+
+        The room doubles each time, so a paste of n characters is copied
+        O(log n) times.
+        """
 
-        self.answer = {self._name: input}
+        buffer = bytearray(max(size, 2 * len(self._buffer)))
+        buffer[:self._size] = memoryview(self._buffer)[:self._size]
+        wipe(self._buffer)
+        self._buffer = buffer
+
+    def _on_backspace(self):
+        """Deletes the last character.
+        """
+
+        if not self._size:
+            return
+
+        start = self._size - 1
+        # Steps back over the continuation bytes of a multi-byte character:
+        while start and self._buffer[start] & 0xC0 == 0x80:
+            start -= 1
+        if self._strength is not None:
+            self._strength.remove(self._buffer[start])
+        self._buffer[start:self._size] = bytes(self._size - start)
+        self._size = start
+        self._length -= 1
+        self._changed()
+
+    def _on_submit(self):
+        """Submits the password.
+        """
+
+        self._done = True
+
+    def _on_char(self, char: str):
+        """Adds a character to the password.
+        """
+
+        data = char.encode('utf-8')
+        end = self._size + len(data)
+        if end > len(self._buffer):
+            self._grow(end)
+        self._buffer[self._size:end] = data
+        self._size = end
+        self._length += len(char)
+        if self._strength is not None:
+            for byte in data:
+                # Counts each character by its first byte:
+                if byte & 0xC0 != 0x80:
+                    self._strength.add(byte)
+        self._changed()
+
+    def _changed(self):
+        """Forgets the result of the last lookup and looks up the new input.
+        """
+
+        self._version += 1
+        self._found = None
+        self._look_up()
 
     @classmethod
     def from_dict(cls, prompt: dict):
@@ -118,7 +401,8 @@ class Password(Cue):
         Parameters
         ----------
         prompt
-            A dict that contains a name key and a message key.
+            A dict that contains a name key and a message key, and may
+            contain a secret key, a strength key and a breached key.
 
         Returns
         -------
@@ -128,7 +412,20 @@ class Password(Cue):
 
         name = prompt['name']
         message = prompt['message']
-        return cls(name, message)
+        secret = prompt.get('secret', False)
+        strength = prompt.get('strength', False)
+        breached = prompt.get('breached')
+        return cls(name, message, secret, strength, breached, **cls.get_settings(prompt))
+
+
+def _contains(bloom: BloomFilter, candidate: bytearray) -> bool:
+    """Returns whether `candidate` is in `bloom`, wiping it afterwards.
+    """
+
+    try:
+        return candidate in bloom
+    finally:
+        wipe(candidate)
 
 
 def main():
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.preview
+============
+
+This module contains the Previewer class for computing previews of options
+in the background.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+class Previewer:
+    """Runs a preview callback on a background thread and keeps its results.
+
+    Previews are cached per option in a least recently used cache. Only one
+    preview is computed at a time: a callback can't be stopped once it has
+    started, so a request that comes in while one is running waits for it
+    and replaces any request that was waiting before. Moving quickly through
+    a list therefore only runs the callback for the option that was active
+    when the last preview finished and for the one that the user stops on.
+
+    Attributes
+    ----------
+    _callback : callable
+        Returns the preview of an option.
+    _cache_size : int
+        The largest number of previews to keep.
+    _cache : OrderedDict
+        Previews by option index, least recently used first.
+    _running : tuple or None
+        The index of the option whose preview is being computed and its
+        future.
+    _next : tuple or None
+        The index of the option whose preview is computed next and the
+        option.
+    _executor : ThreadPoolExecutor or None
+        The thread that runs the callback, started on the first request.
+    _lock : threading.Lock
+        Guards ``_cache``, ``_running`` and ``_next``.
+    """
+
+    __name__ = 'Previewer'
+    __module__ = 'cues'
+
+    def __init__(self, callback: Callable[[Any], str], cache_size: int = 128):
+        """
+
+        Parameters
+        ----------
+        callback
+            Takes an option and returns its preview as a str object.
+        cache_size : int, optional
+            The largest number of previews to keep. Default is 128.
+        """
+
+        if not callable(callback):
+            raise TypeError(f"'{type(callback)}' object is not callable")
+        if cache_size < 1:
+            raise ValueError(f'cache_size must be positive: {cache_size}')
+
+        self._callback = callback
+        self._cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._running = None
+        self._next = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get(self, index: int) -> Optional[str]:
+        """Returns the preview of an option if it has been computed.
+
+        Parameters
+        ----------
+        index
+            The index of the option.
+
+        Returns
+        -------
+        str or None
+        """
+
+        with self._lock:
+            preview = self._cache.get(index)
+            if preview is not None:
+                self._cache.move_to_end(index)
+            return preview
+
+    def is_pending(self, index: int) -> bool:
+        """Returns whether the preview of an option is being computed or is next.
+        """
+
+        with self._lock:
+            return self._is_pending(index)
+
+    def request(self, index: int, option):
+        """Computes the preview of an option unless it is known.
+
+        If another preview is being computed, this one is computed after it
+        instead of the one that was waiting, if any.
+
+        Parameters
+        ----------
+        index
+            The index of the option.
+        option
+            The option to pass to the callback.
+        """
+
+        with self._lock:
+            if index in self._cache or self._is_pending(index):
+                return
+            if self._running is not None:
+                self._next = index, option
+                return
+            future = self._start(index, option)
+
+        # Callbacks of futures that are already done run at once, and take the lock:
+        future.add_done_callback(partial(self._store, index))
+
+    def clear(self):
+        """Forgets every preview and the one that was waiting.
+        """
+
+        with self._lock:
+            running, self._running = self._running, None
+            self._next = None
+            self._cache.clear()
+
+        # A preview that has started is left to finish and is then dropped:
+        if running is not None:
+            running[1].cancel()
+
+    def close(self):
+        """Drops the preview that was waiting and stops the thread.
+        """
+
+        with self._lock:
+            running, self._running = self._running, None
+            self._next = None
+            executor, self._executor = self._executor, None
+
+        if running is not None:
+            running[1].cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _is_pending(self, index: int) -> bool:
+        """Returns whether the preview of an option is being computed or is next.
+
+        The lock must be held.
+        """
+
+        return ((self._running is not None and self._running[0] == index)
+                or (self._next is not None and self._next[0] == index))
+
+    def _start(self, index: int, option):
+        """Submits the preview of an option and returns its future.
+
+        The lock must be held.
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='cues-preview')
+        future = self._executor.submit(self._run, option)
+        self._running = index, future
+        return future
+
+    def _run(self, option) -> str:
+        """Returns the preview of an option, or the error that prevented it.
+        """
+
+        try:
+            return str(self._callback(option))
+        except Exception as error:  # pylint: disable=broad-except
+            return f'{type(error).__name__}: {error}'
+
+    def _store(self, index: int, future):
+        """Caches a finished preview and starts the one that was waiting.
+        """
+
+        with self._lock:
+            # Previews that were cleared while running are dropped:
+            if self._running is None or self._running[1] is not future:
+                return
+            self._running = None
+            if not future.cancelled():
+                self._cache[index] = future.result()
+                self._cache.move_to_end(index)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+            waiting, self._next = self._next, None
+            if waiting is None or waiting[0] in self._cache or self._executor is None:
+                return
+            index = waiting[0]
+            future = self._start(*waiting)
+
+        future.add_done_callback(partial(self._store, index))
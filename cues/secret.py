@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.secret
+===========
+
+This module contains the Secret class for handing over sensitive input,
+such as a password, in a buffer that can be wiped.
+"""
+
+
+def wipe(data: bytearray):
+    """Overwrites every byte of `data` with zeros in place.
+    """
+
+    data[:] = bytes(len(data))
+
+
+class Secret:
+    """A secret, such as a password, kept as UTF-8 in a mutable buffer.
+
+    Unlike a str object, which can't be changed and may be copied or kept
+    alive anywhere, the buffer of a Secret object is overwritten with zeros
+    by ``wipe``, when a ``with`` block that uses it ends, or when it is
+    garbage collected. Its repr doesn't show the secret.
+
+    Attributes
+    ----------
+    _data : bytearray
+        The secret encoded as UTF-8.
+    """
+
+    __name__ = 'Secret'
+    __module__ = 'cues'
+
+    def __init__(self, data: bytearray):
+        """
+
+        Parameters
+        ----------
+        data
+            The secret encoded as UTF-8. The Secret object takes it over,
+            so it is wiped along with the Secret object.
+        """
+
+        if not isinstance(data, bytearray):
+            raise TypeError(f"'{type(data)}' object is not a bytearray")
+
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return 'Secret(***)'
+
+    def __enter__(self) -> 'Secret':
+        return self
+
+    def __exit__(self, *args):
+        self.wipe()
+
+    def __del__(self):
+        # There is nothing to wipe if __init__ raised:
+        if hasattr(self, '_data'):
+            self.wipe()
+
+    @property
+    def buffer(self) -> memoryview:
+        """A view of the encoded secret that doesn't copy it.
+        """
+
+        return memoryview(self._data)
+
+    def reveal(self) -> str:
+        """Returns the secret as a str object.
+
+        The str object is a copy that can't be wiped, so ``buffer`` should
+        be preferred wherever bytes are accepted.
+        """
+
+        return str(self._data, 'utf-8')
+
+    def wipe(self):
+        """Overwrites the secret with zeros.
+        """
+
+        wipe(self._data)
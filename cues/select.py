@@ -7,13 +7,15 @@ cues.select
 A module that contains the Select class.
 """
 
-from typing import Deque, Iterable, List
+from collections.abc import Mapping
+from typing import Iterable, Optional, Sequence
 
-from . import constants, cursor, utils
-from .cue import Cue
+from . import constants, cursor, keys, utils
+from .groups import Group, GroupedRows, flatten
+from .menu import Menu
 
 
-class Select(Cue):
+class Select(Menu):
     """Construct a Select object to retrieve a single response from a user.
 
     A Select object will display a menu-like prompt to the user
@@ -21,17 +23,33 @@ class Select(Cue):
     Up and Down arrow keys to navigate the prompt and select an
     option by pressing Enter.
 
+    Options can be split into sections by passing a mapping from the name of
+    each section to its options. Each section starts with a header that the
+    user can collapse with Left and expand with Right, or toggle with Enter.
+    The rows of a collapsed section are left out of the list altogether, so
+    moving past it is a single step and the frame shrinks by its size.
+
+    Short options, such as region codes, can instead be laid out in as many
+    columns as fit in the console with ``multi_column``. The user moves
+    through them with the arrow keys, and each line of the frame holds a
+    whole row of options.
+
     Attributes
     ----------
+    _sections : list of Group or None
+        The headers of the sections, if the options are in sections.
+    _groups : GroupedRows or None
+        The rows of the headers and of the options of expanded sections.
+    _multi_column : bool
+        Whether options are laid out in columns.
+    _widest : int
+        The length of the longest option measured so far.
+    _measured : int
+        The number of options that have been measured.
     _num_options : int
-        The number of options
-    _markers : Deque of str
-        Contains an arrow marker and empty spaces to indicate to 
-        the user which option is currently selected.
+        The number of options read so far.
     _select_marker_len : int
         The length of the arrow marker being used.
-    _init_fmt : str
-        The format for the initial statement.
     _list_fmt : str
         The format for list items.
     _list_fmt_if_active : str
@@ -41,7 +59,20 @@ class Select(Cue):
     __name__ = 'Select'
     __module__ = 'cues'
 
-    def __init__(self, name: str, message: str, options: Iterable[str]):
+    SETTINGS = Menu.SETTINGS + ('multi_column',)
+
+    keymap = {
+        **Menu.keymap,
+        keys.RIGHT: 'expand',
+        keys.LEFT: 'collapse',
+    }
+
+    # The markers before the headers of expanded and collapsed sections:
+    COLLAPSED = '▸'
+    EXPANDED = '▾'
+
+    def __init__(self, name: str, message: str, options: Iterable[str],
+                 multi_column: bool = False, **kwargs):
         """
 
         Parameters
@@ -51,57 +82,59 @@ class Select(Cue):
         message
             Instructions or useful information regarding the prompt for the user.
         options
-            Available options for the user to pick from.
+            Available options for the user to pick from, or a mapping from
+            the name of each section to its options.
+        multi_column : bool, optional
+            Whether to lay out the options in as many columns as fit in the
+            console, based on the longest one. Default is False.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``,
+            ``max_rows`` to limit the number of options shown at once and
+            ``wrap`` to stop at either end of the list.
         """
 
-        super().__init__(name, message)
+        sections = None
+        if isinstance(options, Mapping):
+            if kwargs.get('fuzzy') or kwargs.get('frecency'):
+                raise ValueError("options in sections can't be reordered by fuzzy or frecency")
+            if multi_column:
+                raise ValueError("options in sections can't be laid out in columns")
+            options, sections = flatten(options)
 
-        if hasattr(options, '__iter__'):
-            self._options = list(options)
-            self._num_options = len(self._options)
-        else:
-            raise TypeError(f"'{type(options)}' object is not iterable")
+        super().__init__(name, message, options, **kwargs)
 
-        # Create the deque that will contain the arrow markers and
-        # allocate an appropriate number of arrow marker spaces depending
-        # on the number of options:
-        self._markers = self.create_deque(
-            [constants.SELECT_MARKER], length=self._num_options)
+        self._sections = sections
+        self._groups = GroupedRows(sections) if sections is not None else None
+        self._rows = self._get_all_rows()
+        self._multi_column = multi_column
+        self._widest = 0
+        self._measured = 0
 
         self._select_marker_len = len(constants.SELECT_MARKER)
 
-        for _ in range(self._num_options - 1):
-            self._markers.append(' ' * self._select_marker_len)
-
-        self._init_fmt = '[pink][?][/pink] {message}\n'
         self._list_fmt = '[skyblue]{marker}[/skyblue] {option}'
         self._list_fmt_if_active = '[skyblue]{marker}[/skyblue] [underline skyblue]{option}[/underline skyblue]'
+        self._group_fmt = '[skyblue]{marker}[/skyblue] [bold skyblue]{option}[/bold skyblue] [darkgrey]({size})[/darkgrey]'
+        self._group_fmt_if_active = (
+            '[skyblue]{marker}[/skyblue] [underline skyblue]{option}[/underline skyblue] '
+            '[darkgrey]({size})[/darkgrey]')
 
     @property
-    def options(self) -> List[str]:
+    def options(self) -> Sequence:
+        """The options as they were given, or the source that reads them.
+
+        Options are not copied into a list: this is the sequence that was
+        passed, or the LazySource, StreamSource or FileSource object that
+        reads options from an iterator, a stream or a file. Indexing such a
+        source reads as far as the index, and ``len`` counts only the options
+        that have been read or streamed in so far.
+        """
+
         return self._options
 
     @property
-    def markers(self) -> Deque[str]:
-        return self._markers
-
-    @markers.setter
-    def markers(self, pos: int):
-        # If the keystroke was the up arrow:
-        if pos:
-            # If the LIST_MARKER is the first element in the deque:
-            if not self._markers.index(constants.LIST_MARKER):
-                self._markers.append(constants.LIST_MARKER)
-            else:
-                self._markers.append(' ' * self._select_marker_len)
-
-        # Otherwise, if the keystroke was the down arrow:
-        else:
-            # If the LIST_MARKER is the last element in the deque:
-            if self._markers.index(constants.LIST_MARKER) == self._num_options - 1:
-                self._markers.appendleft(constants.LIST_MARKER)
-            else:
-                self._markers.appendleft(' ' * self._select_marker_len)
+    def _num_options(self) -> int:
+        return len(self._options)
 
     def send(self) -> dict:
         """Returns a dict object containing user's response to the prompt.
@@ -115,43 +148,180 @@ class Select(Cue):
         try:
             cursor.hide()
 
-            self._draw()
+            self._ask()
             return self.answer
         finally:
             cursor.show()
 
-    def _draw(self):
-        """Prints the prompt to console and sets user's response.
+    def _get_row_state(self, index: int, active: bool):
+        group = self._get_group(index)
+        if group is not None:
+            return active, group.collapsed
+        return active
+
+    def _render_row(self, index: int, active: bool) -> str:
+        """Returns the markup for the option or section header at `index`.
         """
 
-        cursor.write(self._init_fmt.format(message=self._message), color=True)
+        marker = constants.LIST_MARKER if active else ' ' * self._select_marker_len
+        group = self._get_group(index)
+        if group is not None:
+            fmt = self._group_fmt_if_active if active else self._group_fmt
+            branch = self.COLLAPSED if group.collapsed else self.EXPANDED
+            option = branch + ' ' + self._truncate(group.name, self._select_marker_len + 3)
+            return fmt.format(marker=marker, option=option, size=group.size)
+
+        fmt = self._list_fmt_if_active if active else self._list_fmt
+        indent = '  ' if self._groups is not None else ''
+        option = indent + self._truncate(
+            str(self._options[index]), self._select_marker_len + 1 + len(indent))
+        return fmt.format(marker=marker, option=option)
+
+    def _get_columns(self) -> int:
+        """Returns the number of columns of options that fit in the console.
+        """
 
-        up = self.keys.get('up')
-        down = self.keys.get('down')
-        enter = self.keys.get('enter')
+        if not self._multi_column:
+            return 1
 
-        while True:
-            for marker, option in zip(self.markers, self.options):
-                fmt = (self._list_fmt if marker !=
-                       constants.LIST_MARKER else self._list_fmt_if_active)
+        gap = len(self.COLUMN_GAP)
+        width = self._select_marker_len + 1 + self._get_widest()
+        # Leaves the last column of the console empty so that lines don't wrap:
+        return max((self.max_columns - 1 + gap) // (width + gap), 1)
 
-                cursor.write(fmt.format(
-                    marker=marker, option=option), color=True, newlines=1)
+    def _get_widest(self) -> int:
+        """Returns the length of the longest option read so far.
 
-            key = self.listen_for_key()
+        Only the options that were read since the last call are measured.
+        """
+
+        options = self._options
+        total = len(options)
+        if self._measured < total:
+            widest = max(len(str(options[i])) for i in range(self._measured, total))
+            self._measured = total
+            if widest > self._widest:
+                self._widest = widest
+                # The rows were padded to the previous width:
+                self._row_cache.clear()
+        return self._widest
+
+    def _truncate(self, text: str, padding: int) -> str:
+        """Shortens or pads text to the width of a column when there are several.
+        """
+
+        if self._get_columns() == 1:
+            return super()._truncate(text, padding)
+
+        width = self._widest
+        if len(text) > width:
+            return text[:max(width - 1, 0)] + '…'
+        return text.ljust(width)
+
+    def _get_group(self, index: Optional[int]) -> Optional[Group]:
+        """Returns the section whose header is at `index`, if it is one.
+        """
+
+        if self._groups is None or index is None:
+            return None
+        option = self._options[index]
+        return option if isinstance(option, Group) else None
+
+    def _get_all_rows(self):
+        """Returns the indices of the headers and of the options of expanded sections.
+        """
+
+        if self._groups is None:
+            return super()._get_all_rows()
+        return self._groups
 
-            if key == up:
-                self.markers = 1
-            elif key == down:
-                self.markers = 0
-            elif key == enter:
-                cursor.clear(self._num_options)
-                break
+    def _match(self, query: str):
+        """Returns the indices of the options that contain `query` and of their headers.
+        """
 
-            cursor.move(y=self._num_options)
+        matches = super()._match(query)
+        if not query or self._groups is None or matches is None:
+            return matches
+        return self._groups.add_headers(matches)
+
+    def _find_prefix(self, prefix: str, cycle: bool) -> Optional[int]:
+        """Returns the index of the option to jump to, expanding its section.
+        """
+
+        index = super()._find_prefix(prefix, cycle)
+        if self._groups is not None and index is not None and index not in self._rows:
+            self._set_collapsed(self._groups.get_group(index), False)
+        return index
+
+    def _on_expand(self):
+        """Expands the active section or else moves to its first option.
+
+        With several columns, moves to the next option instead.
+        """
+
+        if self._get_columns() > 1:
+            self._move(1)
+            return
+
+        group = self._get_group(self._get_active())
+        if group is None:
+            return
+        if group.collapsed:
+            self._set_collapsed(group, False)
+        elif group.size:
+            self._move(1)
+
+    def _on_collapse(self):
+        """Collapses the section of the active option, which moves to its header.
+
+        With several columns, moves to the previous option instead.
+        """
+
+        if self._get_columns() > 1:
+            self._move(-1)
+            return
+
+        active = self._get_active()
+        if self._groups is None or active is None:
+            return
+        self._set_collapsed(self._groups.get_group(active), True)
+
+    def _set_collapsed(self, group: Group, collapsed: bool):
+        """Collapses or expands a section and makes its header active.
+
+        Only the positions of the headers are computed again; the options of
+        the section are neither rendered nor searched while it is collapsed.
+        """
+
+        if group.collapsed != collapsed:
+            group.collapsed = collapsed
+            self._groups = GroupedRows(self._sections)
+            # The matches were found among the rows that were shown:
+            self._matches = {}
+            if self._query:
+                self._filter(self._query)
+            else:
+                self._rows = self._get_all_rows()
+        self._index = self._locate(self._rows, group.start)
+
+    def _on_submit(self):
+        """Collapses or expands the active section, or submits the active option.
+        """
+
+        group = self._get_group(self._get_active())
+        if group is not None and self._goto is None:
+            self._set_collapsed(group, not group.collapsed)
+            return
+        super()._on_submit()
+
+    def _get_answer(self) -> str:
+        return self.options[self._get_active()]
+
+    def _can_submit(self) -> bool:
+        """Returns whether an option matches the query.
+        """
 
-        list_marker_pos = self._markers.index(constants.LIST_MARKER)
-        self.answer = {self._name: self.options[list_marker_pos]}
+        return bool(self._rows)
 
     @classmethod
     def from_dict(cls, prompt: dict):
@@ -172,7 +342,7 @@ class Select(Cue):
         name = prompt['name']
         message = prompt['message']
         options = prompt['options']
-        return cls(name, message, options)
+        return cls(name, message, options, **cls.get_settings(prompt))
 
 
 def main(test=0):
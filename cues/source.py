@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.source
+===========
+
+This module contains the classes that supply options to list cues without
+reading all of them up front.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Iterable, Iterator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The number of bytes scanned for line breaks at a time:
+SCAN_SIZE = 1 << 20
+
+# The header of a saved line index: a tag, the size and modification time of
+# the file, the type code of the offsets and the number of offsets:
+_INDEX_HEADER = struct.Struct('<8sQQ8sQ')
+_INDEX_TAG = b'cuesidx1'
+
+
+class LazySource:
+    """A sequence of options that are read from an iterator as they are needed.
+
+    Only the options that have been asked for are kept, so a generator over a
+    huge result can be shown before it has been fully consumed. ``len``
+    returns the number of options read so far.
+
+    Attributes
+    ----------
+    _iterator : Iterator
+        The options that haven't been read yet.
+    _items : list
+        The options that have been read.
+    _exhausted : bool
+        Whether every option has been read.
+    """
+
+    __name__ = 'LazySource'
+    __module__ = 'cues'
+
+    def __init__(self, options: Iterable):
+        """
+
+        Parameters
+        ----------
+        options
+            Any iterable, such as a generator.
+        """
+
+        self._iterator = iter(options)
+        self._items = []
+        self._exhausted = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            self.load()
+        else:
+            self.load(index + 1)
+        return self._items[index]
+
+    def __iter__(self) -> Iterator:
+        index = 0
+        while True:
+            self.load(index + 1)
+            if index >= len(self._items):
+                return
+            yield self._items[index]
+            index += 1
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    def load(self, count: int = None):
+        """Reads options until `count` of them have been read.
+
+        Parameters
+        ----------
+        count : int, optional
+            The number of options to have read. Reads every option by default.
+        """
+
+        if self._exhausted:
+            return
+
+        items = self._items
+        while count is None or len(items) < count:
+            try:
+                items.append(next(self._iterator))
+            except StopIteration:
+                self._exhausted = True
+                return
+
+
+class FileSource:
+    """A sequence of the lines of a file that are read as they are needed.
+
+    The file is memory-mapped and indexed by an array of the offsets at
+    which its lines start. The index is built as far as the lines that
+    are asked for, so the first lines of a large file can be shown at once,
+    and only the lines that are asked for are decoded. Once the whole file
+    has been indexed, the index can be saved next to the file and is then
+    memory-mapped on later runs instead of being built again.
+
+    Attributes
+    ----------
+    path : str
+        The path of the file.
+    encoding : str
+        The encoding of the file.
+    index_path : str or None
+        The path where the index is saved, if it is saved.
+    _file : file object or None
+        The open file.
+    _map : mmap.mmap or None
+        The contents of the file, or None if the file is empty.
+    _size : int
+        The size of the file in bytes.
+    _offsets : array or memoryview
+        The offset at which each indexed line starts.
+    _scanned : int
+        The number of bytes that have been indexed.
+    _index_map : mmap.mmap or None
+        The saved index, if it was loaded.
+    """
+
+    __name__ = 'FileSource'
+    __module__ = 'cues'
+
+    def __init__(self, path, encoding: str = 'utf-8', save_index: bool = False):
+        """
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The path of a file with one option per line.
+        encoding : str, optional
+            The encoding of the file. Default is UTF-8.
+        save_index : bool, optional
+            Whether to save the index of the lines to ``<path>.idx`` once it
+            is complete, and load it from there on later runs. Default is False.
+        """
+
+        self.path = os.fspath(path)
+        self.encoding = encoding
+        self.index_path = self.path + '.idx' if save_index else None
+        self._file = None
+        self.open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            self.load()
+            index += len(self._offsets)
+        else:
+            self.load(index + 2)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError('line index out of range')
+
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._size
+        line = self._map[start:end]
+        return line.decode(self.encoding, errors='replace').rstrip('\r\n')
+
+    def __iter__(self) -> Iterator[str]:
+        index = 0
+        while True:
+            self.load(index + 1)
+            if index >= len(self._offsets):
+                return
+            yield self[index]
+            index += 1
+
+    @property
+    def exhausted(self) -> bool:
+        return self._scanned >= self._size
+
+    def load(self, count: int = None):
+        """Indexes lines until `count` of them have been indexed.
+
+        Parameters
+        ----------
+        count : int, optional
+            The number of lines to have indexed. Indexes the whole file by default.
+        """
+
+        offsets = self._offsets
+        while not self.exhausted and (count is None or len(offsets) < count):
+            start = self._scanned
+            stop = min(start + SCAN_SIZE, self._size)
+            self._scan(start, stop)
+            self._scanned = stop
+
+        if self.exhausted and self.index_path is not None and self._index_map is None:
+            self._save_index()
+
+    def close(self):
+        """Closes the file and the saved index.
+        """
+
+        # Drops the views into the maps before closing them:
+        self._offsets = array(self._offsets.format if isinstance(
+            self._offsets, memoryview) else self._offsets.typecode)
+        for handle in (self._index_map, self._map, self._file):
+            if handle is not None:
+                handle.close()
+        self._index_map = self._map = self._file = None
+
+    def open(self):
+        """Opens the file, or opens it again after ``close``.
+
+        A file that is already open is left as it is.
+        """
+
+        if self._file is not None:
+            return
+
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+        # Empty files can't be memory-mapped:
+        self._map = mmap.mmap(
+            self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+
+        # Four-byte offsets are enough for files under 4 GiB:
+        typecode = 'I' if self._size < 1 << 32 and array('I').itemsize == 4 else 'Q'
+        self._offsets = array(typecode, [0] if self._size else [])
+        self._scanned = 0
+        self._index_map = None
+
+        if self.index_path is not None:
+            self._load_index()
+
+    def _scan(self, start: int, stop: int):
+        """Adds the offsets of the lines that start in (start, stop] to the index.
+        """
+
+        size = self._size
+        if numpy is not None:
+            chunk = numpy.frombuffer(self._map, dtype=numpy.uint8,
+                                     count=stop - start, offset=start)
+            found = numpy.flatnonzero(chunk == ord('\n')) + (start + 1)
+            # A line break at the end of the file doesn't start another line:
+            if len(found) and found[-1] == size:
+                found = found[:-1]
+            dtype = numpy.uint32 if self._offsets.itemsize == 4 else numpy.uint64
+            self._offsets.frombytes(found.astype(dtype).tobytes())
+            return
+
+        offsets = self._offsets
+        data = self._map
+        position = data.find(b'\n', start, stop)
+        while position != -1:
+            if position + 1 < size:
+                offsets.append(position + 1)
+            position = data.find(b'\n', position + 1, stop)
+
+    def _load_index(self):
+        """Uses the saved index if it matches the file.
+        """
+
+        try:
+            with open(self.index_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < _INDEX_HEADER.size:
+                    return
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+
+        tag, size, mtime, typecode, count = _INDEX_HEADER.unpack_from(index_map)
+        typecode = typecode.rstrip(b'\0').decode('ascii', errors='replace')
+        itemsize = array(typecode).itemsize if typecode in ('I', 'Q') else 0
+        valid = (
+            tag == _INDEX_TAG and size == self._size and mtime == self._mtime
+            and itemsize and len(index_map) == _INDEX_HEADER.size + count * itemsize
+        )
+        if not valid:
+            index_map.close()
+            return
+
+        self._index_map = index_map
+        self._offsets = memoryview(index_map)[_INDEX_HEADER.size:].cast(typecode)
+        self._scanned = self._size
+
+    def _save_index(self):
+        """Saves the complete index next to the file.
+        """
+
+        offsets = self._offsets
+        header = _INDEX_HEADER.pack(
+            _INDEX_TAG, self._size, self._mtime,
+            offsets.typecode.encode('ascii'), len(offsets))
+
+        temp = self.index_path + '.tmp'
+        try:
+            with open(temp, 'wb') as f:
+                f.write(header)
+                offsets.tofile(f)
+            os.replace(temp, self.index_path)
+        except OSError:
+            # The index is only an optimization, so a read-only directory is fine:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+
+
+def create_source(options):
+    """Returns `options` in a form that can be indexed without copying it.
+
+    Sequences, and any other object with ``__len__`` and ``__getitem__``
+    apart from mappings, are used as they are. Paths (os.PathLike objects
+    such as pathlib.Path objects) are opened as a FileSource object, which
+    the caller must close, and other iterables are wrapped in a LazySource
+    object. A str object is a sequence of options like any other, not a
+    path.
+
+    Parameters
+    ----------
+    options
+        The options to show.
+
+    Returns
+    -------
+    Sequence or LazySource
+
+    Raises
+    ------
+    TypeError
+        If `options` isn't iterable.
+    """
+
+    if isinstance(options, (Sequence, LazySource, StreamSource, FileSource)):
+        return options
+    if isinstance(options, os.PathLike):
+        return FileSource(options)
+    if (hasattr(options, '__len__') and hasattr(options, '__getitem__')
+            and not isinstance(options, Mapping)):
+        return options
+    if hasattr(options, '__iter__'):
+        return LazySource(options)
+    raise TypeError(f"'{type(options)}' object is not iterable")
+
+
+class StreamSource:
+    """A sequence of options that are read from an iterator in the background.
+
+    A daemon thread reads the options into a buffer as they are produced, so
+    a list cue can be shown straight away and options appear while it is
+    open. This suits slow producers such as the lines of a subprocess's
+    output or a directory walk. ``len`` returns the number of options
+    received so far.
+
+    Attributes
+    ----------
+    _items : list
+        The options that have been received.
+    _lock : threading.Lock
+        Guards ``_items`` while the thread adds to it.
+    _exhausted : bool
+        Whether the iterator has been fully read.
+    _error : Exception or None
+        The exception raised by the iterator, if any.
+    _thread : threading.Thread
+        The thread that reads the iterator.
+    """
+
+    __name__ = 'StreamSource'
+    __module__ = 'cues'
+
+    def __init__(self, options: Iterable):
+        """
+
+        Parameters
+        ----------
+        options
+            Any iterable, such as a generator or the stdout of a subprocess.
+        """
+
+        self._items = []
+        self._lock = threading.Lock()
+        self._exhausted = False
+        self._error = None
+
+        self._thread = threading.Thread(
+            target=self._feed, args=(iter(options),), daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int):
+        with self._lock:
+            return self._items[index]
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            return iter(self._items[:])
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    @property
+    def error(self):
+        return self._error
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits for every option to be received.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds to wait. Waits forever by default.
+
+        Returns
+        -------
+        bool
+            Whether every option has been received.
+        """
+
+        self._thread.join(timeout)
+        return self._exhausted
+
+    def _feed(self, iterator: Iterator):
+        """Reads the iterator into ``_items`` on the background thread.
+        """
+
+        try:
+            for item in iterator:
+                with self._lock:
+                    self._items.append(item)
+        except Exception as error:  # pylint: disable=broad-except
+            # Keeps the options that arrived before the producer failed:
+            self._error = error
+        finally:
+            self._exhausted = True
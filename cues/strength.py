@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.strength
+=============
+
+This module contains the Strength class for estimating how hard a password
+is to guess as it is typed, and the BloomFilter class for checking it
+against a list of breached passwords that is kept in a file.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import string
+import struct
+from typing import Iterable, Optional, Union
+
+# The classes of characters that a password can draw from, and their sizes:
+_LOWER, _UPPER, _DIGIT, _SYMBOL, _OTHER = range(5)
+_POOLS = (26, 26, 10, 33, 100)
+
+# The class of each byte of UTF-8; the bytes of multi-byte characters are all "other":
+_CLASSES = bytes(
+    _LOWER if chr(byte) in string.ascii_lowercase
+    else _UPPER if chr(byte) in string.ascii_uppercase
+    else _DIGIT if chr(byte) in string.digits
+    else _SYMBOL if byte < 0x80
+    else _OTHER
+    for byte in range(256)
+)
+
+
+class Strength:
+    """Estimates the entropy of a password one character at a time.
+
+    The estimate is the number of characters times the base-2 logarithm of
+    the number of characters in the classes that have been used (lowercase
+    letters, uppercase letters, digits, symbols and everything else). The
+    number of characters in each class is kept up to date, so adding or
+    removing a character takes the same time however long the password is.
+
+    Attributes
+    ----------
+    _counts : list of int
+        The number of characters in each class.
+    _length : int
+        The number of characters.
+    _pool : int
+        The number of characters in the classes that have been used.
+    """
+
+    __name__ = 'Strength'
+    __module__ = 'cues'
+
+    # The labels of the estimates, by the number of bits they are below:
+    LABELS = (
+        (28, 'very weak'),
+        (36, 'weak'),
+        (60, 'fair'),
+        (128, 'strong'),
+        (math.inf, 'very strong'),
+    )
+
+    def __init__(self):
+        self._counts = [0] * len(_POOLS)
+        self._length = 0
+        self._pool = 0
+
+    @property
+    def bits(self) -> float:
+        """The estimated entropy in bits.
+        """
+
+        if not self._length:
+            return 0.0
+        return self._length * math.log2(self._pool)
+
+    @property
+    def label(self) -> str:
+        """A word or two that describes the estimate.
+        """
+
+        bits = self.bits
+        for limit, label in self.LABELS:
+            if bits < limit:
+                return label
+
+    def add(self, byte: int):
+        """Counts a character by the first byte of its UTF-8 encoding.
+        """
+
+        kind = _CLASSES[byte]
+        if not self._counts[kind]:
+            self._pool += _POOLS[kind]
+        self._counts[kind] += 1
+        self._length += 1
+
+    def remove(self, byte: int):
+        """Stops counting a character by the first byte of its UTF-8 encoding.
+        """
+
+        kind = _CLASSES[byte]
+        self._counts[kind] -= 1
+        if not self._counts[kind]:
+            self._pool -= _POOLS[kind]
+        self._length -= 1
+
+    def clear(self):
+        """Stops counting every character.
+        """
+
+        self._counts = [0] * len(_POOLS)
+        self._length = 0
+        self._pool = 0
+
+
+class BloomFilter:
+    """A set of passwords in a memory-mapped file that may give false positives.
+
+    Each password sets ``hashes`` of the file's bits, so checking one reads
+    that many bytes of the file whatever the number of passwords, and only
+    the pages that are read are loaded. A password that was added is always
+    found, and one that wasn't is found with a probability of about the
+    ``error_rate`` the file was created with.
+
+    Files are created with ``create`` from a list of breached passwords.
+    A list of 500 million passwords takes about 900 MB at an error rate of
+    one in a thousand.
+
+    Attributes
+    ----------
+    path : str
+        The path of the file.
+    size : int
+        The number of bits.
+    hashes : int
+        The number of bits that each password sets.
+    _file : file object
+        The file, opened for reading.
+    _map : mmap.mmap
+        The bits, after the header.
+    """
+
+    __name__ = 'BloomFilter'
+    __module__ = 'cues'
+
+    # The start of the file, followed by the number of bits and of hashes:
+    MAGIC = b'CUESBLM1'
+    _HEADER = struct.Struct('<8sQI4x')
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """
+
+        Parameters
+        ----------
+        path
+            The path of a file made by ``create``.
+
+        Raises
+        ------
+        ValueError
+            If the file isn't a Bloom filter.
+        """
+
+        self.path = os.fspath(path)
+        self._file = open(self.path, 'rb')
+        try:
+            header = self._file.read(self._HEADER.size)
+            if len(header) < self._HEADER.size:
+                raise ValueError(f'{self.path} is not a Bloom filter')
+            magic, self.size, self.hashes = self._HEADER.unpack(header)
+            length = self._HEADER.size + (self.size + 7) // 8
+            if magic != self.MAGIC or not self.size or os.fstat(self._file.fileno()).st_size < length:
+                raise ValueError(f'{self.path} is not a Bloom filter')
+            self._map = mmap.mmap(self._file.fileno(), length, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __contains__(self, password) -> bool:
+        bits = self._map
+        offset = self._HEADER.size
+        for index in _get_indices(password, self.size, self.hashes):
+            if not bits[offset + (index >> 3)] >> (index & 7) & 1:
+                return False
+        return True
+
+    def __enter__(self) -> 'BloomFilter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the file.
+        """
+
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def create(cls, path: Union[str, os.PathLike], passwords: Iterable,
+               count: Optional[int] = None, error_rate: float = 0.001) -> 'BloomFilter':
+        """Writes a file with every password in `passwords` and opens it.
+
+        Parameters
+        ----------
+        path
+            The path of the file to write.
+        passwords
+            The passwords, as str objects or as UTF-8 bytes.
+        count : int, optional
+            The number of passwords, if `passwords` has no length.
+        error_rate : float, optional
+            The chance of finding a password that wasn't added. Default is
+            one in a thousand.
+
+        Returns
+        -------
+        cues.BloomFilter
+        """
+
+        if not 0 < error_rate < 1:
+            raise ValueError(f'error_rate must be between 0 and 1: {error_rate}')
+        if count is None:
+            if not hasattr(passwords, '__len__'):
+                raise TypeError(f"'{type(passwords)}' object has no len(), so count must be given")
+            count = len(passwords)
+
+        # The sizes that give the lowest error rate for `count` passwords:
+        size = max(math.ceil(-max(count, 1) * math.log(error_rate) / math.log(2) ** 2), 8)
+        hashes = max(round(size / max(count, 1) * math.log(2)), 1)
+        length = cls._HEADER.size + (size + 7) // 8
+
+        with open(path, 'wb+') as file:
+            file.write(cls._HEADER.pack(cls.MAGIC, size, hashes))
+            file.truncate(length)
+            with mmap.mmap(file.fileno(), length) as bits:
+                offset = cls._HEADER.size
+                for password in passwords:
+                    for index in _get_indices(password, size, hashes):
+                        bits[offset + (index >> 3)] |= 1 << (index & 7)
+        return cls(path)
+
+
+def _get_indices(password, size: int, hashes: int) -> Iterable[int]:
+    """Yields the bits that `password` sets in a filter of `size` bits.
+
+    The bits are derived from two halves of one hash of the password.
+    """
+
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    digest = hashlib.blake2b(password, digest_size=16).digest()
+    first, second = struct.unpack('<QQ', digest)
+    # An odd step visits different bits for every hash when the size is a power of two:
+    second |= 1
+    for i in range(hashes):
+        yield (first + i * second) % size
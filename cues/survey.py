@@ -10,7 +10,7 @@ A module that contains the Survey class.
 import copy
 from typing import Iterable
 
-from . import constants, cursor, utils
+from . import constants, cursor, keys, utils
 from .cue import Cue
 
 
@@ -48,13 +48,31 @@ class Survey(Cue):
         The format for the number of points in the scale.
     _scale_fmt : str
         The format for the values of the scale.
+    _initial_pts : Deque of str
+        The points of the scale with the center point filled.
+    _pts : Deque of str
+        The points of the scale for the current field.
+    _point : int
+        The position of the filled point, starting at 1.
+    _field : int
+        The index of the current field.
+    _responses : dict
+        The responses recorded so far.
+    _done : bool
+        Whether the user has answered every field.
     """
 
     __name__ = 'Survey'
     __module__ = 'cues'
 
+    keymap = {
+        keys.RIGHT: 'right',
+        keys.LEFT: 'left',
+        keys.ENTER: 'submit',
+    }
+
     def __init__(self, name: str, message: str, scale: Iterable,
-                 fields: Iterable[dict], legend: Iterable = []):
+                 fields: Iterable[dict], legend: Iterable = [], **kwargs):
         """
 
         Parameters
@@ -69,9 +87,11 @@ class Survey(Cue):
             Contains questions/information for the user to respond to.
         legend : iterable, optional
             Defines the values of the scale.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``.
         """
 
-        super().__init__(name, message)
+        super().__init__(name, message, **kwargs)
 
         if hasattr(scale, '__iter__'):
             self._scale = list(scale)
@@ -124,6 +144,13 @@ class Survey(Cue):
 
         self._scale_fmt = '{:<{length}}'  # Bottom
 
+        self._initial_pts = None
+        self._pts = None
+        self._point = utils.get_half(len(self._scale))
+        self._field = 0
+        self._responses = {}
+        self._done = False
+
     def send(self):
         """Returns a dict object containing user's response to the prompt.
 
@@ -136,7 +163,7 @@ class Survey(Cue):
         try:
             cursor.hide()
 
-            self._draw()
+            self._ask()
             return self.answer
         finally:
             cursor.show()
@@ -174,7 +201,6 @@ class Survey(Cue):
         pts = [constants.SURVEY_PT for _ in range(scale_len)]
         pts[center_pt - 1] = constants.SURVEY_PT_FILL
         deque_pts = self.create_deque(pts)
-        current_deque_pts = copy.copy(deque_pts)
 
         min_space_btwn_lines = 5
         max_line_len = max(
@@ -202,17 +228,16 @@ class Survey(Cue):
 
         cursor.move(y=current_field)
 
-        right = self.keys.get('right')
-        left = self.keys.get('left')
-        enter = self.keys.get('enter')
-
-        horziontal_num = center_pt
-        current_val = 0
-
-        responses = {}
+        self._initial_pts = deque_pts
+        self._pts = copy.copy(deque_pts)
+        self._point = center_pt
+        self._field = 0
+        self._responses = {}
+        self._done = False
 
         # Actual drawing:
         while True:
+            current_val = self._field
             cursor.write(self._msg_fmt.format(
                 count=current_val + 1, msg=messages[current_val]))
 
@@ -221,12 +246,12 @@ class Survey(Cue):
                             utils.get_num_digits(current_val + 1))
 
             cursor.write(
-                margin + self._pt_fmt.format(*current_deque_pts, line=line), color=True)
+                margin + self._pt_fmt.format(*self._pts, line=line), color=True)
 
             scale_str = ''
             for c, val in enumerate(current_deque_scale, 1):
                 temp_line_len = 0
-                if c == horziontal_num:
+                if c == self._point:
                     val = '[underline lightslateblue]' + \
                         val + '[/underline lightslateblue]'
                     temp_line_len = max_line_len + len(val)
@@ -237,50 +262,58 @@ class Survey(Cue):
 
             cursor.move(y=-(current_field - 4))
 
-            key = self.listen_for_key()
+            action = self._dispatch(self.listen_for_key())
 
-            if key == right:
-                # If cursor is at very right:
-                if current_deque_pts[-1] == constants.SURVEY_PT_FILL:
-                    pass
+            # If at the end of the survey, then quit:
+            if self._done:
+                if self._header_fmt:
+                    cursor.clear(max_fields + 4)
                 else:
-                    current_deque_pts.appendleft(constants.SURVEY_PT)
-                    horziontal_num += 1
+                    cursor.clear(
+                        max_fields + (len(self._legend) + 2 if self._legend else 0))
 
-            elif key == left:
-                # If cursor is at very left:
-                if current_deque_pts[0] == constants.SURVEY_PT_FILL:
-                    pass
-                else:
-                    current_deque_pts.append(constants.SURVEY_PT)
-                    horziontal_num -= 1
-
-            elif key == enter:
-                # Add current scale value to dict
-                responses.update({
-                    self._fields[current_val]['name']: self._scale[horziontal_num - 1]})
-                current_val += 1
-
-                # If at the end of the survey, then quit:
-                if current_val == scale_len - 1:
-                    if self._header_fmt:
-                        cursor.clear(max_fields + 4)
-                    else:
-                        cursor.clear(
-                            max_fields + (len(self._legend) + 2 if self._legend else 0))
-
-                    break
-                else:
-                    current_field -= 4
-                    # Resets values:
-                    current_deque_pts = copy.copy(deque_pts)
-                    current_deque_scale = copy.copy(deque_scale)
-                    horziontal_num = center_pt
+                break
+            elif action == 'submit':
+                current_field -= 4
 
             # Resets cursor at top:
             cursor.move(y=current_field)
 
-        self.answer = {self._name: responses}
+        self.answer = {self._name: self._responses}
+
+    def _on_right(self):
+        """Moves the filled point one step to the right.
+        """
+
+        # If cursor is at very right:
+        if self._pts[-1] != constants.SURVEY_PT_FILL:
+            self._pts.appendleft(constants.SURVEY_PT)
+            self._point += 1
+
+    def _on_left(self):
+        """Moves the filled point one step to the left.
+        """
+
+        # If cursor is at very left:
+        if self._pts[0] != constants.SURVEY_PT_FILL:
+            self._pts.append(constants.SURVEY_PT)
+            self._point -= 1
+
+    def _on_submit(self):
+        """Records the current field's response and moves to the next field.
+        """
+
+        # Add current scale value to dict
+        self._responses.update({
+            self._fields[self._field]['name']: self._scale[self._point - 1]})
+        self._field += 1
+
+        if self._field == len(self._scale) - 1:
+            self._done = True
+        else:
+            # Resets values:
+            self._pts = copy.copy(self._initial_pts)
+            self._point = utils.get_half(len(self._scale))
 
     @classmethod
     def from_dict(cls, prompt: dict):
@@ -303,7 +336,7 @@ class Survey(Cue):
         scale = prompt['scale']
         fields = prompt['fields']
         legend = prompt.get('legend', [])
-        return cls(name, message, scale, fields, legend)
+        return cls(name, message, scale, fields, legend, **cls.get_settings(prompt))
 
 
 def main(test=0):
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+"""
+cues.tree
+=========
+
+This module contains the TreeSelect class.
+"""
+
+from typing import Callable, Iterable, Iterator, List
+
+from . import constants
+from .select import Select
+
+
+class TreeNode:
+    """A node of a TreeSelect object's tree.
+
+    Attributes
+    ----------
+    value
+        The option that the node shows.
+    depth : int
+        The number of ancestors of the node.
+    parent : TreeNode or None
+        The node that the node is a child of.
+    children : list of TreeNode or None
+        The children of the node, or None if they haven't been fetched.
+    expanded : bool
+        Whether the children of the node are shown.
+    size : int
+        The number of descendants of the node that are shown.
+    """
+
+    __name__ = 'TreeNode'
+    __module__ = 'cues'
+
+    __slots__ = ('value', 'depth', 'parent', 'children', 'expanded', 'size')
+
+    def __init__(self, value, depth: int = 0, parent: 'TreeNode' = None):
+        self.value = value
+        self.depth = depth
+        self.parent = parent
+        self.children = None
+        self.expanded = False
+        self.size = 0
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        return f'TreeNode({self.value!r})'
+
+    @property
+    def is_leaf(self) -> bool:
+        """Whether the node is known to have no children.
+        """
+
+        return self.children is not None and not self.children
+
+    def get_path(self) -> List:
+        """Returns the values of the node's ancestors and the node, root first.
+        """
+
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.value)
+            node = node.parent
+        path.reverse()
+        return path
+
+
+class TreeSelect(Select):
+    """Construct a TreeSelect object to retrieve one item of a hierarchy from a user.
+
+    A TreeSelect object shows the top level of a tree, such as the
+    organizations of an org/team/service hierarchy. The user can press
+    Right to expand the active node and Left to collapse it, and press
+    Enter to pick it. The answer is the path from the top level down to
+    the picked node.
+
+    The children of a node are fetched by calling ``children`` with the
+    path of the node the first time the node is expanded, and are kept for
+    when it is expanded again. Only the nodes whose parents are expanded
+    are listed, and only the visible rows of them are rendered, so a tree
+    opens at once however many leaves it has.
+
+    Attributes
+    ----------
+    _children : callable
+        Returns the values of the children of the node at a path.
+    _leaves_only : bool
+        Whether only nodes without children can be picked.
+    _indent : str
+        The text that indents each level of the tree.
+    """
+
+    __name__ = 'TreeSelect'
+    __module__ = 'cues'
+
+    # The marker before the nodes without children, after those of Select's sections:
+    LEAF = ' '
+
+    def __init__(self, name: str, message: str, options: Iterable,
+                 children: Callable[[List], Iterable], leaves_only: bool = False,
+                 **kwargs):
+        """
+
+        Parameters
+        ----------
+        name
+            The name of the TreeSelect instance.
+        message
+            Instructions or useful information regarding the prompt for the user.
+        options
+            The top level of the tree.
+        children
+            Takes the path of a node (the values from the top level down
+            to the node, as a list) and returns the values of its children,
+            or an empty iterable if it has none.
+        leaves_only : bool, optional
+            Whether Enter expands nodes that have children instead of
+            picking them. Default is False.
+        kwargs
+            Settings shared by all cues, such as ``timeout`` and ``default``,
+            and the settings of Select objects.
+        """
+
+        if not callable(children):
+            raise TypeError(f"'{type(children)}' object is not callable")
+        if not hasattr(options, '__iter__'):
+            raise TypeError(f"'{type(options)}' object is not iterable")
+
+        # The visible nodes, in order, which expanding and collapsing change in place:
+        nodes = [TreeNode(value) for value in options]
+        super().__init__(name, message, nodes, **kwargs)
+
+        self._children = children
+        self._leaves_only = leaves_only
+        self._indent = '  '
+
+    def _get_answer(self) -> List:
+        return self._options[self._get_active()].get_path()
+
+    def _get_row_state(self, index: int, active: bool):
+        node = self._options[index]
+        return active, node.expanded, node.is_leaf
+
+    def _render_row(self, index: int, active: bool) -> str:
+        """Returns the markup for the node at `index`, indented by its depth.
+        """
+
+        node = self._options[index]
+        if node.is_leaf:
+            branch = self.LEAF
+        else:
+            branch = self.EXPANDED if node.expanded else self.COLLAPSED
+
+        fmt = self._list_fmt_if_active if active else self._list_fmt
+        marker = constants.LIST_MARKER if active else ' ' * self._select_marker_len
+        prefix = self._indent * node.depth + branch + ' '
+        option = prefix + self._truncate(
+            str(node), self._select_marker_len + 1 + len(prefix))
+        return fmt.format(marker=marker, option=option)
+
+    def _on_expand(self):
+        """Shows the children of the active node or else moves to its first child.
+        """
+
+        index = self._get_active()
+        if index is None:
+            return
+
+        node = self._options[index]
+        if not node.expanded:
+            self._expand(index)
+        elif node.children:
+            self._activate(index + 1)
+
+    def _on_collapse(self):
+        """Hides the children of the active node or else moves to its parent.
+        """
+
+        index = self._get_active()
+        if index is None:
+            return
+
+        node = self._options[index]
+        if node.expanded and node.children:
+            self._collapse(index)
+            return
+
+        if node.parent is None:
+            return
+
+        # The parent comes before the earlier siblings and their descendants:
+        parent = index - 1
+        for sibling in node.parent.children:
+            if sibling is node:
+                break
+            parent -= 1 + sibling.size
+        self._activate(parent)
+
+    def _on_submit(self):
+        """Picks the active node, or expands it if only leaves can be picked.
+        """
+
+        index = self._get_active()
+        if self._leaves_only and self._goto is None and index is not None:
+            node = self._fetch(self._options[index])
+            if node.children:
+                if not node.expanded:
+                    self._expand(index)
+                return
+        super()._on_submit()
+
+    def _activate(self, index: int):
+        """Makes the node at `index` active if it is one of the rows.
+        """
+
+        try:
+            self._index = self._rows.index(index)
+        except ValueError:
+            pass
+
+    def _fetch(self, node: TreeNode) -> TreeNode:
+        """Fetches the children of `node` unless they have been fetched before.
+        """
+
+        if node.children is None:
+            depth = node.depth + 1
+            node.children = [
+                TreeNode(value, depth, node)
+                for value in self._children(node.get_path())]
+        return node
+
+    def _expand(self, index: int):
+        """Shows the children of the node at `index`.
+
+        Children that were expanded before their parent was collapsed show
+        their own children again.
+        """
+
+        node = self._fetch(self._options[index])
+        node.expanded = True
+        if not node.children:
+            return
+
+        shown = list(_walk(node))
+        self._options[index + 1:index + 1] = shown
+        _resize(node, len(shown))
+        self._update_rows()
+
+    def _collapse(self, index: int):
+        """Hides the descendants of the node at `index`.
+        """
+
+        node = self._options[index]
+        node.expanded = False
+        del self._options[index + 1:index + 1 + node.size]
+        _resize(node, -node.size)
+        self._update_rows()
+
+    def _update_rows(self):
+        """Updates the rows after nodes were shown or hidden.
+        """
+
+        self._clear_caches()
+        if self._query:
+            self._filter(self._query)
+        else:
+            self._rows = self._get_all_rows()
+
+    @classmethod
+    def from_dict(cls, prompt: dict):
+        """Creates and instantiates a TreeSelect object from a dict object.
+
+        Parameters
+        ----------
+        prompt : dict
+            A dict object that contains a name key, a message key, an
+            options key and a children key.
+
+        Returns
+        -------
+        cues.TreeSelect
+            A TreeSelect object to retrieve one item of a hierarchy from a user.
+        """
+
+        name = prompt['name']
+        message = prompt['message']
+        options = prompt['options']
+        children = prompt['children']
+        leaves_only = prompt.get('leaves_only', False)
+        return cls(name, message, options, children, leaves_only,
+                   **cls.get_settings(prompt))
+
+
+def _walk(node: TreeNode) -> Iterator[TreeNode]:
+    """Yields the descendants of `node` that are shown when it is expanded.
+    """
+
+    stack = [iter(node.children)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            continue
+        yield child
+        if child.expanded and child.children:
+            stack.append(iter(child.children))
+
+
+def _resize(node: TreeNode, delta: int):
+    """Adds `delta` to the number of shown descendants of `node` and its ancestors.
+    """
+
+    while node is not None:
+        node.size += delta
+        node = node.parent
+
+
+def main():
+    name = 'service'
+    message = 'Pick a service:'
+    tree = {
+        'payments': {
+            'api': ['checkout', 'refunds'],
+            'data': ['ledger', 'reports'],
+        },
+        'search': {
+            'indexing': ['crawler', 'indexer'],
+            'serving': ['frontend', 'ranker'],
+        },
+    }
+
+    def children(path):
+        node = tree
+        for part in path:
+            node = node[part] if isinstance(node, dict) else []
+        return node
+
+    cue = TreeSelect(name, message, list(tree), children)
+    answer = cue.send()
+    print(answer)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
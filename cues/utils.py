@@ -8,11 +8,12 @@ This module contains useful, general functions.
 """
 
 import math
+import os
 import platform
 import re
 from typing import List
 
-from .listen import ansi, windows, unix
+from .listen import ansi, session, windows, unix
 
 
 def is_windows() -> bool:
@@ -28,6 +29,30 @@ def is_windows() -> bool:
     return False
 
 
+def get_cache_dir() -> str:
+    """Returns the directory where Cues keeps cached data for the user.
+
+    Follows the conventions of each OS: ``%LOCALAPPDATA%`` on Windows,
+    ``~/Library/Caches`` on macOS and ``$XDG_CACHE_HOME`` (or ``~/.cache``)
+    elsewhere.
+
+    Returns
+    -------
+    :rtype: str
+    """
+
+    system = platform.system()
+    if system == 'Windows':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(
+            os.path.join('~', 'AppData', 'Local'))
+    elif system == 'Darwin':
+        base = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(
+            os.path.join('~', '.cache'))
+    return os.path.join(base, 'cues')
+
+
 def get_keys() -> dict:
     """Returns a dict object contains keys based on OS.
 
@@ -100,11 +125,17 @@ def get_half(n: int) -> int:
 def get_listen_function() -> windows.listen or unix.listen:
     """Returns appropriate listening function based on OS.
 
+    If a Session is active, its queue is used instead.
+
     Returns
     -------
     :rtype: function
     """
 
+    active = session.current()
+    if active is not None:
+        return active.listen
+
     if is_windows():
         return windows.listen
     return unix.listen
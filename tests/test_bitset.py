@@ -0,0 +1,109 @@
+"""
+tests.test_bitset
+=================
+
+A testing module for `cues.bitset`.
+"""
+
+import random
+
+import pytest
+
+from cues.bitset import Bitset
+
+
+def test_add_and_discard():
+    bitset = Bitset()
+    assert len(bitset) == 0
+    assert 0 not in bitset
+
+    bitset.add(3)
+    bitset.add(3)
+    bitset.add(100)
+    assert len(bitset) == 2
+    assert 3 in bitset and 100 in bitset
+    assert 4 not in bitset and 1000 not in bitset
+
+    bitset.discard(3)
+    bitset.discard(3)
+    bitset.discard(5000)
+    assert len(bitset) == 1
+    assert list(bitset) == [100]
+
+
+def test_toggle():
+    bitset = Bitset(10)
+
+    assert bitset.toggle(9)
+    assert 9 in bitset
+    assert not bitset.toggle(9)
+    assert len(bitset) == 0
+
+
+def test_iter_is_sorted():
+    indices = random.Random(0).sample(range(100_000), 1000)
+    bitset = Bitset(100_000)
+    for index in indices:
+        bitset.add(index)
+
+    assert list(bitset) == sorted(indices)
+    assert len(bitset) == 1000
+    assert len(bitset._bits) == 12_500
+
+
+def test_ranges():
+    bitset = Bitset()
+
+    bitset.update(range(3, 29))
+    assert list(bitset) == list(range(3, 29))
+    assert len(bitset) == 26
+
+    bitset.difference_update(range(5, 6))
+    bitset.difference_update(range(20, 1000))
+    assert list(bitset) == [3, 4] + list(range(6, 20))
+    assert len(bitset) == 16
+
+    bitset.symmetric_difference_update(range(0, 10))
+    assert list(bitset) == [0, 1, 2, 5] + list(range(10, 20))
+    assert len(bitset) == 14
+
+    # Other iterables are added one at a time:
+    bitset.update([40, 2])
+    bitset.difference_update(iter([0, 1]))
+    bitset.symmetric_difference_update(range(0, 10, 5))
+    assert list(bitset) == [0, 2] + list(range(10, 20)) + [40]
+
+
+def test_ranges_match_set():
+    rng = random.Random(2)
+    bitset = Bitset()
+    expected = set()
+
+    for _ in range(200):
+        start = rng.randrange(300)
+        stop = start + rng.randrange(100)
+        operation = rng.choice(['update', 'difference_update',
+                                'symmetric_difference_update'])
+        getattr(bitset, operation)(range(start, stop))
+        getattr(expected, operation)(range(start, stop))
+
+        assert list(bitset) == sorted(expected)
+        assert len(bitset) == len(expected)
+
+
+def test_clear():
+    bitset = Bitset()
+    for index in range(0, 50, 7):
+        bitset.add(index)
+
+    bitset.clear()
+    assert len(bitset) == 0
+    assert list(bitset) == []
+
+
+def test_negative_index():
+    bitset = Bitset()
+
+    with pytest.raises(ValueError):
+        bitset.add(-1)
+    assert -1 not in bitset
@@ -0,0 +1,97 @@
+"""
+tests.test_cache
+================
+
+A testing module for `cues.cache`.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from cues import cache
+
+
+class TestOptionCache:
+    def setup(self):
+        self.calls = []
+
+    def provider(self):
+        self.calls.append(1)
+        return [f'branch-{len(self.calls)}']
+
+    def test_errors(self, tmp_path):
+        with pytest.raises(ValueError):
+            cache.OptionCache(str(tmp_path), ttl=-1)
+        with pytest.raises(ValueError):
+            cache.OptionCache(str(tmp_path), max_bytes=0)
+
+    def test_get(self, tmp_path):
+        option_cache = cache.OptionCache(str(tmp_path))
+
+        assert option_cache.get('branches', self.provider) == ['branch-1']
+        assert option_cache.get('branches', self.provider) == ['branch-1']
+        assert len(self.calls) == 1
+
+        # Other instances read the same entry:
+        other = cache.OptionCache(str(tmp_path))
+        assert other.get('branches', self.provider) == ['branch-1']
+        assert len(self.calls) == 1
+
+    def test_get_when_stale(self, tmp_path):
+        option_cache = cache.OptionCache(str(tmp_path), ttl=60)
+        option_cache.get('branches', self.provider)
+
+        path = option_cache._get_path('branches')
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        entry['time'] -= 61
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+
+        # The stale options are returned while they are refreshed:
+        assert option_cache.get('branches', self.provider) == ['branch-1']
+        option_cache.refresh('branches', self.provider).join()
+        assert option_cache.get('branches', self.provider) == ['branch-2']
+
+    def test_refresh_keeps_options_on_error(self, tmp_path):
+        option_cache = cache.OptionCache(str(tmp_path))
+        option_cache.get('branches', self.provider)
+
+        def provider():
+            raise OSError('git is not installed')
+
+        option_cache.refresh('branches', provider).join()
+        assert option_cache.get('branches', self.provider, ttl=60) == ['branch-1']
+
+    def test_corrupt_entry(self, tmp_path):
+        option_cache = cache.OptionCache(str(tmp_path))
+        with open(option_cache._get_path('branches'), 'w') as f:
+            f.write('{')
+
+        assert option_cache.get('branches', self.provider) == ['branch-1']
+
+    def test_max_bytes(self, tmp_path):
+        option_cache = cache.OptionCache(str(tmp_path), max_bytes=200)
+
+        option_cache.get('old', lambda: ['x' * 100])
+        old = option_cache._get_path('old')
+        os.utime(old, (time.time() - 10, time.time() - 10))
+        option_cache.get('new', lambda: ['y' * 100])
+
+        assert not os.path.exists(old)
+        assert os.path.exists(option_cache._get_path('new'))
+
+    def test_clear(self, tmp_path):
+        option_cache = cache.OptionCache(str(tmp_path))
+        option_cache.get('a', self.provider)
+        option_cache.get('b', self.provider)
+
+        option_cache.clear('a')
+        assert option_cache._read('a') is None
+        assert option_cache._read('b') is not None
+
+        option_cache.clear()
+        assert option_cache._list() == []
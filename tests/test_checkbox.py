@@ -5,9 +5,11 @@ tests.test_checkbox
 A testing module for `cues.checkbox`.
 """
 
+from concurrent.futures import Future
+
 import pytest
 
-from cues import checkbox, cursor
+from cues import checkbox, cursor, keys
 from cues.checkbox import Checkbox
 
 
@@ -101,6 +103,167 @@ class TestCheckbox:
         assert cue._draw() is None
         assert cue.answer == {self.name: []}
 
+    def test_actions(self):
+        cue = Checkbox(self.name, self.message, self.options)
+        cue._reset()
+
+        cue._on_up()
+        assert cue._index == len(self.options) - 1
+        cue._on_down()
+        assert cue._index == 0
+
+        cue._on_toggle()
+        assert list(cue._checked) == [0]
+        cue._on_toggle()
+        assert len(cue._checked) == 0
+
+        cue._on_submit()
+        assert cue._done
+
+    def test_row_cache(self, monkeypatch):
+        cue = Checkbox(self.name, self.message, self.options)
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: None)
+
+        cue._reset()
+        cue._write_frame()
+        unchecked = cue._get_row(0, True)
+
+        cue._on_toggle()
+        cue._write_frame()
+        assert cue._get_row(0, True) != unchecked
+        assert (0, (True, True)) in cue._row_cache
+
+    def test_selections_survive_filter(self):
+        cue = Checkbox(self.name, self.message, self.options)
+        cue._reset()
+
+        cue._filter(self.options[2])
+        cue._on_toggle()
+        cue._filter('')
+        assert cue._index == 2
+
+        cue._on_down()
+        cue._on_toggle()
+        assert cue._get_answer() == self.options[2:4]
+
+    def test_bulk_actions(self):
+        cue = Checkbox(self.name, self.message, self.options)
+        cue._reset()
+
+        cue._dispatch(1)
+        assert cue._get_answer() == self.options
+        cue._dispatch(21)
+        assert cue._get_answer() == []
+        # Ctrl+N is left free for moving down:
+        cue._dispatch(1)
+        cue._dispatch(14)
+        assert cue._get_answer() == self.options
+        cue._dispatch(21)
+
+        cue._on_toggle()
+        cue._dispatch(18)
+        assert cue._get_answer() == self.options[1:]
+        assert len(cue._checked) == 6
+
+    def test_bulk_actions_with_filter(self):
+        cue = Checkbox(self.name, self.message, self.options)
+        cue._reset()
+
+        cue._filter('ca')
+        cue._on_check_all()
+        assert cue._get_answer() == ['Stratocaster', 'Telecaster', 'Classical']
+
+        cue._filter('c')
+        cue._on_invert()
+        assert cue._get_answer() == ['Acoustic']
+
+        cue._filter('')
+        cue._on_uncheck_all()
+        assert cue._get_answer() == []
+
+    def test_bulk_actions_with_fuzzy_filter(self):
+        options = [f'host-{i}' for i in range(10)]
+        cue = Checkbox(self.name, self.message, options, fuzzy=True)
+        cue.FUZZY_LIMIT = 3
+        cue._reset()
+
+        cue._filter('hst')
+        assert len(cue._rows) == 3
+        cue._on_check_all()
+        assert cue._get_answer() == options
+
+        cue._filter('hst-1')
+        cue._on_invert()
+        assert cue._get_answer() == options[:1] + options[2:]
+
+        cue._on_uncheck_all()
+        cue._filter('hst')
+        cue._on_uncheck_all()
+        assert cue._get_answer() == []
+
+    def test_bulk_actions_while_ranking(self, monkeypatch):
+        options = [f'host-{i}' for i in range(10)]
+        cue = Checkbox(self.name, self.message, options, fuzzy=True)
+        cue.FUZZY_LIMIT = 3
+        submit = cue._matcher.submit
+        pending = Future()
+        monkeypatch.setattr(cue._matcher, 'submit',
+                            lambda query, limit=None: pending if limit else submit(query, limit))
+        cue._reset()
+
+        cue._filter('hst')
+        assert cue._ranking is pending
+        cue._on_check_all()
+        assert cue._get_answer() == options
+        # The running ranking was replaced by the full one:
+        assert cue._ranking is None
+        assert len(cue._rows) == 3
+
+    def test_bulk_keys(self):
+        cue = Checkbox(self.name, self.message, self.options,
+                       keymap={'ctrl+n': 'down', 'ctrl+p': 'up'})
+
+        assert cue._keymap[keys.get('ctrl+a')] == 'check_all'
+        assert cue._keymap[keys.get('ctrl+u')] == 'uncheck_all'
+        assert cue._keymap[keys.get('ctrl+r')] == 'invert'
+        # Emacs-style movement doesn't replace a bulk action:
+        assert 'uncheck_all' in cue._keymap.values()
+
+    def test_extend(self):
+        cue = Checkbox(self.name, self.message, self.options)
+        cue._reset()
+
+        cue._on_down()
+        cue._on_extend_down()
+        cue._on_extend_down()
+        assert cue._get_answer() == self.options[1:4]
+
+        # Going back over the range keeps the options checked:
+        cue._on_extend_up()
+        assert cue._get_answer() == self.options[1:4]
+
+        # Moving without Shift starts a new range:
+        cue._on_down()
+        cue._on_down()
+        cue._on_down()
+        cue._on_extend_down()
+        assert cue._get_answer() == self.options[1:4] + self.options[5:7]
+
+        # Ranges stop at the end of the list:
+        cue._on_extend_down()
+        assert cue._index == len(self.options) - 1
+
+    def test_bulk_actions_on_large_list(self):
+        options = [f'host-{i}' for i in range(100_000)]
+        cue = Checkbox(self.name, self.message, options)
+        cue._reset()
+
+        cue._on_check_all()
+        assert len(cue._checked) == 100_000
+        cue._on_toggle()
+        cue._on_invert()
+        assert list(cue._checked) == [0]
+
     def test_from_dict(self):
         checkbox_dict = {
             'name': self.name,
@@ -40,3 +40,14 @@ def test_make_colored():
     example_str_with_no_tags_result = color.make_colored(
         example_str_with_no_tags)
     assert example_str_with_no_tags_result == example_str_with_no_tags_expected_result
+
+
+def test_make_colored_does_not_parse_color_codes():
+    # The code for red ends in "[31m", which must not be read as a tag:
+    assert color.make_colored('[red]][31m]') == '\x1b[31m]'
+
+
+def test_get_color_code():
+    assert color.get_color_code('[underline skyblue]') == '\x1b[4;38;5;117m'
+    assert color.get_color_code('[/skyblue]') == color.Color.RESET
+    assert color.get_color_code('[unknown]') == ''
@@ -9,6 +9,7 @@ import pytest
 
 from cues import confirm, cursor
 from cues.confirm import Confirm
+from cues.exceptions import CueTimeoutError
 
 
 class TestConfirm:
@@ -70,6 +71,47 @@ class TestConfirm:
 
         assert cue.answer == {self.name: False}
 
+    def test_timeout_with_default(self, monkeypatch):
+        cue = Confirm(self.name, self.message, timeout=0.01, default=False)
+
+        monkeypatch.setattr(cue, '_listen_function', lambda timeout=None: None)
+        monkeypatch.setattr(cursor, 'write', lambda _, color=True: None)
+
+        cue._ask()
+
+        assert cue.answer == {self.name: False}
+        assert cue._deadline is None
+
+    def test_timeout_without_default(self, monkeypatch):
+        cue = Confirm(self.name, self.message, timeout=0.01)
+
+        monkeypatch.setattr(cue, '_listen_function', lambda timeout=None: None)
+        monkeypatch.setattr(cursor, 'write', lambda _, color=True: None)
+
+        with pytest.raises(CueTimeoutError):
+            cue._ask()
+
+    def test_timeout_not_reached(self, monkeypatch):
+        cue = Confirm(self.name, self.message, timeout=10, default=False)
+
+        monkeypatch.setattr(cue, '_listen_function',
+                            lambda timeout=None: cue.keys.get('y'))
+        monkeypatch.setattr(cursor, 'write', lambda _, color=True: None)
+
+        cue._ask()
+
+        assert cue.answer == {self.name: True}
+
+    def test_timeout_errors(self):
+        with pytest.raises(ValueError):
+            Confirm(self.name, self.message, timeout=0)
+
+    def test_from_dict_with_settings(self):
+        cue = Confirm.from_dict(dict(self.dic, timeout=5, default=True))
+
+        assert cue._timeout == 5
+        assert cue._default is True
+
     # For dev use only (do NOT use with CI):
 
     # def test__draw(self):
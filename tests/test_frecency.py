@@ -0,0 +1,108 @@
+"""
+tests.test_frecency
+===================
+
+A testing module for `cues.frecency`.
+"""
+
+import random
+
+import pytest
+
+from cues import frecency
+
+
+class TestFrecencyIndex:
+    def setup(self):
+        self.options = ['eu-west-1', 'us-east-1', 'us-west-2', 'ap-south-1']
+
+    def test_errors(self, tmp_path):
+        with pytest.raises(ValueError):
+            frecency.FrecencyIndex(str(tmp_path), half_life=0)
+
+    def test_record(self, tmp_path):
+        index = frecency.FrecencyIndex(str(tmp_path))
+        assert index.get_scores('region') == {}
+        assert index.rank('region', self.options) == []
+
+        index.record('region', ['us-west-2'])
+        index.record('region', ['us-west-2'])
+        index.record('region', ['eu-west-1', 'ap-south-1'])
+
+        scores = index.get_scores('region')
+        assert set(scores) == {'us-west-2', 'eu-west-1', 'ap-south-1'}
+        assert scores['us-west-2'] == pytest.approx(2)
+        # Ties keep the order of the options:
+        assert index.rank('region', self.options) == [2, 0, 3]
+
+        # Other prompts and other instances:
+        assert index.get_scores('zone') == {}
+        other = frecency.FrecencyIndex(str(tmp_path))
+        assert other.rank('region', self.options) == [2, 0, 3]
+
+    def test_recent_picks_win(self, tmp_path, monkeypatch):
+        index = frecency.FrecencyIndex(str(tmp_path), half_life=10)
+        now = 1000.0
+        monkeypatch.setattr(frecency.time, 'time', lambda: now)
+
+        index.record('region', ['us-east-1'])
+        index.record('region', ['us-east-1'])
+        index.record('region', ['us-east-1'])
+        now += 20
+        index.record('region', ['ap-south-1'])
+        index.record('region', ['ap-south-1'])
+
+        scores = index.get_scores('region')
+        assert scores['us-east-1'] == pytest.approx(0.75)
+        assert index.rank('region', self.options) == [3, 1]
+
+        # The decayed score is what a new pick adds to:
+        index.record('region', ['us-east-1'])
+        assert index.get_scores('region')['us-east-1'] == pytest.approx(1.75)
+
+    def test_clear(self, tmp_path):
+        index = frecency.FrecencyIndex(str(tmp_path))
+        index.record('region', ['us-east-1'])
+        index.record('zone', ['a'])
+
+        index.clear('region')
+        assert index.get_scores('region') == {}
+        assert index.get_scores('zone') == {'a': pytest.approx(1)}
+
+        index.clear()
+        assert index.get_scores('zone') == {}
+
+    def test_unwritable_directory(self, tmp_path):
+        path = tmp_path / 'file'
+        path.write_text('')
+        index = frecency.FrecencyIndex(str(path))
+
+        index.record('region', ['us-east-1'])
+        assert index.get_scores('region') == {}
+
+
+def test_promoted_range():
+    rows = frecency.PromotedRange([7, 2, 5], 10)
+
+    expected = [7, 2, 5, 0, 1, 3, 4, 6, 8, 9]
+    assert list(rows) == expected
+    assert [rows[i] for i in range(10)] == expected
+    assert rows[-1] == 9
+    assert [rows.index(i) for i in expected] == list(range(10))
+    assert rows[1:4] == [2, 5, 0]
+    assert 9 in rows and 10 not in rows
+
+    with pytest.raises(IndexError):
+        rows[10]
+    with pytest.raises(ValueError):
+        rows.index(10)
+
+
+def test_promoted_range_matches_list():
+    total = 500
+    promoted = random.Random(1).sample(range(total), 40)
+    rows = frecency.PromotedRange(promoted, total)
+
+    expected = promoted + [i for i in range(total) if i not in promoted]
+    assert [rows[i] for i in range(total)] == expected
+    assert all(rows.index(value) == i for i, value in enumerate(expected))
@@ -0,0 +1,178 @@
+"""
+tests.test_grid
+===============
+
+A testing module for `cues.grid`.
+"""
+
+import pytest
+
+from cues import cursor, keys
+from cues.grid import GridSelect
+
+
+class TestGridSelect:
+    def setup(self):
+        self.name = 'instances'
+        self.message = 'Pick the instances to restart:'
+        self.columns = ['id', 'zone', 'cpu %']
+        self.options = [
+            ('i-3', 'us-east-1b', 40),
+            ('i-1', 'eu-west-1a', 95),
+            ('i-2', 'us-east-1a', 7),
+            ('i-4', 'eu-west-1b', None),
+        ]
+
+    def get_ids(self, cue):
+        return [cue._options[i][0] for i in cue._rows]
+
+    def test_init_errors(self):
+        with pytest.raises(TypeError):
+            GridSelect(self.name, self.message, self.options, 'id')
+        with pytest.raises(ValueError):
+            GridSelect(self.name, self.message, self.options, [])
+
+    def test_sort(self):
+        cue = GridSelect(self.name, self.message, self.options, self.columns)
+        cue._reset()
+        assert self.get_ids(cue) == ['i-3', 'i-1', 'i-2', 'i-4']
+
+        cue._on_sort()
+        assert self.get_ids(cue) == ['i-1', 'i-2', 'i-3', 'i-4']
+        # The active record stays active:
+        assert cue._get_answer() == ('i-3', 'us-east-1b', 40)
+
+        cue._on_sort()
+        cue._on_sort()
+        # Numbers are compared as numbers and missing values come last:
+        assert self.get_ids(cue) == ['i-2', 'i-3', 'i-1', 'i-4']
+        cue._on_reverse()
+        assert self.get_ids(cue) == ['i-4', 'i-1', 'i-3', 'i-2']
+
+        cue._on_sort()
+        assert cue._sort_column is None
+        assert self.get_ids(cue) == ['i-3', 'i-1', 'i-2', 'i-4']
+
+    def test_orders_are_cached(self, monkeypatch):
+        cue = GridSelect(self.name, self.message, self.options, self.columns)
+        cue._reset()
+        calls = []
+        get_cell = cue._get_cell
+        monkeypatch.setattr(
+            cue, '_get_cell', lambda record, column: calls.append(column) or get_cell(record, column))
+
+        cue._on_sort()
+        order = cue._rows
+        assert len(calls) == len(self.options)
+
+        # Reversing and switching back doesn't sort again:
+        cue._on_reverse()
+        cue._on_reverse()
+        cue._on_sort()
+        cue._on_sort()
+        cue._on_sort()
+        cue._on_sort()
+        assert cue._rows is order
+        assert len(calls) == 3 * len(self.options)
+
+    def test_filter(self):
+        cue = GridSelect(self.name, self.message, self.options, self.columns)
+        cue._reset()
+
+        # Every cell of a record is matched:
+        cue._filter('east')
+        assert self.get_ids(cue) == ['i-3', 'i-2']
+        cue._filter('95')
+        assert self.get_ids(cue) == ['i-1']
+
+        cue._filter('i-')
+        cue._on_sort()
+        assert self.get_ids(cue) == ['i-1', 'i-2', 'i-3', 'i-4']
+
+    def test_mappings(self):
+        options = [{'id': 'i-1', 'cpu %': 3}, {'id': 'i-2', 'zone': 'eu-west-1a'}]
+        cue = GridSelect(self.name, self.message, options, self.columns)
+        cue._reset()
+
+        assert cue._get_cell(options[0], 1) is None
+        assert cue._get_cell(options[1], 1) == 'eu-west-1a'
+        cue._on_sort()
+        cue._on_sort()
+        assert [options[i]['id'] for i in cue._rows] == ['i-2', 'i-1']
+
+    def test_widths(self):
+        options = [('a' * 100, 'b')] + [('c', 'd')] * (GridSelect.SAMPLE_SIZE + 10) + [('e', 'f' * 30)]
+        cue = GridSelect(self.name, self.message, iter(options), ['x', 'y'])
+        cue._reset()
+
+        # Only the sample is measured, and columns are capped:
+        assert cue._get_widths() == [GridSelect.MAX_COLUMN_WIDTH, 3]
+        assert len(cue._options) < len(options)
+        assert cue._format_cell('a' * 100, 5) == 'aaaa…'
+        assert cue._format_cell(12, 5) == '   12'
+
+    def test_scroll(self, monkeypatch):
+        cue = GridSelect(self.name, self.message, self.options, self.columns)
+        monkeypatch.setattr(cue, 'max_columns', 24)
+        cue._reset()
+
+        assert [column for column, _ in cue._get_visible_columns()] == [0, 1]
+        cue._on_scroll_right()
+        assert [column for column, _ in cue._get_visible_columns()] == [1, 2]
+        assert cue._get_header().count('‹') == 1
+        cue._on_scroll_right()
+        assert cue._column == 1
+        cue._on_scroll_left()
+        cue._on_scroll_left()
+        assert cue._column == 0
+        assert '›' in cue._get_header()
+
+    def test_write_frame(self, monkeypatch):
+        cue = GridSelect(self.name, self.message, self.options, self.columns)
+        frames = []
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        cue._reset()
+        cue._on_sort()
+        cue._write_frame()
+        lines = frames[-1].splitlines()
+        assert 'id ▲' in lines[0]
+        assert 'i-1   eu-west-1a       95' in lines[1]
+        assert lines[4].endswith('i-4   eu-west-1b\x1b[K')
+
+    def test_multiple(self, monkeypatch):
+        cue = GridSelect(self.name, self.message, self.options, self.columns, multiple=True)
+        moves = [keys.SPACE, keys.DOWN, keys.DOWN, keys.SPACE, keys.ENTER]
+
+        monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+        monkeypatch.setattr(cursor, 'clear', lambda _: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        assert cue.answer == {self.name: [self.options[0], self.options[2]]}
+
+    def test_draw(self, monkeypatch):
+        cue = GridSelect(self.name, self.message, self.options, self.columns)
+        moves = [keys.TAB, keys.DOWN, keys.ENTER]
+
+        monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+        monkeypatch.setattr(cursor, 'clear', lambda _: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        assert cue.answer == {self.name: self.options[3]}
+
+    def test_from_dict(self):
+        cue = GridSelect.from_dict({
+            'name': self.name,
+            'message': self.message,
+            'options': self.options,
+            'columns': self.columns,
+            'multiple': True,
+            'max_rows': 5,
+        })
+
+        assert cue._multiple
+        assert cue._columns == self.columns
+        assert cue._max_rows == 5
@@ -0,0 +1,70 @@
+"""
+tests.test_groups
+=================
+
+A testing module for `cues.groups`.
+"""
+
+import random
+
+import pytest
+
+from cues import groups
+
+
+def test_flatten():
+    options, sections = groups.flatten({'us': ['us-east-1', 'us-west-2'], 'eu': ('eu-west-1',)})
+
+    assert [str(option) for option in options] == ['us', 'us-east-1', 'us-west-2', 'eu', 'eu-west-1']
+    assert [(group.start, group.size) for group in sections] == [(0, 2), (3, 1)]
+
+    with pytest.raises(TypeError):
+        groups.flatten({'us': 'us-east-1'})
+
+
+def test_grouped_rows():
+    _, sections = groups.flatten({'a': range(3), 'b': range(2), 'c': [], 'd': range(2)})
+    sections[1].collapsed = True
+    rows = groups.GroupedRows(sections)
+
+    expected = [0, 1, 2, 3, 4, 7, 8, 9, 10]
+    assert list(rows) == expected
+    assert [rows[i] for i in range(len(rows))] == expected
+    assert rows[-1] == 10
+    assert rows[3:6] == [3, 4, 7]
+    assert [rows.index(i) for i in expected] == list(range(len(expected)))
+    assert 5 not in rows and 11 not in rows and -1 not in rows
+    assert rows.get_group(6) is sections[1]
+
+    with pytest.raises(IndexError):
+        rows[9]
+    with pytest.raises(ValueError):
+        rows.index(6)
+
+
+def test_add_headers():
+    _, sections = groups.flatten({'a': range(3), 'b': range(2), 'c': range(2), 'd': range(1)})
+    rows = groups.GroupedRows(sections)
+
+    assert rows.add_headers([2, 3, 5, 6, 7]) == [0, 2, 3, 4, 5, 6, 7]
+    assert rows.add_headers([]) == []
+
+    # Collapsed sections keep their headers:
+    sections[3].collapsed = True
+    assert rows.add_headers([1]) == [0, 1, 10]
+
+
+def test_grouped_rows_match_list():
+    sizes = random.Random(1).choices(range(50), k=100)
+    _, sections = groups.flatten({str(i): range(size) for i, size in enumerate(sizes)})
+    for group in random.Random(2).sample(sections, 30):
+        group.collapsed = True
+    rows = groups.GroupedRows(sections)
+
+    expected = []
+    for group in sections:
+        expected.append(group.start)
+        if not group.collapsed:
+            expected.extend(range(group.start + 1, group.start + 1 + group.size))
+    assert [rows[i] for i in range(len(rows))] == expected
+    assert all(rows.index(value) == i for i, value in enumerate(expected))
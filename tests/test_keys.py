@@ -0,0 +1,45 @@
+"""
+tests.test_keys
+===============
+
+A testing module for `cues.keys`.
+"""
+
+import pytest
+
+from cues import keys, utils
+from cues.listen import ansi
+
+
+def test_key_is_interned():
+    assert keys.Key('up') is keys.UP
+    assert keys.char('a') is keys.char('a')
+    assert keys.char(' ') is keys.SPACE
+
+
+def test_decode():
+    assert keys.decode(ord('a')) is keys.char('a')
+    assert keys.decode(ansi.SPACE) is keys.SPACE
+    assert keys.decode(1) is keys.get('ctrl+a')
+    assert keys.decode(keys.DOWN) is keys.DOWN
+    assert keys.decode(None) is keys.UNKNOWN
+
+    if utils.is_windows():
+        assert keys.decode(ansi.UP) is keys.UP
+        assert keys.decode(ansi.ENTER) is keys.ENTER
+    else:
+        assert keys.decode(ansi.NO_ESC_UP) is keys.UP
+        assert keys.decode('[6~') is keys.PAGE_DOWN
+        assert keys.decode('[1;2A') is keys.SHIFT_UP
+        assert keys.decode(ansi.ENTER_CTRL_CODE) is keys.ENTER
+        assert keys.decode(ansi.BACKSPACE_CTRL_CODE) is keys.BACKSPACE
+
+
+def test_get():
+    assert keys.get('j') is keys.char('j')
+    assert keys.get('PageUp') is keys.PAGE_UP
+    assert keys.get('ctrl+n') is keys.CTRL[14]
+    assert keys.get(keys.END) is keys.END
+
+    with pytest.raises(ValueError):
+        keys.get('hyper+q')
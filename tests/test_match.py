@@ -0,0 +1,118 @@
+"""
+tests.test_match
+================
+
+A testing module for `cues.match`.
+"""
+
+import multiprocessing
+from concurrent.futures import CancelledError, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from cues import match
+
+
+def test_score():
+    assert match.score('fb', 'foo-bar') is not None
+    assert match.score('bf', 'foo-bar') is None
+    assert match.score('', 'foo-bar') == 0
+
+    # Consecutive characters and word starts score higher:
+    assert match.score('foo', 'foo-bar') > match.score('foo', 'f-o-o')
+    assert match.score('bar', 'foo-bar') > match.score('bar', 'foobar')
+
+
+def test_score_finds_shortest_match():
+    assert match.score('ab', 'a----ab') == match.score('ab', 'ab')
+
+
+def test_get_mask():
+    assert match.get_mask('ab') == match.get_mask('ba') == 0b11
+    assert match.get_mask('-') == 0
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_rank(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(match, 'numpy', None)
+
+    texts = ['barfoo', 'foo', 'f-o-o', 'bar', 'foo-bar']
+    masks = match.get_masks(texts)
+
+    assert match.rank('foo', texts, masks) == [1, 4, 2, 0]
+    assert match.rank('foo', texts, masks, limit=2) == [1, 4]
+    assert match.rank('foo', texts, indices=[2, 3]) == [2]
+
+
+class TestMatcher:
+    def setup(self):
+        self.options = [f'Artifact-{i}' for i in range(2000)]
+
+    def test_processes_errors(self):
+        with pytest.raises(ValueError):
+            match.Matcher(self.options, processes=0)
+
+    def test_rank(self):
+        with match.Matcher(self.options, processes=1) as matcher:
+            assert matcher.rank('ARTIFACT-1999', limit=5) == [1999]
+            assert matcher.rank('', limit=3) == range(3)
+            assert len(matcher.rank('a1', limit=10)) == 10
+
+    def test_rank_in_processes(self):
+        with match.Matcher(self.options, processes=2, threshold=100) as matcher:
+            expected = match.Matcher(self.options, processes=1).rank('f19', 20)
+            assert matcher.rank('f19', 20) == expected
+
+    def test_rank_in_spawned_processes(self):
+        with match.Matcher(self.options, processes=2, threshold=100) as matcher:
+            matcher._context = multiprocessing.get_context('spawn')
+            expected = match.Matcher(self.options, processes=1).rank('f19', 20)
+            assert matcher.rank('f19', 20) == expected
+            assert matcher._pool is not None
+            assert not matcher._broken
+
+    def test_rank_in_forked_processes_without_initializer(self, monkeypatch):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            pytest.skip('processes are not forked on this platform')
+        monkeypatch.setattr(match, '_HAS_INITIALIZER', False)
+
+        with match.Matcher(self.options, processes=2, threshold=100) as matcher:
+            matcher._context = multiprocessing.get_context('fork')
+            expected = match.Matcher(self.options, processes=1).rank('f19', 20)
+            assert matcher.rank('f19', 20) == expected
+
+            # Spawned workers wouldn't inherit the options:
+            matcher._context = multiprocessing.get_context('spawn')
+            assert not matcher._use_pool()
+
+    def test_rank_with_broken_pool(self):
+        class BrokenPool:
+            def submit(self, *args):
+                future = Future()
+                future.set_exception(BrokenProcessPool())
+                return future
+
+            def shutdown(self, wait=True):
+                pass
+
+        with match.Matcher(self.options, processes=2, threshold=100) as matcher:
+            matcher._prepare()
+            matcher._shared = multiprocessing.Value('l', 0)
+            matcher._pool = BrokenPool()
+            expected = match.Matcher(self.options, processes=1).rank('f19', 20)
+            assert matcher.rank('f19', 20) == expected
+            assert matcher._broken
+            assert not matcher._use_pool()
+
+    def test_submit_cancels_previous_query(self):
+        with match.Matcher(self.options, processes=2, threshold=100) as matcher:
+            old = matcher.submit('a1')
+            new = matcher.submit('a2', limit=1)
+
+            with pytest.raises(CancelledError):
+                old.result()
+            assert new.result() == [2]
@@ -0,0 +1,698 @@
+"""
+tests.test_menu
+===============
+
+A testing module for `cues.menu`.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from cues import cursor, keys, source, utils
+from cues.listen import ansi
+from cues.frecency import FrecencyIndex
+from cues.menu import Viewport
+from cues.select import Select
+from cues.source import StreamSource
+
+
+def test_viewport_follow():
+    viewport = Viewport(height=5)
+
+    viewport.follow(3, 100)
+    assert viewport.rows(100) == range(0, 5)
+
+    viewport.follow(7, 100)
+    assert viewport.rows(100) == range(3, 8)
+
+    viewport.follow(1, 100)
+    assert viewport.rows(100) == range(1, 6)
+
+    viewport.follow(99, 100)
+    assert viewport.rows(100) == range(95, 100)
+
+
+def test_viewport_with_fewer_rows_than_height():
+    viewport = Viewport(height=5)
+
+    viewport.follow(2, 3)
+    assert viewport.rows(3) == range(0, 3)
+
+
+class TestMenu:
+    def setup(self):
+        self.name = 'host'
+        self.message = 'Pick a host:'
+        self.options = [f'host-{i}' for i in range(5000)]
+
+    def test_max_rows_errors(self):
+        with pytest.raises(ValueError):
+            Select(self.name, self.message, self.options, max_rows=0)
+
+    def test_write_frame(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, max_rows=10)
+        frames = []
+
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        lines = cue._write_frame()
+        assert lines == 12
+        assert frames[-1].count('\n') == lines
+        assert 'host-9' in frames[-1]
+        assert 'host-10' not in frames[-1]
+        assert '4990 more' in frames[-1]
+
+        cue._on_up()
+        lines = cue._write_frame()
+        assert lines == 12
+        assert 'host-4999' in frames[-1]
+        assert 'host-4989' not in frames[-1]
+        assert '4990 more' in frames[-1]
+
+    def test_write_frame_without_scrolling(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options[:3], max_rows=10)
+        frames = []
+
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        assert cue._write_frame() == 3
+        assert 'more' not in frames[-1]
+
+    def test_from_dict_with_max_rows(self):
+        cue = Select.from_dict({
+            'name': self.name,
+            'message': self.message,
+            'options': self.options,
+            'max_rows': 5
+        })
+
+        assert cue._max_rows == 5
+
+    def test_truncate(self):
+        cue = Select(self.name, self.message, self.options)
+        cue.max_columns = 10
+
+        assert cue._truncate('a' * 20, 2) == 'a' * 7 + '…'
+        assert cue._truncate('a' * 8, 2) == 'a' * 8
+
+    def test_page_and_end_actions(self):
+        cue = Select(self.name, self.message, self.options, max_rows=10)
+        cue._viewport.height = 10
+
+        cue._on_page_down()
+        assert cue._index == 10
+        cue._on_page_up()
+        cue._on_page_up()
+        assert cue._index == 0
+
+        cue._on_end()
+        assert cue._index == 4999
+        cue._on_page_down()
+        assert cue._index == 4999
+        cue._on_home()
+        assert cue._index == 0
+
+    def test_goto(self):
+        cue = Select(self.name, self.message, self.options)
+
+        cue._on_goto()
+        for char in '1250':
+            cue._on_char(char)
+        cue._on_char('x')
+        cue._on_backspace()
+        assert cue._goto == '125'
+
+        cue._on_submit()
+        assert cue._index == 124
+        assert cue._goto is None
+        assert not cue._done
+
+        cue._on_goto()
+        cue._on_char('9')
+        cue._on_cancel()
+        cue._on_submit()
+        assert cue._index == 124
+        assert cue._done
+
+    def test_goto_empty(self):
+        cue = Select(self.name, self.message, self.options)
+
+        cue._on_goto()
+        cue._on_submit()
+        assert cue._goto is None
+        assert cue._index == 0
+        assert not cue._done
+
+        cue._on_goto()
+        cue._on_char('3')
+        cue._on_backspace()
+        cue._on_backspace()
+        assert cue._goto is None
+
+    def test_filter_starts_with_digit(self):
+        hosts = ['10.0.0.1', '10.0.0.2', '192.168.1.1']
+        cue = Select(self.name, self.message, hosts)
+        cue._reset()
+
+        for char in '192':
+            cue._on_char(char)
+        assert cue._goto is None
+        assert cue._query == '192'
+        assert list(cue._rows) == [2]
+        assert cue._get_answer() == '192.168.1.1'
+
+    def test_goto_out_of_range(self):
+        cue = Select(self.name, self.message, self.options)
+
+        cue._on_goto()
+        for char in '99999':
+            cue._on_char(char)
+        cue._on_submit()
+        assert cue._index == 4999
+
+    def test_write_frame_shrinks(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options[:3], max_rows=10)
+        frames = []
+
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        cue._on_goto()
+        assert cue._write_frame() == 4
+        cue._on_char('2')
+        assert cue._write_frame() == 4
+        assert 'Go to' in frames[-1]
+
+        # The status line is cleared and the cursor moves back above it:
+        cue._on_submit()
+        assert cue._write_frame() == 3
+        assert 'Go to' not in frames[-1]
+        assert frames[-1].endswith('\n\x1b[K\n' + ansi.MOVE_UP.format(1))
+
+    def test_filter(self):
+        cue = Select(self.name, self.message, self.options)
+
+        for char in 'HOST-49':
+            cue._on_char(char)
+        assert cue._query == 'HOST-49'
+        assert len(cue._rows) == 111
+        assert cue._get_answer() == 'host-49'
+
+        cue._on_char('9')
+        assert list(cue._rows) == [499, 4990, 4991, 4992, 4993,
+                                   4994, 4995, 4996, 4997, 4998, 4999]
+
+        cue._on_backspace()
+        assert len(cue._rows) == 111
+
+        cue._on_cancel()
+        assert cue._query == ''
+        assert cue._rows == range(5000)
+
+    def test_filter_narrows_previous_matches(self):
+        cue = Select(self.name, self.message, self.options)
+
+        cue._filter('host-1')
+        previous = cue._rows
+        cue._folded[2] = 'host-12'
+        cue._filter('host-12')
+
+        # Options outside of the previous matches aren't searched again:
+        assert 2 not in cue._rows
+        assert cue._matches['host-1'] is previous
+
+        cue._filter('host-1')
+        assert cue._rows is previous
+
+    def test_filter_keeps_active_option(self):
+        cue = Select(self.name, self.message, self.options)
+        cue._jump(123)
+
+        cue._filter('12')
+        assert cue._get_answer() == 'host-123'
+
+        cue._filter('9')
+        assert cue._index == 0
+
+    def test_filter_without_matches(self):
+        cue = Select(self.name, self.message, self.options)
+
+        cue._filter('python')
+        assert cue._get_active() is None
+
+        cue._on_down()
+        cue._on_submit()
+        assert not cue._done
+
+    def test_write_frame_with_filter(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, max_rows=10)
+        frames = []
+
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        cue._filter('host-4999')
+        cue._write_frame()
+        assert 'host-4999' in frames[-1]
+        assert 'host-0' not in frames[-1]
+        assert '1 of 5000' in frames[-1]
+
+    def test_fuzzy_filter(self):
+        cue = Select(self.name, self.message, self.options, fuzzy=True)
+        cue._jump(10)
+
+        cue._filter('h4999')
+        assert cue._index == 0
+        assert cue._get_answer() == 'host-4999'
+        assert len(cue._rows) <= Select.FUZZY_LIMIT
+
+        cue._on_cancel()
+        assert cue._rows == range(5000)
+
+    def test_fuzzy_ranking_in_background(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, fuzzy=True)
+        ranking = Future()
+
+        monkeypatch.setattr(cue._matcher, 'submit',
+                            lambda query, limit=None: ranking)
+        monkeypatch.setattr(cue, '_listen', lambda timeout=None: None)
+
+        cue._filter('h49')
+        # Keeps the previous rows until the ranking finishes:
+        assert cue._rows == range(5000)
+
+        ranking.set_result([4900, 49])
+        assert cue._next_key() is None
+        assert list(cue._rows) == [4900, 49]
+        assert cue._matches['h49'] == [4900, 49]
+
+    def test_from_dict_with_fuzzy(self):
+        cue = Select.from_dict({
+            'name': self.name,
+            'message': self.message,
+            'options': self.options,
+            'fuzzy': True
+        })
+
+        assert cue._matcher is not None
+
+    def test_lazy_options(self, monkeypatch):
+        read = []
+
+        def options():
+            for i in itertools.count():
+                read.append(i)
+                yield f'host-{i}'
+
+        cue = Select(self.name, self.message, options(), max_rows=10)
+        cue.max_lines = 20
+        frames = []
+
+        monkeypatch.setattr(cue, 'update_max_lines', lambda: None)
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        assert not read
+        cue._write_frame()
+        assert len(read) == 21
+        assert '11+ more' in frames[-1]
+
+        cue._on_page_down()
+        cue._write_frame()
+        assert len(read) == 31
+        assert cue._get_answer() == 'host-10'
+
+    def test_lazy_options_read_when_needed(self):
+        cue = Select(self.name, self.message, iter(self.options))
+
+        cue._on_up()
+        assert cue._get_answer() == 'host-4999'
+
+        cue = Select(self.name, self.message, iter(self.options))
+        cue._filter('host-4999')
+        assert list(cue._rows) == [4999]
+
+    def test_sequence_options_are_not_copied(self):
+        options = range(10 ** 12)
+        cue = Select(self.name, self.message, options)
+
+        assert cue._options is options
+        cue._on_end()
+        assert cue._get_answer() == 10 ** 12 - 1
+
+    def test_streamed_options(self, monkeypatch):
+        release = threading.Event()
+
+        def options():
+            yield from self.options[:3]
+            release.wait()
+            yield from self.options[3:]
+
+        source = StreamSource(options())
+        cue = Select(self.name, self.message, source, max_rows=10)
+        frames = []
+
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+        monkeypatch.setattr(cue, '_listen', lambda timeout=None: None)
+
+        cue._reset()
+        assert cue._is_busy()
+        if len(cue._rows) < 3:
+            while len(source) < 3:
+                time.sleep(0.001)
+            assert cue._next_key() is None
+        cue._on_down()
+        cue._write_frame()
+        assert 'Loading… 3 so far' in frames[-1]
+
+        release.set()
+        cue._options.wait(1)
+        # The new rows below the three visible ones are shown straight away:
+        assert cue._next_key() is None
+        assert len(cue._rows) == 5000
+        assert not cue._is_busy()
+        assert cue._get_answer() == 'host-1'
+
+        cue._write_frame()
+        assert 'Loading' not in frames[-1]
+        assert '4990 more' in frames[-1]
+
+    def test_streamed_options_with_query(self):
+        release = threading.Event()
+
+        def options():
+            yield from self.options[:100]
+            release.wait()
+            yield from self.options[100:]
+
+        source = StreamSource(options())
+        while len(source) < 100:
+            time.sleep(0.001)
+
+        cue = Select(self.name, self.message, source)
+        cue._reset()
+        cue._filter('host-99')
+        assert list(cue._rows) == [99]
+
+        release.set()
+        source.wait(1)
+        cue._update()
+        assert list(cue._rows)[:3] == [99, 990, 991]
+        assert cue._get_answer() == 'host-99'
+
+    def test_streamed_options_only_search_new(self):
+        release = threading.Event()
+
+        def options():
+            yield from self.options[:100]
+            release.wait()
+            yield from self.options[100:]
+
+        source = StreamSource(options())
+        while len(source) < 100:
+            time.sleep(0.001)
+
+        cue = Select(self.name, self.message, source)
+        cue._reset()
+        cue._filter('host-9')
+        matches = cue._rows
+        assert len(matches) == 11
+
+        release.set()
+        source.wait(1)
+        cue._update()
+        # The old matches are kept and the new ones are added after them:
+        assert cue._rows is matches
+        assert len(cue._rows) == 111
+        assert cue._rows == sorted(cue._rows)
+
+    def test_streamed_options_with_fuzzy_ranking(self, monkeypatch):
+        release = threading.Event()
+
+        def options():
+            yield from self.options[:100]
+            release.wait()
+            yield from self.options[100:]
+
+        source = StreamSource(options())
+        while len(source) < 100:
+            time.sleep(0.001)
+
+        cue = Select(self.name, self.message, source, fuzzy=True)
+        submitted = []
+
+        def submit(query, limit=None):
+            submitted.append(len(source))
+            ranking = Future()
+            submitted.append(ranking)
+            return ranking
+
+        monkeypatch.setattr(cue._matcher, 'submit', submit)
+        cue._reset()
+        cue._filter('host-9')
+        assert submitted[0] == 100
+        first = submitted[1]
+
+        release.set()
+        source.wait(1)
+        # The running ranking isn't restarted by the new options:
+        cue._update()
+        cue._update()
+        assert len(submitted) == 2
+        assert cue._ranking is first
+
+        # Once it finishes, its matches are shown and every option is ranked:
+        first.set_result([9, 90])
+        cue._update()
+        assert list(cue._rows) == [9, 90]
+        assert submitted[2] == 5000
+        assert cue._ranking is submitted[3]
+        cue._matcher.close()
+
+    def test_file_options(self, monkeypatch, tmp_path):
+        path = tmp_path / 'hosts.txt'
+        path.write_text('\n'.join(self.options))
+
+        cue = Select(self.name, self.message, path, max_rows=10)
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: None)
+        monkeypatch.setattr(source, 'SCAN_SIZE', 1024)
+
+        cue._write_frame()
+        assert not cue._options.exhausted
+
+        cue._on_end()
+        assert cue._get_answer() == 'host-4999'
+        cue._options.close()
+
+    def test_file_options_closed(self, monkeypatch, tmp_path):
+        path = tmp_path / 'hosts.txt'
+        path.write_text('\n'.join(self.options))
+
+        cue = Select(self.name, self.message, path, max_rows=10)
+        moves = [keys.DOWN, keys.ENTER, keys.ENTER]
+        monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cursor, 'clear', lambda _: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        assert cue.answer == {self.name: 'host-1'}
+        assert cue._options._file is None
+
+        # The file is opened again for the next prompt:
+        cue._draw()
+        assert cue.answer == {self.name: 'host-1'}
+        assert cue._options._file is None
+
+    def test_options_not_closed(self, monkeypatch, tmp_path):
+        path = tmp_path / 'hosts.txt'
+        path.write_text('\n'.join(self.options))
+
+        with source.FileSource(path) as options:
+            cue = Select(self.name, self.message, options, max_rows=10)
+            monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+            monkeypatch.setattr(cursor, 'clear', lambda _: None)
+            monkeypatch.setattr(cue, 'listen_for_key', lambda: keys.ENTER)
+
+            cue._draw()
+            assert options[1] == 'host-1'
+
+    def test_row_cache(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, max_rows=10)
+        rendered = []
+        render_row = cue._render_row
+
+        def spy(index, active):
+            rendered.append((index, active))
+            return render_row(index, active)
+
+        monkeypatch.setattr(cue, '_render_row', spy)
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: None)
+
+        cue._write_frame()
+        assert len(rendered) == 10
+
+        # Only the two rows that changed state are rendered again:
+        cue._on_down()
+        cue._write_frame()
+        assert rendered[10:] == [(0, False), (1, True)]
+
+        cue._on_up()
+        cue._write_frame()
+        assert len(rendered) == 12
+
+        cue.max_columns += 1
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: None)
+        cue._write_frame()
+        assert len(rendered) == 22
+
+    def test_row_cache_size(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, max_rows=10)
+        monkeypatch.setattr(Select, 'ROW_CACHE_SIZE', 15)
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: None)
+
+        for _ in range(2):
+            cue._write_frame()
+            cue._on_page_down()
+        cue._write_frame()
+
+        assert len(cue._row_cache) == 15
+        assert (20, True) in cue._row_cache
+        assert (0, True) not in cue._row_cache
+
+    def test_type_ahead(self):
+        options = ['banana', 'Apple', 'cherry', 'avocado', 'Blueberry', 'apricot']
+        cue = Select(self.name, self.message, options, type_ahead=True)
+
+        cue._on_char('a')
+        assert cue._get_answer() == 'Apple'
+        assert cue._rows == range(6)
+        assert cue._query == ''
+
+        # Typing the same letter moves on to the next option in sorted order:
+        cue._on_char('a')
+        assert cue._get_answer() == 'apricot'
+        cue._on_char('a')
+        assert cue._get_answer() == 'avocado'
+        cue._on_char('a')
+        assert cue._get_answer() == 'Apple'
+
+        cue._prefix = ''
+        cue._on_char('B')
+        cue._on_char('l')
+        assert cue._get_answer() == 'Blueberry'
+        # A longer prefix that the active option has keeps it:
+        cue._on_char('u')
+        assert cue._get_answer() == 'Blueberry'
+        cue._on_char('x')
+        assert cue._get_answer() == 'Blueberry'
+
+    def test_type_ahead_timeout(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, type_ahead=True)
+        now = 100.0
+        monkeypatch.setattr(time, 'monotonic', lambda: now)
+
+        for char in 'host-49':
+            cue._on_char(char)
+        assert cue._get_answer() == 'host-49'
+
+        now += cue.TYPE_AHEAD_TIMEOUT + 0.1
+        cue._on_char('4')
+        assert cue._goto is None
+        assert cue._prefix == '4'
+
+    def test_type_ahead_index(self):
+        cue = Select(self.name, self.message, self.options, type_ahead=True)
+        assert cue._prefix_index is None
+
+        # The index is built before the first frame:
+        cue._reset()
+        keys, order, ranks = cue._prefix_index
+        cue._on_char('h')
+        assert cue._prefix_index[0] is keys
+        assert keys == sorted(keys)
+        assert all(order[ranks[i]] == i for i in range(5000))
+
+        # The index is built once:
+        cue._on_char('o')
+        assert cue._prefix_index[0] is keys
+
+    def test_preview(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options, max_rows=10,
+                     preview=lambda option: f'{option}\nup\tfor 3 days')
+        cue.max_lines = 30
+        frames = []
+
+        monkeypatch.setattr(cue, 'update_max_lines', lambda: None)
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        cue._reset()
+        assert cue._write_frame() == 18
+        assert 'Loading preview' in frames[-1]
+        assert cue._is_busy()
+
+        assert not cue._update()
+        while cue._previewer.get(0) is None:
+            time.sleep(0.001)
+        assert cue._update()
+
+        assert cue._write_frame() == 18
+        assert 'host-0\x1b[K\n  up  for 3 days' in frames[-1]
+        assert not cue._is_busy()
+
+        cue._on_down()
+        assert cue._is_busy()
+        cue._previewer.close()
+
+    def test_frecency(self, monkeypatch, tmp_path):
+        index = FrecencyIndex(str(tmp_path))
+        index.record(self.name, ['host-42', 'host-7'])
+        index.record(self.name, ['host-7'])
+
+        cue = Select(self.name, self.message, self.options, frecency=index)
+        cue._reset()
+        assert cue._get_answer() == 'host-7'
+        assert list(cue._rows[:4]) == [7, 42, 0, 1]
+        assert len(cue._rows) == 5000
+
+        # Matches keep the promoted options first and the active option active:
+        cue._on_down()
+        cue._filter('host-4')
+        assert list(cue._rows[:3]) == [42, 4, 40]
+        assert cue._get_answer() == 'host-42'
+        cue._filter('host-')
+        assert cue._get_answer() == 'host-42'
+        cue._on_cancel()
+        assert cue._get_answer() == 'host-42'
+
+        cue = Select(self.name, self.message, self.options, frecency=index)
+        moves = [keys.DOWN, keys.ENTER]
+        monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+        monkeypatch.setattr(cursor, 'clear', lambda _: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+        cue._draw()
+        assert cue.answer == {self.name: 'host-42'}
+        assert index.rank(self.name, self.options) == [42, 7]
+
+    def test_frecency_setting(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(utils, 'get_cache_dir', lambda: str(tmp_path))
+
+        cue = Select.from_dict({'name': self.name, 'message': self.message,
+                                'options': self.options, 'frecency': True})
+        assert cue._frecency.directory == str(tmp_path / 'frecency')
+
+        cue = Select(self.name, self.message, self.options)
+        assert cue._frecency is None
+
+    def test_preview_lines_errors(self):
+        with pytest.raises(ValueError):
+            Select(self.name, self.message, self.options,
+                   preview=str, preview_lines=0)
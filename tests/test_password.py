@@ -9,7 +9,8 @@ A testing module for `cues.password`.
 
 import pytest
 
-from cues import cursor, password
+from cues import cursor, password, strength
+from cues.listen import ansi
 from cues.password import Password
 
 
@@ -62,6 +63,171 @@ class TestPassword:
         assert cue._draw() is None
         assert cue.answer == {self.name: '1234'}
 
+    def test_buffer(self):
+        cue = Password(self.name, self.message)
+
+        for char in 'pässwörd':
+            cue._on_char(char)
+        assert cue._length == 8
+        assert cue._buffer[:cue._size] == 'pässwörd'.encode('utf-8')
+
+        # Backspace removes every byte of a multi-byte character:
+        cue._on_backspace()
+        cue._on_backspace()
+        cue._on_backspace()
+        assert cue._buffer[:cue._size] == 'pässw'.encode('utf-8')
+        assert not any(cue._buffer[cue._size:])
+        cue._on_backspace()
+        assert cue._buffer[:cue._size] == 'päss'.encode('utf-8')
+        assert cue._length == 4
+
+    def test_long_paste(self, monkeypatch):
+        cue = Password(self.name, self.message)
+        buffers = []
+        grow = cue._grow
+        monkeypatch.setattr(cue, '_grow', lambda size: buffers.append(cue._buffer) or grow(size))
+
+        for _ in range(100_000):
+            cue._on_char('x')
+        assert cue._size == 100_000
+        # The buffer doubles, and every buffer left behind is wiped:
+        assert len(buffers) == 11
+        assert not any(any(buffer) for buffer in buffers)
+
+    def test_draw_wipes(self, monkeypatch):
+        cue = Password(self.name, self.message)
+        moves = [ord('é'), ord('a'), cue.keys.get('enter')]
+
+        monkeypatch.setattr(cursor, 'write', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        assert cue.answer == {self.name: 'éa'}
+        assert not any(cue._buffer)
+
+    def test_draw_incremental(self, monkeypatch):
+        cue = Password(self.name, self.message)
+        writes = []
+        backspace = cue.keys.get('backspace')
+        # The mask starts at column 14 of 20, so the seventh character starts a new line:
+        moves = [49, 50, backspace, 51, 52, 53, 54, 55, 56, backspace, backspace, backspace,
+                 cue.keys.get('enter')]
+
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: writes.append(text))
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+        monkeypatch.setattr(cue, 'max_columns', 20)
+
+        cue._draw()
+        assert cue.answer == {self.name: '1345'}
+        assert writes[0].endswith('Password: ')
+        assert writes[1:9] == ['*', '*', '\b \b', '*', '*', '*', '*', '*']
+        # Moving onto the next line and back writes the whole prompt again:
+        assert writes[9].endswith(' ' + '*' * 7)
+        assert writes[10].startswith(ansi.CLEAR_ENTIRE_LINE + ansi.UP_ONE + ansi.CLEAR_ENTIRE_LINE + '[')
+        assert writes[10].endswith(' ' + '*' * 6)
+        assert writes[11].endswith(' ' + '*' * 5)
+        assert writes[12] == '\b \b'
+        assert len(writes) == 14
+
+    def test_draw_resize(self, monkeypatch):
+        cue = Password(self.name, self.message)
+        writes = []
+        moves = [49, 50, cue.keys.get('enter')]
+
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: writes.append(text))
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: setattr(cue, 'max_columns', cue.max_columns - 1))
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        assert writes[1].endswith(' *')
+        assert writes[2].endswith(' **')
+
+    def test_draw_secret(self, monkeypatch):
+        cue = Password(self.name, self.message, secret=True)
+        moves = [49, 50, cue.keys.get('enter')]
+
+        monkeypatch.setattr(cursor, 'write', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        secret = cue.answer[self.name]
+        assert secret.reveal() == '12'
+        assert not any(cue._buffer)
+
+    def test_init_errors(self):
+        with pytest.raises(TypeError):
+            Password(self.name, self.message, breached=42)
+
+    def test_draw_strength(self, monkeypatch):
+        cue = Password(self.name, self.message, strength=True)
+        writes = []
+        moves = [49, 97, cue.keys.get('backspace'), cue.keys.get('enter')]
+
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: writes.append(text))
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+        monkeypatch.setattr(cue, 'max_columns', 80)
+
+        cue._draw()
+        assert cue.answer == {self.name: '1'}
+        assert writes[1].startswith('*' + ansi.CLEAR_LINE)
+        assert 'very weak' in writes[1]
+        assert writes[1].endswith(ansi.MOVE_LEFT.format(11))
+        assert writes[3].startswith('\b \b' + ansi.CLEAR_LINE)
+        assert cue._strength.bits == 0.0
+
+    def test_draw_strength_narrow(self, monkeypatch):
+        cue = Password(self.name, self.message, strength=True)
+        writes = []
+        moves = [49, cue.keys.get('enter')]
+
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: writes.append(text))
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+        monkeypatch.setattr(cue, 'max_columns', 20)
+
+        cue._draw()
+        # The meter doesn't fit after the mask:
+        assert writes[1] == '*' + ansi.CLEAR_LINE
+
+    def test_draw_breached(self, monkeypatch, tmp_path):
+        path = tmp_path / 'breached.bloom'
+        strength.BloomFilter.create(path, ['123']).close()
+        cue = Password(self.name, self.message, breached=path)
+        writes = []
+        # None stands for a poll that timed out once the lookup is done:
+        moves = [49, 50, 51, None, cue.keys.get('enter')]
+
+        def mock_listen(timeout=None):
+            raw = moves.pop(0)
+            if raw is None:
+                cue._lookup.result()
+                # The lookup started with "1" and "123" is looked up next:
+                if cue._lookup.version != cue._version:
+                    moves.insert(0, None)
+            return raw
+
+        monkeypatch.setattr(cursor, 'write', lambda text, color=False: writes.append(text))
+        monkeypatch.setattr(cursor, 'move', lambda *args, **kwargs: None)
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: None)
+        monkeypatch.setattr(cue, 'listen_for_key', mock_listen)
+        monkeypatch.setattr(cue, '_listen', mock_listen)
+        monkeypatch.setattr(cue, 'max_columns', 80)
+
+        cue._draw()
+        assert cue.answer == {self.name: '123'}
+        assert cue._found
+        assert any('breached' in text for text in writes)
+        assert cue._executor is None
+        assert cue._filter is None
+
     def test_from_dict(self):
         cue = Password(self.name, self.message)
 
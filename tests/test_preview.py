@@ -0,0 +1,122 @@
+"""
+tests.test_preview
+==================
+
+A testing module for `cues.preview`.
+"""
+
+import threading
+import time
+
+import pytest
+
+from cues.preview import Previewer
+
+
+def wait_for(previewer, index):
+    while previewer.is_pending(index):
+        time.sleep(0.001)
+    return previewer.get(index)
+
+
+def test_previewer_errors():
+    with pytest.raises(TypeError):
+        Previewer('cat')
+    with pytest.raises(ValueError):
+        Previewer(str, cache_size=0)
+
+
+def test_previewer():
+    calls = []
+
+    def callback(option):
+        calls.append(option)
+        return option.upper()
+
+    previewer = Previewer(callback)
+    assert previewer.get(0) is None
+
+    previewer.request(0, 'alpha')
+    assert wait_for(previewer, 0) == 'ALPHA'
+
+    previewer.request(0, 'alpha')
+    assert calls == ['alpha']
+    previewer.close()
+
+
+def test_previewer_cache_size():
+    previewer = Previewer(str, cache_size=2)
+
+    for index in range(3):
+        previewer.request(index, index)
+        wait_for(previewer, index)
+
+    assert previewer.get(0) is None
+    assert previewer.get(2) == '2'
+    previewer.close()
+
+
+def test_previewer_skips_stale_requests():
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def callback(option):
+        calls.append(option)
+        started.set()
+        release.wait()
+        return option
+
+    previewer = Previewer(callback)
+    previewer.request(0, 'running')
+    started.wait()
+    for index in range(1, 10):
+        previewer.request(index, f'stale-{index}')
+    previewer.request(10, 'current')
+
+    # Only the latest request waits for the running preview:
+    assert previewer.is_pending(0)
+    assert not previewer.is_pending(9)
+    assert previewer.is_pending(10)
+    release.set()
+    assert wait_for(previewer, 10) == 'current'
+    assert wait_for(previewer, 0) == 'running'
+    assert previewer.get(9) is None
+    assert calls == ['running', 'current']
+    previewer.close()
+
+
+def test_previewer_clear():
+    release = threading.Event()
+    started = threading.Event()
+
+    def callback(option):
+        started.set()
+        release.wait()
+        return option
+
+    previewer = Previewer(callback)
+    previewer.request(0, 'running')
+    started.wait()
+    previewer.request(1, 'next')
+    previewer.clear()
+
+    assert not previewer.is_pending(0)
+    assert not previewer.is_pending(1)
+    release.set()
+    previewer.request(2, 'after')
+    assert wait_for(previewer, 2) == 'after'
+    assert previewer.get(0) is None
+    assert previewer.get(1) is None
+    previewer.close()
+
+
+def test_previewer_error():
+    def callback(option):
+        raise OSError('no such file')
+
+    previewer = Previewer(callback)
+    previewer.request(0, 'missing.txt')
+
+    assert wait_for(previewer, 0) == 'OSError: no such file'
+    previewer.close()
@@ -0,0 +1,51 @@
+"""
+tests.test_secret
+=================
+
+A testing module for `cues.secret`.
+"""
+
+import pytest
+
+from cues import secret
+
+
+def test_wipe():
+    data = bytearray(b'hunter2')
+    secret.wipe(data)
+    assert data == bytearray(7)
+
+
+class TestSecret:
+    def test_init_errors(self):
+        with pytest.raises(TypeError):
+            secret.Secret(b'hunter2')
+
+    def test_reveal(self):
+        value = secret.Secret(bytearray('hünter2'.encode('utf-8')))
+
+        assert value.reveal() == 'hünter2'
+        assert len(value) == 8
+        assert bytes(value.buffer) == 'hünter2'.encode('utf-8')
+        assert 'hunter' not in repr(value)
+
+    def test_wipe(self):
+        data = bytearray(b'hunter2')
+        value = secret.Secret(data)
+        view = value.buffer
+
+        value.wipe()
+        assert data == bytearray(7)
+        assert bytes(view) == bytes(7)
+
+    def test_with(self):
+        data = bytearray(b'hunter2')
+        with secret.Secret(data) as value:
+            assert value.reveal() == 'hunter2'
+        assert not any(data)
+
+    def test_del(self):
+        data = bytearray(b'hunter2')
+        value = secret.Secret(data)
+        del value
+        assert not any(data)
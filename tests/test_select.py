@@ -5,11 +5,12 @@ tests.test_select
 A testing module for `cues.select`.
 """
 
-import copy
+from collections.abc import Sequence
 
 import pytest
 
-from cues import select
+from cues import cursor, keys, select
+from cues.listen import ansi
 from cues.select import Select
 
 
@@ -39,8 +40,7 @@ class TestSelect:
         assert cue._options == self.options
         assert cue._num_options == len(self.options)
 
-        # Property methods:
-        assert cue.markers == cue._markers
+        assert cue._index == 0
 
     def test__init__errors(self):
         with pytest.raises(TypeError):
@@ -60,8 +60,7 @@ class TestSelect:
         assert cue._options == self.options
         assert cue._num_options == len(self.options)
 
-        # Property methods:
-        assert cue.markers == cue._markers
+        assert cue._index == 0
 
     def test_options_property(self):
         cue = Select(self.name, self.message, self.options)
@@ -71,51 +70,287 @@ class TestSelect:
         assert cue.options == self.options
         assert len(cue.options) == cue._num_options
 
-    def test_markers_property(self):
+    def test_index_with_wrap(self):
         cue = Select(self.name, self.message, self.options)
 
-        # Getter:
-
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == len(cue._markers)
-
-        # Setter:
-
-        shallow_copy_markers = copy.copy(cue.markers)  # ['>', ' ', ' ']
-
-        # -- If up arrow key is pressed:
-
-        cue.markers = 1  # Marker moved up: [' ', ' ', '>']
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == cue._num_options
-        assert cue.markers != shallow_copy_markers
+        cue._on_up()
+        assert cue._index == 2
+        cue._on_up()
+        assert cue._index == 1
+        cue._on_down()
+        cue._on_down()
+        assert cue._index == 0
 
-        cue.markers = 1  # Marker moved up: [' ', '>', ' ']
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == cue._num_options
-        assert cue.markers != shallow_copy_markers
+    def test_index_without_wrap(self):
+        cue = Select(self.name, self.message, self.options, wrap=False)
 
-        cue.markers = 1  # Marker moved up: ['>', ' ', ' ']
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == cue._num_options
-        assert cue.markers == shallow_copy_markers
+        cue._on_up()
+        assert cue._index == 0
+        for _ in range(5):
+            cue._on_down()
+        assert cue._index == 2
 
-        # -- If down arrow key is pressed:
-
-        cue.markers = 0  # Marker moved down: [' ', '>', ' ']
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == cue._num_options
-        assert cue.markers != shallow_copy_markers
-
-        cue.markers = 0  # Marker moved down: [' ', ' ', '>']
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == cue._num_options
-        assert cue.markers != shallow_copy_markers
-
-        cue.markers = 0  # Marker moved down: ['>', ' ', ' ']
-        assert cue.markers == cue._markers
-        assert len(cue.markers) == cue._num_options
-        assert cue.markers == shallow_copy_markers
+    def test_draw(self, monkeypatch):
+        cue = Select(self.name, self.message, self.options)
+        moves = [keys.DOWN, keys.DOWN, keys.UP, keys.ENTER]
+
+        monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+        monkeypatch.setattr(cursor, 'clear', lambda _: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        assert cue._draw() is None
+        assert cue.answer == {self.name: self.options[1]}
+
+    def test_keymap(self):
+        cue = Select(self.name, self.message, self.options,
+                     keymap={'j': 'down', 'ctrl+p': 'up', 'down': None})
+
+        assert cue._keymap[keys.char('j')] == 'down'
+        assert cue._keymap[keys.get('ctrl+p')] == 'up'
+        assert keys.DOWN not in cue._keymap
+        assert Select.keymap[keys.DOWN] == 'down'
+
+        cue._dispatch(ord('j'))
+        assert cue._index == 1
+        cue._dispatch(keys.DOWN)
+        assert cue._index == 1
+
+    def test_keymap_errors(self):
+        with pytest.raises(ValueError):
+            Select(self.name, self.message, self.options,
+                   keymap={'j': 'jump'})
+        with pytest.raises(ValueError):
+            Select(self.name, self.message, self.options,
+                   keymap={'hyper+j': 'down'})
+
+    def test_actions(self):
+        assert Select.get_actions() == [
+            'backspace', 'cancel', 'collapse', 'down', 'end', 'expand', 'goto',
+            'home', 'page_down', 'page_up', 'submit', 'up']
+
+    def test_sections(self):
+        regions = {
+            'us': ['us-east-1', 'us-west-2'],
+            'eu': ['eu-west-1', 'eu-central-1'],
+            'ap': ['ap-south-1'],
+        }
+        cue = Select(self.name, self.message, regions)
+        cue._reset()
+
+        def get_rows():
+            return [str(cue._options[i]) for i in cue._rows]
+
+        assert len(cue._rows) == 8
+        cue._on_collapse()
+        cue._on_down()
+        cue._on_collapse()
+        assert get_rows() == ['us', 'eu', 'ap', 'ap-south-1']
+        assert cue._index == 1
+
+        # A collapsed section is a single step:
+        cue._on_up()
+        cue._on_down()
+        cue._on_down()
+        assert str(cue._options[cue._get_active()]) == 'ap'
+
+        # Enter toggles a section instead of submitting it:
+        cue._on_up()
+        cue._on_submit()
+        assert not cue._done
+        assert get_rows() == ['us', 'eu', 'eu-west-1', 'eu-central-1', 'ap', 'ap-south-1']
+        cue._on_expand()
+        cue._on_submit()
+        assert cue._done
+        assert cue._get_answer() == 'eu-west-1'
+
+    def test_sections_filter(self):
+        regions = {'us': ['us-east-1', 'us-west-2'], 'eu': ['eu-west-1'], 'ap': ['ap-south-1']}
+        cue = Select(self.name, self.message, regions)
+        cue._reset()
+
+        cue._filter('west')
+        assert cue._rows == [0, 2, 3, 4]
+        cue._on_collapse()
+        assert cue._rows == [0, 3, 4]
+        assert cue._index == 0
+        cue._filter('')
+        assert len(cue._rows) == 5
+
+    def test_sections_type_ahead(self):
+        regions = {'us': ['us-east-1'], 'eu': ['eu-west-1']}
+        cue = Select(self.name, self.message, regions, type_ahead=True)
+        cue._reset()
+        cue._jump(2)
+        cue._on_collapse()
+
+        # Jumping to an option in a collapsed section expands it:
+        for char in 'eu-':
+            cue._on_char(char)
+        assert cue._get_answer() == 'eu-west-1'
+
+    def test_sections_errors(self):
+        with pytest.raises(ValueError):
+            Select(self.name, self.message, {'us': ['us-east-1']}, fuzzy=True)
+
+    def test_write_sections(self, monkeypatch):
+        cue = Select(self.name, self.message, {'us': ['us-east-1', 'us-west-2']})
+        frames = []
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        cue._reset()
+        cue._write_frame()
+        assert '▾ us' in frames[-1]
+        assert '(2)' in frames[-1]
+        assert '\x1b[0m   us-east-1' in frames[-1]
+
+        # Collapsing shrinks the frame, whose leftover lines are cleared once:
+        cue._on_collapse()
+        assert cue._write_frame() == 1
+        assert '▸ us' in frames[-1]
+        assert 'us-east-1' not in frames[-1]
+        assert frames[-1].endswith('\n\x1b[K\n\x1b[K\n' + ansi.MOVE_UP.format(2))
+
+        cue._on_collapse()
+        assert cue._write_frame() == 1
+        assert ansi.MOVE_UP.format(2) not in frames[-1]
+
+    def test_key_cost_is_flat(self, monkeypatch):
+        class CountedOptions(Sequence):
+            """Counts how many times an option is read."""
+
+            def __init__(self, size):
+                self.size = size
+                self.reads = 0
+
+            def __len__(self):
+                return self.size
+
+            def __getitem__(self, index):
+                self.reads += 1
+                return f'option-{index}'
+
+        written = []
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: written.append(len(text)))
+
+        def get_reads(size):
+            options = CountedOptions(size)
+            cue = Select(self.name, self.message, options, max_rows=10)
+            cue._reset()
+            cue._write_frame()
+            counts = []
+            for action in [cue._on_down] * 50 + [cue._on_page_down, cue._on_end, cue._on_up]:
+                options.reads = 0
+                action()
+                cue._write_frame()
+                counts.append(options.reads)
+            return counts
+
+        # A key reads and writes as much with a million options as with a hundred:
+        small = get_reads(100)
+        small_written = written[:]
+        written.clear()
+        large = get_reads(1000000)
+        assert large == small
+        assert max(large) <= 10
+        # Only the numbers in the options and the counts of hidden ones are longer:
+        assert max(written) < 1.5 * max(small_written)
+
+    def test_multi_column(self, monkeypatch):
+        options = [f'opt-{i}' for i in range(30)]
+        cue = Select(self.name, self.message, options, multi_column=True)
+        monkeypatch.setattr(cue, 'max_columns', 40)
+        cue._reset()
+
+        # Each column takes the marker, a space, 6 characters and the gap:
+        assert cue._get_columns() == 4
+        cue._on_down()
+        cue._on_expand()
+        assert cue._get_answer() == 'opt-5'
+        cue._on_collapse()
+        cue._on_collapse()
+        assert cue._get_answer() == 'opt-3'
+
+        # A wider option shows fewer columns:
+        monkeypatch.setattr(cue, 'max_columns', 20)
+        assert cue._get_columns() == 2
+        monkeypatch.setattr(cue, 'max_columns', 10)
+        assert cue._get_columns() == 1
+        cue._on_expand()
+        assert cue._get_answer() == 'opt-3'
+
+    def test_write_multi_column(self, monkeypatch):
+        options = ['a', 'bb', 'c', 'dddd', 'e']
+        cue = Select(self.name, self.message, options, multi_column=True)
+        frames = []
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+        monkeypatch.setattr(cue, 'update_max_columns', lambda: None)
+        monkeypatch.setattr(cue, 'max_columns', 30)
+
+        cue._reset()
+        assert cue._write_frame() == 2
+        assert '\x1b[0m bb    ' in frames[-1]
+        assert 'e   \x1b[K' in frames[-1]
+        assert frames[-1].count('\n') == 2
+
+        cue._on_down()
+        assert cue._get_answer() == 'dddd'
+        cue._on_expand()
+        assert cue._get_answer() == 'e'
+
+    def test_multi_column_moves(self, monkeypatch):
+        options = [f'{i:02}' for i in range(13)]
+        cue = Select(self.name, self.message, options, multi_column=True)
+        monkeypatch.setattr(cue, '_get_columns', lambda: 5)
+        cue._reset()
+
+        def move(start, action):
+            cue._index = start
+            action()
+            return cue._index
+
+        # Moves keep the column and wrap around within it:
+        assert move(10, cue._on_down) == 0
+        assert move(1, cue._on_up) == 11
+        assert move(12, cue._on_down) == 2
+        assert move(7, cue._on_down) == 12
+        assert move(11, cue._on_up) == 6
+        # The last line is too short for the last two columns:
+        assert move(8, cue._on_down) == 12
+        assert move(4, cue._on_up) == 12
+
+    def test_multi_column_moves_no_wrap(self, monkeypatch):
+        options = [f'{i:02}' for i in range(13)]
+        cue = Select(self.name, self.message, options, multi_column=True, wrap=False)
+        monkeypatch.setattr(cue, '_get_columns', lambda: 5)
+        cue._reset()
+
+        cue._index = 2
+        cue._on_up()
+        assert cue._index == 2
+        cue._index = 9
+        cue._on_down()
+        assert cue._index == 12
+        cue._on_down()
+        assert cue._index == 12
+
+    def test_multi_column_one_line(self, monkeypatch):
+        cue = Select(self.name, self.message, ['a', 'b', 'c'], multi_column=True)
+        monkeypatch.setattr(cue, 'max_columns', 80)
+        cue._reset()
+
+        assert cue._get_columns() > 3
+        cue._on_down()
+        assert cue._index == 0
+        cue._on_expand()
+        cue._on_up()
+        assert cue._index == 1
+
+    def test_multi_column_errors(self):
+        with pytest.raises(ValueError):
+            Select(self.name, self.message, {'us': ['us-east-1']}, multi_column=True)
 
     # For dev use only (do NOT use with CI):
 
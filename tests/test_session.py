@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_session
+==================
+
+A testing module for `cues.listen.session`.
+"""
+
+import platform
+import sys
+try:
+    import termios  # pylint: disable=import-error
+except ModuleNotFoundError:
+    pass
+try:
+    import tty
+except ModuleNotFoundError:
+    pass
+
+import pytest
+
+from cues import cursor, utils
+from cues.confirm import Confirm
+from cues.listen import session
+from cues.listen.session import Session
+
+
+@pytest.fixture
+def mock_tty(monkeypatch):
+    if platform.system() != 'Windows':
+        monkeypatch.setattr(sys.stdin, 'fileno', lambda: None)
+        monkeypatch.setattr(termios, 'tcgetattr', lambda _: 0)
+        monkeypatch.setattr(tty, 'setcbreak', lambda _: None)
+        monkeypatch.setattr(termios, 'tcsetattr', lambda _, __, ___: 0)
+
+
+def test_session_is_current(mock_tty):
+    assert session.current() is None
+
+    with Session() as s:
+        assert session.current() is s
+        assert utils.get_listen_function() == s.listen
+
+        with pytest.raises(RuntimeError):
+            with Session():
+                pass
+
+    assert session.current() is None
+
+
+def test_push_and_listen(mock_tty):
+    with Session() as s:
+        s.push(1, 2, '[A')
+
+        assert s.listen() == 1
+        assert s.listen() == 2
+        assert s.listen() == '[A'
+
+
+@pytest.mark.skipif(platform.system() == 'Windows', reason='OS must not be Windows')
+def test_listen_reads_every_available_key(mock_tty, monkeypatch):
+    reads = [b'yn\x1b[', b'B']
+
+    monkeypatch.setattr(session.unix, 'is_data', lambda timeout=0: bool(reads))
+    monkeypatch.setattr(session.os, 'read', lambda _, __: reads.pop(0))
+
+    with Session() as s:
+        assert s.listen() == ord('y')
+        assert s.listen() == ord('n')
+        assert s.listen() == '[B'
+        assert s.listen(timeout=0) is None
+
+
+@pytest.mark.skipif(platform.system() == 'Windows', reason='OS must not be Windows')
+def test_listen_with_lone_esc(mock_tty, monkeypatch):
+    reads = [b'\x1b']
+
+    monkeypatch.setattr(session.unix, 'is_data', lambda timeout=0: bool(reads))
+    monkeypatch.setattr(session.os, 'read', lambda _, __: reads.pop(0))
+
+    with Session() as s:
+        assert s.listen() == '\x1b'
+
+
+def test_cues_share_queue(mock_tty, monkeypatch):
+    monkeypatch.setattr(cursor, 'write', lambda _, color=True: None)
+
+    with Session() as s:
+        first = Confirm('first', 'Continue?')
+        second = Confirm('second', 'Are you sure?')
+        s.push(first.keys.get('y'), second.keys.get('n'))
+
+        first._ask()
+        second._ask()
+
+    assert first.answer == {'first': True}
+    assert second.answer == {'second': False}
@@ -0,0 +1,170 @@
+"""
+tests.test_source
+=================
+
+A testing module for `cues.source`.
+"""
+
+import itertools
+import os
+import threading
+import time
+
+import pytest
+
+from cues import source
+from cues.source import FileSource, LazySource, StreamSource, create_source
+
+
+def test_lazy_source():
+    source = LazySource(itertools.count())
+
+    assert len(source) == 0
+    assert source[9] == 9
+    assert len(source) == 10
+    assert not source.exhausted
+
+    source.load(5)
+    assert len(source) == 10
+
+
+def test_lazy_source_exhausted():
+    source = LazySource(iter('abc'))
+
+    source.load(10)
+    assert len(source) == 3
+    assert source.exhausted
+    assert list(source) == ['a', 'b', 'c']
+    assert source[-1] == 'c'
+
+    with pytest.raises(IndexError):
+        source[3]
+
+
+def test_create_source():
+    options = ['a', 'b']
+    assert create_source(options) is options
+
+    options = range(10 ** 12)
+    assert create_source(options) is options
+
+    assert isinstance(create_source(x for x in 'ab'), LazySource)
+    assert list(create_source({'a': 1, 'b': 2})) == ['a', 'b']
+
+    with pytest.raises(TypeError):
+        create_source(1)
+
+
+def test_stream_source():
+    release = threading.Event()
+
+    def options():
+        yield 'a'
+        release.wait()
+        yield 'b'
+
+    source = StreamSource(options())
+    assert create_source(source) is source
+
+    while not len(source):
+        time.sleep(0.001)
+    assert source[0] == 'a'
+    assert not source.exhausted
+
+    release.set()
+    assert source.wait(1)
+    assert list(source) == ['a', 'b']
+
+
+def test_stream_source_error():
+    def options():
+        yield 'a'
+        raise OSError('broken pipe')
+
+    source = StreamSource(options())
+
+    assert source.wait(1)
+    assert list(source) == ['a']
+    assert isinstance(source.error, OSError)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_file_source(monkeypatch, tmp_path, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(source, 'numpy', None)
+    monkeypatch.setattr(source, 'SCAN_SIZE', 8)
+
+    path = tmp_path / 'symbols.txt'
+    path.write_bytes(b'alpha\nbeta\r\n\ngamma\xff\ndelta')
+
+    with FileSource(path) as lines:
+        assert lines[1] == 'beta'
+        assert not lines.exhausted
+        assert lines[-1] == 'delta'
+        assert lines.exhausted
+        assert list(lines) == ['alpha', 'beta', '', 'gamma�', 'delta']
+
+        with pytest.raises(IndexError):
+            lines[5]
+
+
+def test_file_source_line_breaks(tmp_path):
+    path = tmp_path / 'symbols.txt'
+
+    path.write_bytes(b'')
+    assert list(FileSource(path)) == []
+
+    path.write_bytes(b'alpha\n')
+    assert list(FileSource(path)) == ['alpha']
+
+    path.write_bytes(b'\n\n')
+    assert list(FileSource(path)) == ['', '']
+
+
+def test_file_source_saved_index(tmp_path):
+    path = tmp_path / 'symbols.txt'
+    path.write_text(''.join(f'symbol-{i}\n' for i in range(1000)))
+
+    with FileSource(path, save_index=True) as lines:
+        lines.load()
+    assert (tmp_path / 'symbols.txt.idx').exists()
+
+    with FileSource(path, save_index=True) as lines:
+        assert lines._index_map is not None
+        assert lines.exhausted
+        assert len(lines) == 1000
+        assert lines[999] == 'symbol-999'
+
+    # The index is built again once the file changes:
+    path.write_text('alpha\nbeta\n')
+    os.utime(path, ns=(0, 0))
+    with FileSource(path, save_index=True) as lines:
+        assert lines._index_map is None
+        assert list(lines) == ['alpha', 'beta']
+
+
+def test_create_source_with_path(tmp_path):
+    path = tmp_path / 'symbols.txt'
+    path.write_text('alpha\n')
+
+    with create_source(path) as options:
+        assert isinstance(options, FileSource)
+    # A str object is a sequence of options rather than a path:
+    assert create_source(str(path)) == str(path)
+
+
+def test_file_source_reopen(tmp_path):
+    path = tmp_path / 'symbols.txt'
+    path.write_text('alpha\nbeta\n')
+
+    options = FileSource(path)
+    options.load()
+    options.close()
+    assert len(options) == 0
+
+    options.open()
+    options.open()
+    assert list(options) == ['alpha', 'beta']
+    options.close()
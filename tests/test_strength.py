@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+tests.test_strength
+===================
+
+A testing module for `cues.strength`.
+"""
+
+import pytest
+
+from cues import strength
+
+
+class TestStrength:
+    def test_add(self):
+        meter = strength.Strength()
+        assert meter.bits == 0.0
+        assert meter.label == 'very weak'
+
+        for byte in b'aaaa':
+            meter.add(byte)
+        assert meter.bits == pytest.approx(4 * 4.7004, abs=0.001)
+
+        for byte in b'A1!':
+            meter.add(byte)
+        # 26 + 26 + 10 + 33 characters:
+        assert meter.bits == pytest.approx(7 * 6.5699, abs=0.001)
+        assert meter.label == 'fair'
+
+    def test_remove(self):
+        meter = strength.Strength()
+        for byte in b'a1':
+            meter.add(byte)
+        meter.remove(ord('1'))
+
+        assert meter.bits == pytest.approx(4.7004, abs=0.001)
+        meter.remove(ord('a'))
+        assert meter.bits == 0.0
+
+    def test_multibyte(self):
+        meter = strength.Strength()
+        meter.add('é'.encode('utf-8')[0])
+
+        assert meter.bits == pytest.approx(6.6439, abs=0.001)
+
+    def test_clear(self):
+        meter = strength.Strength()
+        for byte in b'Tr0ub4dor&3xyzzy':
+            meter.add(byte)
+        assert meter.label == 'strong'
+
+        meter.clear()
+        assert meter.bits == 0.0
+
+
+class TestBloomFilter:
+    def setup(self):
+        self.passwords = ['password', '123456', 'hunter2', 'pässwörd']
+
+    def test_create(self, tmp_path):
+        path = tmp_path / 'breached.bloom'
+        with strength.BloomFilter.create(path, self.passwords) as bloom:
+            assert bloom.path == str(path)
+            assert bloom.hashes > 1
+            for password in self.passwords:
+                assert password in bloom
+                assert password.encode('utf-8') in bloom
+                assert bytearray(password.encode('utf-8')) in bloom
+            assert 'correct horse battery staple' not in bloom
+
+    def test_create_from_iterator(self, tmp_path):
+        path = tmp_path / 'breached.bloom'
+        passwords = (str(i) for i in range(10000))
+        with strength.BloomFilter.create(path, passwords, count=10000) as bloom:
+            assert all(str(i) in bloom for i in range(10000))
+            found = sum(str(i) in bloom for i in range(10000, 20000))
+            assert found < 50
+
+    def test_create_errors(self, tmp_path):
+        path = tmp_path / 'breached.bloom'
+        with pytest.raises(TypeError):
+            strength.BloomFilter.create(path, iter(self.passwords))
+        with pytest.raises(ValueError):
+            strength.BloomFilter.create(path, self.passwords, error_rate=1)
+
+    def test_init_errors(self, tmp_path):
+        path = tmp_path / 'passwords.txt'
+        path.write_text('\n'.join(self.passwords))
+        with pytest.raises(ValueError):
+            strength.BloomFilter(path)
+
+        path.write_bytes(b'')
+        with pytest.raises(ValueError):
+            strength.BloomFilter(path)
@@ -0,0 +1,203 @@
+"""
+tests.test_tree
+===============
+
+A testing module for `cues.tree`.
+"""
+
+import pytest
+
+from cues import cursor, keys
+from cues.tree import TreeSelect
+
+
+class TestTreeSelect:
+    def setup(self):
+        self.name = 'service'
+        self.message = 'Pick a service:'
+        self.tree = {
+            'payments': {
+                'api': ['checkout', 'refunds'],
+                'data': ['ledger'],
+            },
+            'search': {
+                'serving': ['frontend'],
+            },
+            'billing': {},
+        }
+        self.fetched = []
+
+    def children(self, path):
+        self.fetched.append(path)
+        node = self.tree
+        for part in path:
+            node = node[part] if isinstance(node, dict) else []
+        return node
+
+    def get_rows(self, cue):
+        return [str(cue._options[i]) for i in cue._rows]
+
+    def test_init_errors(self):
+        with pytest.raises(TypeError):
+            TreeSelect(self.name, self.message, ['a'], children=None)
+        with pytest.raises(TypeError):
+            TreeSelect(self.name, self.message, 1, children=self.children)
+
+    def test_expand_and_collapse(self):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children)
+        cue._reset()
+        assert self.get_rows(cue) == ['payments', 'search', 'billing']
+        assert self.fetched == []
+
+        cue._on_expand()
+        assert self.get_rows(cue) == ['payments', 'api', 'data', 'search', 'billing']
+        assert cue._get_answer() == ['payments']
+
+        # Right again moves to the first child:
+        cue._on_expand()
+        cue._on_expand()
+        assert self.get_rows(cue) == ['payments', 'api', 'checkout', 'refunds',
+                                      'data', 'search', 'billing']
+        assert cue._options[0].size == 4
+
+        cue._on_down()
+        assert cue._get_answer() == ['payments', 'api', 'checkout']
+
+        # Left moves to the parent and then collapses it:
+        cue._on_collapse()
+        assert cue._get_answer() == ['payments', 'api']
+        cue._on_collapse()
+        assert self.get_rows(cue) == ['payments', 'api', 'data', 'search', 'billing']
+        cue._on_expand()
+        cue._on_up()
+        cue._on_collapse()
+        assert self.get_rows(cue) == ['payments', 'search', 'billing']
+        assert cue._options[0].size == 0
+
+        # Expanding again shows the expanded children without fetching them:
+        cue._on_expand()
+        assert self.get_rows(cue) == ['payments', 'api', 'checkout', 'refunds',
+                                      'data', 'search', 'billing']
+        assert self.fetched == [['payments'], ['payments', 'api']]
+
+    def test_collapse_moves_past_expanded_siblings(self):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children)
+        cue._reset()
+        cue._on_expand()
+        cue._on_expand()
+        cue._on_expand()
+        cue._jump(4)
+        cue._on_expand()
+        cue._on_expand()
+        assert self.get_rows(cue) == ['payments', 'api', 'checkout', 'refunds',
+                                      'data', 'ledger', 'search', 'billing']
+        assert cue._get_answer() == ['payments', 'data', 'ledger']
+
+        cue._on_collapse()
+        assert cue._get_answer() == ['payments', 'data']
+        cue._on_collapse()
+        cue._on_collapse()
+        assert cue._get_answer() == ['payments']
+        cue._on_collapse()
+        assert self.get_rows(cue) == ['payments', 'search', 'billing']
+
+        # Top-level nodes have no parent to move to:
+        cue._jump(2)
+        assert cue._get_answer() == ['billing']
+        cue._on_collapse()
+        assert cue._get_answer() == ['billing']
+
+    def test_leaf(self):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children)
+        cue._reset()
+        cue._jump(2)
+
+        assert not cue._options[2].is_leaf
+        cue._on_expand()
+        assert cue._options[2].is_leaf
+        assert self.get_rows(cue) == ['payments', 'search', 'billing']
+
+    def test_leaves_only(self):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children,
+                         leaves_only=True)
+        cue._reset()
+
+        cue._on_submit()
+        assert not cue._done
+        assert self.get_rows(cue)[:3] == ['payments', 'api', 'data']
+
+        cue._on_down()
+        cue._on_submit()
+        cue._on_down()
+        cue._on_submit()
+        assert cue._done
+        assert cue._get_answer() == ['payments', 'api', 'checkout']
+
+    def test_filter(self):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children)
+        cue._reset()
+        cue._on_expand()
+
+        cue._filter('a')
+        assert self.get_rows(cue) == ['payments', 'api', 'data', 'search']
+
+        # The rows are filtered again when nodes are shown:
+        cue._jump(1)
+        cue._on_expand()
+        assert self.get_rows(cue) == ['payments', 'api', 'data', 'search']
+        assert cue._get_answer() == ['payments', 'api']
+        cue._filter('e')
+        assert self.get_rows(cue) == ['payments', 'checkout', 'refunds', 'search']
+        cue._filter('')
+        assert len(cue._rows) == 7
+
+    def test_write_frame(self, monkeypatch):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children)
+        frames = []
+        monkeypatch.setattr(cursor, 'write',
+                            lambda text, color=False: frames.append(text))
+
+        cue._reset()
+        cue._on_expand()
+        cue._write_frame()
+        assert '▾ payments' in frames[-1]
+        assert '\x1b[0m   ▸ api' in frames[-1]
+
+    def test_draw(self, monkeypatch):
+        cue = TreeSelect(self.name, self.message, list(self.tree), self.children)
+        moves = [keys.DOWN, keys.RIGHT, keys.RIGHT, keys.RIGHT, keys.RIGHT, keys.ENTER]
+
+        monkeypatch.setattr(cursor, 'write', lambda _, color=False: None)
+        monkeypatch.setattr(cursor, 'clear', lambda _: None)
+        monkeypatch.setattr(cue, 'listen_for_key', lambda: moves.pop(0))
+
+        cue._draw()
+        assert cue.answer == {self.name: ['search', 'serving', 'frontend']}
+
+    def test_large_tree(self):
+        def children(path):
+            return range(100_000) if len(path) == 1 else []
+
+        cue = TreeSelect(self.name, self.message, ['root', 'other'], children)
+        cue._reset()
+
+        cue._on_expand()
+        assert len(cue._rows) == 100_002
+        cue._on_end()
+        assert cue._get_answer() == ['other']
+        cue._on_home()
+        cue._on_collapse()
+        assert len(cue._rows) == 2
+
+    def test_from_dict(self):
+        cue = TreeSelect.from_dict({
+            'name': self.name,
+            'message': self.message,
+            'options': list(self.tree),
+            'children': self.children,
+            'leaves_only': True,
+            'max_rows': 5,
+        })
+
+        assert cue._leaves_only
+        assert cue._max_rows == 5
@@ -42,6 +42,17 @@ def test_listen(monkeypatch):
     assert x == ord(character)
 
 
+@pytest.mark.skipif(platform.system() == 'Windows', reason='OS must not be Windows')
+def test_listen_with_timeout(monkeypatch):
+    monkeypatch.setattr(sys.stdin, 'fileno', lambda: None)
+    monkeypatch.setattr(termios, 'tcgetattr', lambda _: 0)
+    monkeypatch.setattr(tty, 'setcbreak', lambda _: None)
+    monkeypatch.setattr(unix, 'is_data', lambda timeout=0: False)
+    monkeypatch.setattr(termios, 'tcsetattr', lambda _, __, ___: 0)
+
+    assert unix.listen(timeout=0.01) is None
+
+
 @pytest.mark.skipif(platform.system() == 'Windows', reason='OS must not be Windows')
 def test_get_key(monkeypatch):
     character = 'a'
@@ -70,6 +81,22 @@ def test_get_key_when_key_is_esc(monkeypatch):
     assert x == character
 
 
+@pytest.mark.skipif(platform.system() == 'Windows', reason='OS must not be Windows')
+def test_get_key_when_key_has_parameters(monkeypatch):
+    characters = list('\x1b[5~')
+
+    def mock_read_return(n):
+        read = ''.join(characters[:n])
+        del characters[:n]
+        return read
+
+    monkeypatch.setattr(unix, 'is_data', lambda: True)
+    monkeypatch.setattr(sys.stdin, 'read', mock_read_return)
+
+    x = unix.get_key()
+    assert x == '[5~'
+
+
 @pytest.mark.skipif(platform.system() == 'Windows', reason='OS must not be Windows')
 def test_is_data(monkeypatch):
     monkeypatch.setattr(sys.stdin, 'fileno', lambda: None)
@@ -113,3 +140,25 @@ def test_get_pos(monkeypatch):
     monkeypatch.setattr(sys.stdin, 'read', mock_read_return)
 
     assert unix.get_pos() == '\x1b[10;6R'
+
+
+def test_split_keys():
+    keys, rest = unix.split_keys('ab\x1b[A\x1b[5~\x1bOH')
+    assert keys == [ord('a'), ord('b'), '[A', '[5~', 'OH']
+    assert rest == ''
+
+
+def test_split_keys_with_incomplete_sequence():
+    keys, rest = unix.split_keys('y\x1b[1;')
+    assert keys == [ord('y')]
+    assert rest == '\x1b[1;'
+
+    keys, rest = unix.split_keys('\x1b')
+    assert keys == []
+    assert rest == '\x1b'
+
+
+def test_split_keys_with_lone_esc():
+    keys, rest = unix.split_keys('\x1bq')
+    assert keys == ['\x1b', ord('q')]
+    assert rest == ''
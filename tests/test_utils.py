@@ -6,6 +6,7 @@ A testing module for `cues.utils`.
 """
 
 import math
+import os
 import platform
 from types import FunctionType
 
@@ -23,6 +24,18 @@ def test_is_windows():
         assert not utils.is_windows()
 
 
+def test_get_cache_dir(monkeypatch):
+    monkeypatch.setattr(platform, 'system', lambda: 'Linux')
+    monkeypatch.setenv('XDG_CACHE_HOME', '/tmp/xdg')
+
+    assert utils.get_cache_dir() == os.path.join('/tmp/xdg', 'cues')
+
+    monkeypatch.setattr(platform, 'system', lambda: 'Windows')
+    monkeypatch.setenv('LOCALAPPDATA', 'C:\\Local')
+
+    assert utils.get_cache_dir() == os.path.join('C:\\Local', 'cues')
+
+
 def test_get_keys():
     keys = utils.get_keys()
 